@@ -1,6 +1,10 @@
+import os
 import pandas as pd
 import argparse
-from socceranalyzer import Match, MatchAnalyzer, SIM2D, JsonReader, RunConfiguration, Logger
+from socceranalyzer import Match, MatchAnalyzer, SIM2D, JsonReader, RunConfiguration, Logger, read_log, ResultsWriter
+from socceranalyzer.common.chore.batch_runner import BatchRunner
+from socceranalyzer.utils.profiler import Profiler
+from socceranalyzer.cli.tournament import Tournament
 
 
 def setup():
@@ -8,18 +12,53 @@ def setup():
     arg_parser.add_argument("run", help="run analysis")
     arg_parser.add_argument("-v", "--version", help="show socceranalyzer version")
     arg_parser.add_argument("-f", "--file", help="config.json file")
+    arg_parser.add_argument("-b", "--batch", help="analyze every log in logs_folder", action="store_true")
+    arg_parser.add_argument("-w", "--workers", help="number of worker processes for batch mode", type=int)
+    arg_parser.add_argument("-t", "--tournament", help="folder of the tournament store, analyzes only new logs in logs_folder")
+    arg_parser.add_argument("-o", "--output", help="csv file for batch mode results", default="batch_results.csv")
+    arg_parser.add_argument("-s", "--store", help="sqlite file reused across runs to skip analyses of unchanged logs")
+    arg_parser.add_argument("-r", "--results", help="folder of a parquet dataset the results of every analysis are appended to")
+    arg_parser.add_argument("-p", "--profile", help="chrome trace json file with the time taken by every analysis")
+    arg_parser.add_argument("--memory", help="measure the peak memory of every analysis", action="store_true")
+    arg_parser.add_argument("--cprofile", help="folder for a cProfile dump of every analysis")
     args = arg_parser.parse_args()
 
     info = JsonReader.read(args.file)
     config = RunConfiguration()
     config.parse(info)
+    if args.store:
+        config.results_store = args.store
+    if args.results:
+        config.results_dir = args.results
     
-    return config
+    return config, args
 
 if __name__ == "__main__":
     
-    config:RunConfiguration = setup()
-    
-    dataframe = pd.read_csv(config.file_path)
-    match = Match(dataframe, config.category)
-    match_analyzer = MatchAnalyzer(match,run_config=config)
+    config, args = setup()
+
+    if args.tournament:
+        tournament = Tournament(config, args.tournament, workers=args.workers)
+        tournament.update()
+        stats = tournament.team_stats()
+        stats.to_csv(args.output, index=False)
+        print(stats.to_string(index=False))
+        Logger.info(f"Team statistics saved to {args.output}")
+    elif args.batch:
+        results = BatchRunner(config, workers=args.workers).run()
+        results.to_csv(args.output, index=False)
+        Logger.info(f"Batch results saved to {args.output}")
+    else:
+        dataframe = read_log(config.file_path, config.cache_dir, MatchAnalyzer.required_columns(config))
+        match = Match(dataframe, config.category)
+        profiler = Profiler(memory=args.memory, cprofile_dir=args.cprofile)
+        match_analyzer = MatchAnalyzer(match,run_config=config, profiler=profiler)
+
+        if config.results_dir:
+            ResultsWriter(config.results_dir).append(match_analyzer.collect_results(), os.path.basename(config.file_path))
+            Logger.info(f"Results saved to {config.results_dir}")
+
+        if args.profile:
+            profiler.chrome_trace(args.profile)
+            print(match_analyzer.profile.sort_values('wall_time', ascending=False).to_string(index=False))
+            Logger.info(f"Chrome trace saved to {args.profile}")
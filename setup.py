@@ -30,5 +30,6 @@ setup(
     },
     include_package_data=True,
     packages=[package for package in find_packages() if package.startswith("socceranalyzer")],
-    install_requires=['pandas', 'numpy', 'seaborn', 'matplotlib']
+    install_requires=['pandas', 'numpy', 'pyarrow'],
+    extras_require={'plotting': ['matplotlib', 'seaborn']}
 )
@@ -1,73 +1,105 @@
-# CLI
-from socceranalyzer.cli.cli import CLI
+"""
+Public names of socceranalyzer, imported on first access.
 
-# Jupyter
-from socceranalyzer.jupyter.jupyter_adapter import JupyterAdapter
+Importing the package only sets up this table, so headless workers using Match, MatchAnalyzer or
+BatchRunner never load the plotting stack, which JupyterAdapter pulls in when it is first used.
+"""
+import importlib
 
-# Basic
-from socceranalyzer.common.basic.match import Match
-from socceranalyzer.common.basic.field import Field, Field2D
+_LAZY_IMPORTS = {
+    # CLI
+    'CLI': 'socceranalyzer.cli.cli',
+    'Tournament': 'socceranalyzer.cli.tournament',
+    # Jupyter
+    'JupyterAdapter': 'socceranalyzer.jupyter.jupyter_adapter',
+    # Basic
+    'Match': 'socceranalyzer.common.basic.match',
+    'Field': 'socceranalyzer.common.basic.field',
+    'Field2D': 'socceranalyzer.common.basic.field',
+    'SharedMatch': 'socceranalyzer.common.basic.shared_match',
+    # Abstract
+    'AbstractAnalysis': 'socceranalyzer.common.analysis.abstract_analysis',
+    'AbstractPlayer': 'socceranalyzer.common.entity.abstract_player',
+    'AbstractFactory': 'socceranalyzer.common.chore.abstract_factory',
+    # Entities
+    'Team': 'socceranalyzer.common.basic.team',
+    'Ball': 'socceranalyzer.common.basic.ball',
+    'Agent2D': 'socceranalyzer.agent2D.agent',
+    'RobotSSL': 'socceranalyzer.RobotSSL.robot_ssl',
+    'RobotVSS': 'socceranalyzer.RobotVSS.robot_vss',
+    'RobotHL': 'socceranalyzer.RobotHL.robot_hl',
+    # Enums
+    'SIM2D': 'socceranalyzer.common.enums.sim2d',
+    'VSS': 'socceranalyzer.common.enums.vss',
+    'SSL': 'socceranalyzer.common.enums.ssl',
+    'HLKid': 'socceranalyzer.common.enums.hl_kid',
+    'Landmarks': 'socceranalyzer.common.enums.hl_kid',
+    # Chore
+    'MatchAnalyzer': 'socceranalyzer.common.chore.match_analyzer',
+    'Mediator': 'socceranalyzer.common.chore.mediator',
+    'BatchRunner': 'socceranalyzer.common.chore.batch_runner',
+    'StreamingMatchAnalyzer': 'socceranalyzer.common.chore.streaming_match_analyzer',
+    'AnalysisRegistry': 'socceranalyzer.common.chore.scheduler',
+    'AnalysisScheduler': 'socceranalyzer.common.chore.scheduler',
+    'ProcessAnalysisScheduler': 'socceranalyzer.common.chore.process_scheduler',
+    # Collections
+    'PlayersCollection': 'socceranalyzer.common.collections.collections',
+    # Evaluators
+    'BallHolderEvaluator': 'socceranalyzer.common.evaluators.ball_holder',
+    'ShootEvaluator': 'socceranalyzer.common.evaluators.shoot_evaluator',
+    'PlayerDetector': 'socceranalyzer.common.evaluators.player_detector',
+    # Geometric
+    'Circle': 'socceranalyzer.common.geometric.circle',
+    'Point': 'socceranalyzer.common.geometric.point',
+    'Rectangle': 'socceranalyzer.common.geometric.rectangle',
+    'Triangle': 'socceranalyzer.common.geometric.triangle',
+    # Analysis
+    'Playmodes': 'socceranalyzer.common.analysis.playmodes',
+    'ObjectHistory': 'socceranalyzer.common.analysis.object_history',
+    'BallPossession': 'socceranalyzer.common.analysis.ball_possession',
+    'CornersOcurrencies': 'socceranalyzer.common.analysis.corners_occurrencies',
+    'FoulCharge': 'socceranalyzer.common.analysis.foul_charge',
+    'Penalty': 'socceranalyzer.common.analysis.penalty',
+    'Shooting': 'socceranalyzer.common.analysis.shooting',
+    'Stamina': 'socceranalyzer.common.analysis.stamina',
+    'TimeAfterEvents': 'socceranalyzer.common.analysis.time_after_events',
+    'Speed': 'socceranalyzer.common.analysis.speed',
+    'TeamSpeed': 'socceranalyzer.common.analysis.speed',
+    'BaseFootprint': 'socceranalyzer.common.analysis.base_footprint',
+    # Utils
+    'RunConfiguration': 'socceranalyzer.utils.run_configuration',
+    'Logger': 'socceranalyzer.utils.logger',
+    'Profiler': 'socceranalyzer.utils.profiler',
+    # io
+    'JsonReader': 'socceranalyzer.common.io.reader',
+    'Writer': 'socceranalyzer.common.io.writer',
+    'LogCache': 'socceranalyzer.common.io.cache',
+    'read_log': 'socceranalyzer.common.io.cache',
+    'RcgParser': 'socceranalyzer.common.io.rcg_parser',
+    'read_rcg': 'socceranalyzer.common.io.rcg_parser',
+    'ResultStore': 'socceranalyzer.common.io.result_store',
+    'ResultsWriter': 'socceranalyzer.common.io.results_writer',
+    'HLKidLog': 'socceranalyzer.common.io.hlkid_log',
+    # Dataframe
+    'FilterPlayer': 'socceranalyzer.common.dataframe.filter_player',
+    'FilterPlayerNotPenalized': 'socceranalyzer.common.dataframe.filter_player',
+    'FilterSelfLocalizationCovariance': 'socceranalyzer.common.dataframe.filter_self_localization',
+    'FilterBallCovariance': 'socceranalyzer.common.dataframe.filter_self_localization',
+}
 
-# Abstract
-from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
-from socceranalyzer.common.entity.abstract_player import AbstractPlayer
-from socceranalyzer.common.chore.abstract_factory import AbstractFactory
+__all__ = list(_LAZY_IMPORTS)
 
-# Entities
-from socceranalyzer.common.basic.team import Team
-from socceranalyzer.common.basic.ball import Ball
-from socceranalyzer.agent2D.agent import Agent2D
-from socceranalyzer.RobotSSL.robot_ssl import RobotSSL
-from socceranalyzer.RobotVSS.robot_vss import RobotVSS
-from socceranalyzer.RobotHL.robot_hl import RobotHL
 
-# Enums
-from socceranalyzer.common.enums.sim2d import SIM2D, Landmarks
-from socceranalyzer.common.enums.vss import VSS
-from socceranalyzer.common.enums.ssl import SSL
-from socceranalyzer.common.enums.hl_kid import HLKid, Landmarks
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-# Chore
-from socceranalyzer.common.chore.match_analyzer import MatchAnalyzer
-from socceranalyzer.common.chore.mediator import Mediator
+    value = getattr(importlib.import_module(module), name)
+    # cached as a module global, so later lookups do not go through __getattr__ again
+    globals()[name] = value
+    return value
 
-# Collections
-from socceranalyzer.common.collections.collections import PlayersCollection
 
-# Evaluators
-from socceranalyzer.common.evaluators.ball_holder import BallHolderEvaluator
-from socceranalyzer.common.evaluators.shoot_evaluator import ShootEvaluator
-from socceranalyzer.common.evaluators.player_detector import PlayerDetector
-
-# Geometric
-from socceranalyzer.common.geometric.circle import Circle
-from socceranalyzer.common.geometric.point import Point
-from socceranalyzer.common.geometric.rectangle import Rectangle
-from socceranalyzer.common.geometric.triangle import Triangle 
-
-# Analysis
-from socceranalyzer.common.analysis.playmodes import Playmodes
-from socceranalyzer.common.analysis.object_history import ObjectHistory
-from socceranalyzer.common.analysis.ball_possession import BallPossession
-from socceranalyzer.common.analysis.corners_occurrencies import CornersOcurrencies
-from socceranalyzer.common.analysis.foul_charge import FoulCharge
-from socceranalyzer.common.analysis.penalty import Penalty
-from socceranalyzer.common.analysis.shooting import Shooting
-from socceranalyzer.common.analysis.stamina import Stamina
-from socceranalyzer.common.analysis.penalty import Penalty
-from socceranalyzer.common.analysis.time_after_events import TimeAfterEvents
-from socceranalyzer.common.analysis.speed import Speed
-from socceranalyzer.common.analysis.base_footprint import BaseFootprint
-
-# Utils
-from socceranalyzer.utils.run_configuration import RunConfiguration
-from socceranalyzer.utils.logger import Logger
-
-# io
-from socceranalyzer.common.io.reader import JsonReader
-from socceranalyzer.common.io.writer import Writer
-
-# Dataframe
-from socceranalyzer.common.dataframe.filter_player import FilterPlayer
-from socceranalyzer.common.dataframe.filter_player import FilterPlayerNotPenalized
-from socceranalyzer.common.dataframe.filter_self_localization import FilterSelfLocalizationCovariance, FilterBallCovariance
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
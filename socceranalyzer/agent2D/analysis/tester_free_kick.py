@@ -1,12 +1,17 @@
+import pandas as pd
+
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
 from socceranalyzer.common.dataframe.finders import find_last_unique_event_ocurrences
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 
 class TesterFK(AbstractAnalysis):
-    def __init__(self, dataframe, category, debug):
+    def __init__(self, dataframe, category, debug, playmode_index: PlaymodeIndex = None):
         self.__dataframe = dataframe
         self.__category = category
+        self.__playmode_index = playmode_index
 
         # left team stats
         self.__free_kicks_l = 0
@@ -28,8 +33,11 @@ class TesterFK(AbstractAnalysis):
             Logger.success("TesterFK has results.")
 
     def _analyze(self):
-        free_kicks_to_left = find_last_unique_event_ocurrences(self.dataframe, str(self.category.FK_LEFT))
-        free_kicks_to_right = find_last_unique_event_ocurrences(self.dataframe, str(self.category.FK_RIGHT))
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.dataframe[str(self.category.PLAYMODE)])
+
+        free_kicks_to_left = find_last_unique_event_ocurrences(self.dataframe, str(self.category.FK_LEFT), self.__playmode_index)
+        free_kicks_to_right = find_last_unique_event_ocurrences(self.dataframe, str(self.category.FK_RIGHT), self.__playmode_index)
 
         self.__free_kicks_l = len(free_kicks_to_left)
         self.__free_kicks_r = len(free_kicks_to_right)
@@ -42,6 +50,10 @@ class TesterFK(AbstractAnalysis):
         self.__goals_taken_r = self.__goals_scored_l
         self.__goals_scored_r = self.__goals_taken_l
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category)
+
     @property
     def dataframe(self):
         return self.__dataframe
@@ -74,5 +86,12 @@ class TesterFK(AbstractAnalysis):
               f'    scored/fk_in_favor ratio {self.__goals_scored_r/self.__free_kicks_r}\n'
               f'    taken/fk_against ratio: {self.__goals_taken_r/self.__free_kicks_l}')
 
-    def serialize(self):
-        raise NotImplementedError
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the free kicks and goals of each team as a table, one row per side. The ratios of results()
+            are left out, as they are undefined for teams without free kicks.
+        """
+        return {'free_kicks': pd.DataFrame({'side': ['l', 'r'],
+                                            'free_kicks': [self.__free_kicks_l, self.__free_kicks_r],
+                                            'goals_scored': [self.__goals_scored_l, self.__goals_scored_r],
+                                            'goals_taken': [self.__goals_taken_l, self.__goals_taken_r]})}
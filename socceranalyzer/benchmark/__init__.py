@@ -0,0 +1,3 @@
+from socceranalyzer.benchmark.generators import sim2d_log, hlkid_log
+from socceranalyzer.benchmark.imports import ImportBenchmark
+from socceranalyzer.benchmark.suite import BenchmarkSuite
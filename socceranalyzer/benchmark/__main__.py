@@ -0,0 +1,49 @@
+import argparse
+import sys
+
+import pandas as pd
+
+from socceranalyzer.benchmark.imports import ImportBenchmark
+from socceranalyzer.benchmark.suite import BenchmarkSuite
+from socceranalyzer.common.enums.hl_kid import HLKid
+from socceranalyzer.common.enums.sim2d import SIM2D
+from socceranalyzer.utils.logger import Logger
+
+CATEGORIES = {'sim2d': SIM2D, 'hlkid': HLKid}
+
+
+def setup():
+    arg_parser = argparse.ArgumentParser(prog='python -m socceranalyzer.benchmark',
+                                         description='time every analysis on synthetic logs')
+    arg_parser.add_argument("-c", "--cycles", help="lengths of the generated logs", type=int, nargs='+', default=[1000, 10000])
+    arg_parser.add_argument("-k", "--category", help="categories to benchmark", choices=CATEGORIES, nargs='+', default=list(CATEGORIES))
+    arg_parser.add_argument("-a", "--analysis", help="only benchmark these analysis classes", nargs='+')
+    arg_parser.add_argument("-r", "--repeat", help="timed runs per analysis", type=int, default=3)
+    arg_parser.add_argument("-s", "--seed", help="seed of the log generators", type=int, default=0)
+    arg_parser.add_argument("-l", "--label", help="label stored with the results, e.g. version or commit")
+    arg_parser.add_argument("-o", "--output", help="json file for the results", default="benchmark.json")
+    arg_parser.add_argument("--compare", help="json file of a previous run to compare the results against")
+    arg_parser.add_argument("--imports", help="only time the package imports against their budget", action="store_true")
+    return arg_parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = setup()
+
+    if args.imports:
+        imports = ImportBenchmark(repeat=args.repeat)
+        imports.run()
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(imports.to_frame().to_string(index=False, float_format='{:.4f}'.format))
+        sys.exit(0 if imports.passed() else 1)
+
+    suite = BenchmarkSuite([CATEGORIES[category] for category in args.category], args.cycles, args.repeat,
+                           args.seed, args.analysis, args.label)
+    suite.run()
+    suite.save(args.output)
+    Logger.info(f"Benchmark results saved to {args.output}")
+
+    if args.compare:
+        comparison = BenchmarkSuite.compare(args.compare, suite.to_dict())
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(comparison.to_string(index=False, float_format='{:.4f}'.format))
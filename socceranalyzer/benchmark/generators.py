@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.common.enums.sim2d import SIM2D
+from socceranalyzer.common.enums.hl_kid import HLKid
+from socceranalyzer.common.io.rcg_parser import BALL_FIELDS, PLAYER_FIELDS, PLAYERS, SIDES
+
+SIM2D_FIELD = (52.5, 34.0)
+HLKID_FIELD = (4.5, 3.0)
+
+# (playmode, length in cycles, mean cycles between occurrences)
+SIM2D_EVENTS = (
+    ('kick_in', 4, 250),
+    ('corner_kick', 10, 600),
+    ('goal_kick', 8, 700),
+    ('free_kick', 6, 800),
+    ('foul_charge', 5, 900),
+    ('offside', 5, 1500),
+)
+
+# formation used as the base position of the left team, the right team mirrors it
+SIM2D_FORMATION = np.array([(-49, 0), (-35, -20), (-35, -7), (-35, 7), (-35, 20), (-20, -15),
+                            (-20, 0), (-20, 15), (-5, -20), (-5, 0), (-5, 20)], dtype=np.float64)
+
+HLKID_PLAYERS = 4
+HLKID_FRAMES = ('base_link', 'l_sole', 'r_sole')
+HLKID_STATES = {'initial': 0, 'ready': 1, 'set': 2, 'playing': 3, 'finished': 4}
+HLKID_CYCLE = 0.032
+
+
+def _ball_path(rng, cycles, field, kick_every, decay, max_speed):
+    """
+    Ball positions and velocities of a ball kicked at random cycles, slowing down between kicks.
+    Returns the positions, velocities and the boolean mask of the kick cycles.
+    """
+    kicks = rng.random(cycles) < 1 / kick_every
+    kicks[0] = True
+
+    angle = rng.uniform(-np.pi, np.pi, cycles)
+    speed = rng.uniform(max_speed / 10, max_speed, cycles)
+    kick_velocity = np.stack((speed * np.cos(angle), speed * np.sin(angle)), axis=1)
+
+    last_kick = np.maximum.accumulate(np.where(kicks, np.arange(cycles), 0))
+    velocity = kick_velocity[last_kick] * (decay ** (np.arange(cycles) - last_kick))[:, None]
+
+    position = np.clip(np.cumsum(velocity, axis=0), (-field[0], -field[1]), field)
+    return position, velocity, kicks
+
+
+def sim2d_log(cycles: int = 6000, seed: int = 0, team_names: tuple[str, str] = ('RoboCIn', 'Opponent')) -> pd.DataFrame:
+    """
+    Generates a synthetic SIM2D match with the column schema of the rcssserver csv logs.
+
+    The ball is kicked by a random player every few cycles and decays as in the simulator, players
+    move between their formation position and the ball, and set plays and goals are sprinkled over
+    the play_on cycles, so every SIM2D analysis has events to work on.
+
+            Parameters:
+                    cycles (int): number of rows
+                    seed (int): seed of the random generator, the same seed yields the same log
+                    team_names (tuple[str, str]): left and right team names
+
+            Returns:
+                    dataframe (pandas.DataFrame): the synthetic match log
+    """
+    rng = np.random.default_rng(seed)
+
+    ball, ball_velocity, kicks = _ball_path(rng, cycles, SIM2D_FIELD, kick_every=8, decay=0.94, max_speed=3.0)
+
+    # playmodes
+    playmode = np.full(cycles, 'play_on', dtype=object)
+    for name, length, every in SIM2D_EVENTS:
+        for start in np.flatnonzero(rng.random(cycles) < 1 / every):
+            playmode[start:start + length] = f'{name}_{rng.choice(SIDES)}'
+
+    goals = np.flatnonzero(rng.random(cycles) < 1 / 2000)
+    scorers = rng.choice(SIDES, len(goals))
+    for start, side in zip(goals, scorers):
+        playmode[start:start + 50] = f'goal_{side}'
+        playmode[start + 50:start + 51] = f'kick_off_{"r" if side == "l" else "l"}'
+    playmode[0] = 'before_kick_off'
+    playmode[1:2] = 'kick_off_l'
+    if cycles > 1:
+        playmode[-1] = 'time_over'
+
+    score = {side: np.zeros(cycles, dtype=np.int64) for side in SIDES}
+    for start, side in zip(goals, scorers):
+        score[side][start:] += 1
+
+    # players
+    columns = {
+        str(SIM2D.GAME_TIME): np.arange(cycles, dtype=np.int64),
+        str(SIM2D.PLAYMODE): playmode,
+        str(SIM2D.TEAM_LEFT): team_names[0],
+        str(SIM2D.TEAM_RIGHT): team_names[1],
+        str(SIM2D.TEAM_LEFT_SCORE): score['l'],
+        str(SIM2D.TEAM_RIGHT_SCORE): score['r'],
+    }
+    columns.update(zip(BALL_FIELDS, (ball[:, 0], ball[:, 1], ball_velocity[:, 0], ball_velocity[:, 1])))
+
+    kicker = rng.integers(0, len(SIDES) * PLAYERS, cycles)
+    tackles = rng.random(cycles) < 0.05
+
+    for s, side in enumerate(SIDES):
+        mirror = 1 if side == 'l' else -1
+        for unum in range(1, PLAYERS + 1):
+            player = s * PLAYERS + unum - 1
+            base = SIM2D_FORMATION[unum - 1] * (mirror, 1)
+            attraction = 0.1 if unum == 1 else 0.4
+
+            position = (1 - attraction) * base + attraction * ball + rng.normal(0, 2.0, (cycles, 2))
+            kicked = kicks & (kicker == player)
+            position[kicked] = ball[kicked] + rng.normal(0, 0.3, (kicked.sum(), 2))
+            position = np.clip(position, (-SIM2D_FIELD[0], -SIM2D_FIELD[1]), SIM2D_FIELD)
+            velocity = np.vstack(([0, 0], np.diff(position, axis=0))) * 0.4
+
+            values = {
+                'x': position[:, 0], 'y': position[:, 1], 'vx': velocity[:, 0], 'vy': velocity[:, 1],
+                'body': rng.uniform(-180, 180, cycles), 'neck': rng.uniform(-90, 90, cycles),
+                'attribute_stamina': np.maximum(8000 - np.cumsum(rng.integers(0, 4, cycles)), 1000),
+                'attribute_effort': np.full(cycles, 1.0), 'attribute_recovery': np.full(cycles, 1.0),
+                'attribute_stamina_capacity': np.maximum(130600 - np.cumsum(rng.integers(0, 30, cycles)), 0),
+                'counting_kick': np.cumsum(kicked & ~tackles),
+                'counting_tackle': np.cumsum(kicked & tackles),
+                'counting_catch': np.cumsum(kicked & (unum == 1) & (rng.random(cycles) < 0.5)),
+            }
+            for field in PLAYER_FIELDS:
+                if field not in values:
+                    values[field] = np.cumsum(rng.random(cycles) < 0.2)
+
+            columns.update((f'player_{side}{unum}_{field}', values[field]) for field in PLAYER_FIELDS)
+
+    return pd.DataFrame(columns)
+
+
+def hlkid_log(cycles: int = 6000, seed: int = 0, team_names: tuple[str, str] = ('Bit-Bots', 'Opponent')) -> tuple[pd.DataFrame, dict]:
+    """
+    Generates a synthetic Humanoid League kid size match with the teams.teamN.playerM.* column schema
+    of the referee data collection logs, along with the meta data Match expects for HLKid.
+
+            Parameters:
+                    cycles (int): number of rows, sampled every 32 ms
+                    seed (int): seed of the random generator, the same seed yields the same log
+                    team_names (tuple[str, str]): team1 and team2 names
+
+            Returns:
+                    dataframe (pandas.DataFrame): the synthetic match log
+                    meta_data (dict): team names and player ids
+    """
+    rng = np.random.default_rng(seed)
+
+    ball, _, _ = _ball_path(rng, cycles, HLKID_FIELD, kick_every=60, decay=0.97, max_speed=0.08)
+
+    state = np.full(cycles, HLKID_STATES['playing'], dtype=np.int64)
+    state[:cycles // 50] = HLKID_STATES['ready']
+    state[cycles // 50:cycles // 40] = HLKID_STATES['set']
+    state[cycles - cycles // 100:] = HLKID_STATES['finished']
+
+    columns = {
+        str(HLKid.GAME_TIME): np.arange(cycles) * HLKID_CYCLE,
+        str(HLKid.PLAYMODE): state,
+        str(HLKid.BALL_X): ball[:, 0],
+        str(HLKid.BALL_Y): ball[:, 1],
+        str(HLKid.BALL_Z): np.full(cycles, 0.075),
+    }
+
+    meta_data = {'teams': {}}
+
+    for team in (1, 2):
+        mirror = 1 if team == 1 else -1
+        columns[f'teams.team{team}.score'] = np.cumsum(rng.random(cycles) < 1 / 5000)
+        columns[f'teams.team{team}.penalty_shots'] = np.zeros(cycles, dtype=np.int64)
+        meta_data['teams'][f'team{team}'] = {'name': team_names[team - 1]}
+
+        for player in range(1, HLKID_PLAYERS + 1):
+            prefix = f'teams.team{team}.player{player}'
+            meta_data['teams'][f'team{team}'][f'player{player}'] = {'id': player}
+
+            base = np.array((-HLKID_FIELD[0] + player, (player - 2.5) * 0.8)) * (mirror, 1)
+            position = 0.6 * base + 0.4 * ball + np.cumsum(rng.normal(0, 0.005, (cycles, 2)), axis=0)
+            yaw = np.cumsum(rng.normal(0, 0.02, cycles))
+
+            for frame in HLKID_FRAMES:
+                offset = {'base_link': 0.0, 'l_sole': 0.05, 'r_sole': -0.05}[frame]
+                # small roll and pitch from walking, so base footprint has to remove them
+                roll, pitch = rng.normal(0, 0.05, (2, cycles))
+                quaternion = _quaternion(roll, pitch, yaw)
+
+                columns[f'{prefix}.{frame}.position.x'] = position[:, 0] - offset * np.sin(yaw)
+                columns[f'{prefix}.{frame}.position.y'] = position[:, 1] + offset * np.cos(yaw)
+                columns[f'{prefix}.{frame}.position.z'] = np.full(cycles, 0.45 if frame == 'base_link' else 0.0)
+                for axis, values in zip('wxyz', quaternion):
+                    columns[f'{prefix}.{frame}.rotation.{axis}'] = values
+
+            # penalized for 30 seconds now and then
+            penalized = np.zeros(cycles)
+            for start in np.flatnonzero(rng.random(cycles) < 1 / 3000):
+                length = min(int(30 / HLKID_CYCLE), cycles - start)
+                penalized[start:start + length] = 30 - np.arange(length) * HLKID_CYCLE
+            columns[f'{prefix}.robot_info.penalty'] = (penalized > 0).astype(np.int64)
+            columns[f'{prefix}.robot_info.secs_till_unpenalized'] = np.ceil(penalized).astype(np.int64)
+
+            for message, estimate, spread in (('self_localization.pose', position, 0.3), ('ball', ball, 0.2)):
+                message = f'{prefix}.team_comm.{message}'
+                columns[f'{message}.position.x'] = estimate[:, 0] + rng.normal(0, 0.1, cycles)
+                columns[f'{message}.position.y'] = estimate[:, 1] + rng.normal(0, 0.1, cycles)
+                columns[f'{message}.position.z'] = np.zeros(cycles)
+                for i in range(9):
+                    covariance = rng.exponential(spread, cycles) if i % 4 == 0 else rng.normal(0, 0.01, cycles)
+                    columns[f'{message}.covariance.{i}'] = covariance
+
+    return pd.DataFrame(columns), meta_data
+
+
+def _quaternion(roll, pitch, yaw):
+    """
+    Returns the (w, x, y, z) quaternion of the given euler angles, in the static xyz convention.
+    """
+    cr, sr = np.cos(roll / 2), np.sin(roll / 2)
+    cp, sp = np.cos(pitch / 2), np.sin(pitch / 2)
+    cy, sy = np.cos(yaw / 2), np.sin(yaw / 2)
+
+    return (cr * cp * cy + sr * sp * sy,
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy)
@@ -0,0 +1,132 @@
+import json
+import subprocess
+import sys
+
+import pandas as pd
+
+# statement timed, statement whose cost is allowed on top of the budget, budget in seconds
+IMPORT_CASES = {
+    'socceranalyzer': ('import socceranalyzer', None, 0.05),
+    'Match': ('from socceranalyzer import Match', 'import pandas, numpy', 0.25),
+    'MatchAnalyzer': ('from socceranalyzer import MatchAnalyzer', 'import pandas, numpy', 0.5),
+    'BatchRunner': ('from socceranalyzer import BatchRunner', 'import pandas, numpy', 0.5),
+}
+
+# plotting stack, only loaded by JupyterAdapter and the agent2D scripts
+PLOTTING_MODULES = ('matplotlib', 'seaborn')
+
+_TIMER = ("import sys, json\n"
+          "from time import perf_counter\n"
+          "begin = perf_counter()\n"
+          "{statement}\n"
+          "elapsed = perf_counter() - begin\n"
+          "print(json.dumps({{'time': elapsed, 'modules': sorted({{name.split('.')[0] for name in sys.modules}})}}))\n")
+
+
+class ImportBenchmark:
+    """
+        Times the imports headless workers do, each one in a fresh interpreter, against a budget.
+
+        ImportBenchmark(cases: dict = IMPORT_CASES, repeat: int = 5, forbidden: tuple[str] = PLOTTING_MODULES)
+
+        Every case is a statement, e.g. `from socceranalyzer import Match`, run `repeat` times in a new python
+        process, keeping the best time. Third party packages the statement needs anyway, e.g. pandas, are
+        timed the same way and added to the budget, so the budget only covers the cost of socceranalyzer
+        itself and holds across machines. A case also fails when it loads any of the forbidden modules.
+
+        Attributes
+        ----------
+            public through @properties:
+                cases: dict[str, tuple]
+                    name to statement, baseline statement or None, and budget in seconds
+                repeat: int
+                    interpreters started per statement
+                forbidden: tuple[str]
+                    top level modules the statements must not load
+                results: list[dict]
+                    one entry per case, filled by run()
+
+        Methods
+        -------
+            public:
+                run() -> list[dict]
+                    times every case and checks it against its budget
+                passed() -> bool
+                    whether every case of the last run is within budget and loads no forbidden module
+                to_frame() -> pandas.DataFrame
+                    results as a table
+    """
+    def __init__(self, cases: dict = None, repeat: int = 5, forbidden: tuple[str] = PLOTTING_MODULES):
+        self.__cases = cases if cases is not None else IMPORT_CASES
+        self.__repeat = repeat
+        self.__forbidden = tuple(forbidden)
+        self.__results = []
+
+    @property
+    def cases(self):
+        return self.__cases
+
+    @property
+    def repeat(self):
+        return self.__repeat
+
+    @property
+    def forbidden(self):
+        return self.__forbidden
+
+    @property
+    def results(self):
+        return self.__results
+
+    def __time(self, statement: str) -> tuple[float, list[str]]:
+        """
+        Returns the best time of a statement over fresh interpreters and the modules it left loaded.
+        """
+        best, modules = None, []
+        for _ in range(self.__repeat):
+            process = subprocess.run([sys.executable, '-c', _TIMER.format(statement=statement)],
+                                     capture_output=True, text=True, check=True)
+            measure = json.loads(process.stdout.splitlines()[-1])
+            if best is None or measure['time'] < best:
+                best = measure['time']
+            modules = measure['modules']
+
+        return best, modules
+
+    def run(self) -> list[dict]:
+        """
+        Times every case and its baseline.
+
+                Returns:
+                        results (list[dict]): case, statement, time, baseline_time, budget, forbidden modules
+                                              loaded and status, 'ok' or 'failed', of every case
+        """
+        self.__results = []
+        baselines = {}
+
+        for name, (statement, baseline, budget) in self.__cases.items():
+            entry = {'case': name, 'statement': statement}
+            try:
+                elapsed, modules = self.__time(statement)
+                if baseline is not None and baseline not in baselines:
+                    baselines[baseline] = self.__time(baseline)[0]
+            except subprocess.CalledProcessError as err:
+                entry.update(status='failed', error=err.stderr.strip().splitlines()[-1])
+                self.__results.append(entry)
+                continue
+
+            baseline_time = baselines[baseline] if baseline is not None else 0.
+            loaded = [module for module in self.__forbidden if module in modules]
+
+            entry.update(time=elapsed, baseline_time=baseline_time, budget=baseline_time + budget,
+                         loaded=loaded, error=None)
+            entry['status'] = 'ok' if elapsed <= entry['budget'] and not loaded else 'failed'
+            self.__results.append(entry)
+
+        return self.__results
+
+    def passed(self) -> bool:
+        return all(entry['status'] == 'ok' for entry in self.__results)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.__results)
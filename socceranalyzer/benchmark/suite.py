@@ -0,0 +1,328 @@
+import contextlib
+import io
+import json
+import platform
+import tracemalloc
+from datetime import datetime
+from importlib import metadata
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.agent2D.analysis.tester_free_kick import TesterFK
+from socceranalyzer.benchmark.generators import hlkid_log, sim2d_log
+from socceranalyzer.common.analysis.ball_possession import BallPossession
+from socceranalyzer.common.analysis.base_footprint import BaseFootprint
+from socceranalyzer.common.analysis.corners_occurrencies import CornersOcurrencies
+from socceranalyzer.common.analysis.find_goals import FindGoals
+from socceranalyzer.common.analysis.foul_charge import FoulCharge
+from socceranalyzer.common.analysis.goalkeeper import GoalkeeperAnalysis
+from socceranalyzer.common.analysis.heatmap import Heatmap
+from socceranalyzer.common.analysis.intercept_counter import InterceptCounter
+from socceranalyzer.common.analysis.object_history import ObjectHistory
+from socceranalyzer.common.analysis.passing_accuracy import PassingAccuracy
+from socceranalyzer.common.analysis.penalty import Penalty
+from socceranalyzer.common.analysis.playmodes import Playmodes
+from socceranalyzer.common.analysis.shooting import Shooting
+from socceranalyzer.common.analysis.speed import Speed, TeamSpeed
+from socceranalyzer.common.analysis.stamina import Stamina
+from socceranalyzer.common.analysis.time_after_events import TimeAfterEvents
+from socceranalyzer.common.basic.match import Match
+from socceranalyzer.common.basic.match_frame import MatchFrame
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.common.chore.match_analyzer import MatchAnalyzer
+from socceranalyzer.common.dataframe.filter_self_localization import FilterSelfLocalizationCovariance
+from socceranalyzer.common.enums.hl_kid import HLKid
+from socceranalyzer.common.enums.sim2d import SIM2D
+from socceranalyzer.common.evaluators.passing import Passing
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.run_configuration import RunConfiguration
+
+# Every case receives the Match and returns the callable to be timed, so that the work an analysis depends
+# on (e.g. the Passing evaluator, the MatchFrame or the PlaymodeIndex) is done once and left out of its timing.
+SIM2D_CASES = {
+    'MatchFrame': lambda match: lambda: MatchFrame(match.dataframe, match.category),
+    'PlaymodeIndex': lambda match: lambda: PlaymodeIndex(match.dataframe[str(match.category.PLAYMODE)]),
+    'BallPossession': lambda match: lambda: BallPossession(match.dataframe, match.category, True, frame=match.frame),
+    'TesterFK': lambda match: lambda: TesterFK(match.dataframe, match.category, True, playmode_index=match.playmode_index),
+    'FoulCharge': lambda match: lambda: FoulCharge(match.dataframe, match.category, True, frame=match.frame, playmode_index=match.playmode_index),
+    'Penalty': lambda match: lambda: Penalty(match.dataframe, match.category, True, playmode_index=match.playmode_index, frame=match.frame),
+    'Playmodes': lambda match: lambda: Playmodes(match.dataframe, match.category, True),
+    'CornersOcurrencies': lambda match: lambda: CornersOcurrencies(match.dataframe, match.category, True, playmode_index=match.playmode_index, frame=match.frame),
+    'Passing': lambda match: lambda: Passing(match.dataframe, match.category, True, frame=match.frame).run_passing_evaluation(),
+    'PassingAccuracy': lambda match: _with_passing(match, lambda passing: PassingAccuracy(match.dataframe, match.category, passing, True)),
+    'InterceptCounter': lambda match: _with_passing(match, lambda passing: InterceptCounter(match, passing, True)),
+    'TimeAfterEvents': lambda match: _time_after_events(match),
+    'Stamina': lambda match: lambda: Stamina(match.dataframe, match.category, True),
+    'Shooting': lambda match: lambda: Shooting(match.dataframe, match.category, True, frame=match.frame),
+    'Heatmap': lambda match: lambda: Heatmap(match.dataframe, match.category, True, frame=match.frame),
+    'Speed': lambda match: lambda: Speed(match.dataframe, match.category, 9, 'l', True),
+    'TeamSpeed': lambda match: lambda: TeamSpeed(match.dataframe, match.category, True),
+    'FindGoals': lambda match: lambda: FindGoals(match.dataframe, match.category, True, playmode_index=match.playmode_index),
+    'GoalkeeperAnalysis': lambda match: lambda: GoalkeeperAnalysis(match.dataframe, match.category, True),
+    'MatchAnalyzer': lambda match: _match_analyzer(match),
+}
+
+HLKID_CASES = {
+    'Playmodes': lambda match: lambda: Playmodes(match.dataframe, match.category, True),
+    'BaseFootprint': lambda match: _on_copy(match, lambda df: BaseFootprint(df, match.category, True, 1, 1)),
+    'BaseFootprintAll': lambda match: _on_copy(match, lambda df: BaseFootprint(df, match.category, True)),
+    # ObjectHistory builds its pose on first access, so the cases include it
+    'ObjectHistory': lambda match: lambda: ObjectHistory(match.dataframe, match.category, True, 'ball.frame.pose').results(),
+    'SelfLocalization': lambda match: lambda: ObjectHistory(
+        match.dataframe, match.category, True, 'teams.team1.player1.team_comm.self_localization.pose',
+        filter=FilterSelfLocalizationCovariance).results(),
+    'Speed': lambda match: _speed(match),
+    'TeamSpeed': lambda match: _speed(match, team=True),
+    'MatchAnalyzer': lambda match: lambda: MatchAnalyzer(match, debug=True),
+}
+
+
+def _with_passing(match, analysis):
+    passing = Passing(match.dataframe, match.category, True, frame=match.frame)
+    passing.run_passing_evaluation()
+    return lambda: analysis(passing)
+
+
+def _time_after_events(match):
+    corners = CornersOcurrencies(match.dataframe, match.category, True).results()
+    fouls = FoulCharge(match.dataframe, match.category, True, frame=match.frame).results(tuple=True)
+    return lambda: TimeAfterEvents(match.dataframe, match.category, corners, True, fouls)
+
+
+def _match_analyzer(match):
+    config = RunConfiguration()
+    config.category = match.category
+    for name in MatchAnalyzer.SIM2D_REGISTRY.analysis_names:
+        setattr(config, name, True)
+
+    # a new Match per run, as MatchAnalyzer caches its MatchFrame
+    return lambda: MatchAnalyzer(Match(match.dataframe, match.category), run_config=config)
+
+
+def _on_copy(match, analysis):
+    """
+    For analyses that write into the dataframe, so the Match shared by the other cases is left untouched.
+    They write the same values on every run, so a single copy made outside the timing is enough.
+    """
+    dataframe = match.dataframe.copy()
+    return lambda: analysis(dataframe)
+
+
+def _speed(match, team=False):
+    dataframe = BaseFootprint(match.dataframe, match.category, True).results()
+    if team:
+        return lambda: TeamSpeed(dataframe, match.category, True)
+    return lambda: Speed(dataframe, match.category, 1, 'l', True)
+
+
+def package_version():
+    try:
+        return metadata.version('socceranalyzer')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+class BenchmarkSuite:
+    """
+        Times every analysis class on synthetic logs of increasing length.
+
+        BenchmarkSuite(categories: tuple = (SIM2D, HLKid), cycles: tuple[int] = (1000, 10000), repeat: int = 3,
+                       seed: int = 0, analyses: list[str] = None, label: str = None)
+
+        Every analysis runs `repeat` times on a log generated by socceranalyzer.benchmark.generators, with debug
+        enabled so a failure is reported instead of timed. The best run gives the throughput in cycles per
+        second, and one extra run under tracemalloc gives the peak memory allocated by the analysis.
+        Logger output of the analyses is silenced while they run.
+
+        Attributes
+        ----------
+            public through @properties:
+                categories: tuple
+                    categories to benchmark, SIM2D and/or HLKid
+                cycles: tuple[int]
+                    lengths of the generated logs
+                repeat: int
+                    timed runs per analysis and length
+                label: str
+                    free text stored with the results, e.g. a version or commit to compare against
+                results: list[dict]
+                    one entry per category, analysis and length, filled by run()
+
+        Methods
+        -------
+            public:
+                run() -> list[dict]
+                    generates the logs and times every analysis
+                to_dict() -> dict
+                    results along with the environment they were measured in
+                save(path: str) -> None
+                    writes to_dict() as JSON
+                load(path: str) -> dict
+                    reads a file written by save()
+                compare(baseline: str | dict, current: str | dict) -> pandas.DataFrame
+                    speedup and memory change of every analysis between two saved runs
+    """
+    CASES = {SIM2D: SIM2D_CASES, HLKid: HLKID_CASES}
+
+    def __init__(self, categories: tuple = (SIM2D, HLKid), cycles: tuple[int] = (1000, 10000), repeat: int = 3,
+                 seed: int = 0, analyses: list[str] = None, label: str = None):
+        for category in categories:
+            if category not in self.CASES:
+                raise NotImplementedError(f'There are no benchmarks for {category} matches.')
+
+        self.__categories = tuple(categories)
+        self.__cycles = tuple(cycles)
+        self.__repeat = repeat
+        self.__seed = seed
+        self.__analyses = analyses
+        self.__label = label
+        self.__results = []
+
+    @property
+    def categories(self):
+        return self.__categories
+
+    @property
+    def cycles(self):
+        return self.__cycles
+
+    @property
+    def repeat(self):
+        return self.__repeat
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def results(self):
+        return self.__results
+
+    def __match(self, category, cycles):
+        if category is SIM2D:
+            return Match(sim2d_log(cycles, self.__seed), SIM2D)
+
+        dataframe, meta_data = hlkid_log(cycles, self.__seed)
+        return Match(dataframe, HLKid, meta_data)
+
+    def __measure(self, case, match):
+        """
+        Times a single analysis, returning its result entry.
+        """
+        entry = {'status': 'ok', 'error': None}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                run = case(match)
+
+                times = []
+                for _ in range(self.__repeat):
+                    begin = perf_counter()
+                    run()
+                    times.append(perf_counter() - begin)
+
+                tracemalloc.start()
+                try:
+                    run()
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+            except Exception as err:
+                entry.update(status='failed', error=f'{type(err).__name__}: {err}')
+                return entry
+
+        entry.update(best_time=min(times), mean_time=float(np.mean(times)),
+                     cycles_per_second=len(match.dataframe) / min(times) if min(times) > 0 else None,
+                     peak_memory_mb=peak / 2**20)
+        return entry
+
+    def run(self) -> list[dict]:
+        """
+        Generates a log for every category and length and times every analysis on it.
+
+                Returns:
+                        results (list[dict]): category, analysis, cycles, status, error, best_time, mean_time,
+                                              cycles_per_second and peak_memory_mb of every measurement
+        """
+        self.__results = []
+
+        for category in self.__categories:
+            cases = self.CASES[category]
+            names = [name for name in cases if self.__analyses is None or name in self.__analyses]
+
+            for cycles in self.__cycles:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    match = self.__match(category, cycles)
+
+                for name in names:
+                    entry = {'category': category.__name__, 'analysis': name, 'cycles': cycles}
+                    entry.update(self.__measure(cases[name], match))
+                    self.__results.append(entry)
+
+                    if entry['status'] == 'ok':
+                        Logger.info(f"{entry['category']} {name} {cycles} cycles: {entry['best_time']:.4f} s, "
+                                    f"{entry['cycles_per_second']:,.0f} cycles/s, {entry['peak_memory_mb']:.1f} MB")
+                    else:
+                        Logger.error(f"{entry['category']} {name} {cycles} cycles: {entry['error']}")
+
+        return self.__results
+
+    def to_dict(self) -> dict:
+        """
+        Returns the results along with the environment they were measured in.
+        """
+        return {
+            'label': self.__label,
+            'version': package_version(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'seed': self.__seed,
+            'repeat': self.__repeat,
+            'results': self.__results,
+        }
+
+    def save(self, path: str):
+        """
+        Writes the results as JSON, to be compared offline against other versions with compare().
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """
+        Reads a file written by save().
+        """
+        with open(path) as file:
+            return json.load(file)
+
+    @staticmethod
+    def compare(baseline, current) -> pd.DataFrame:
+        """
+        Compares two saved runs, matching their measurements by category, analysis and cycles.
+        Measurements present in only one of the runs are left out.
+
+                Parameters:
+                        baseline (str | dict): path to, or contents of, the reference run
+                        current (str | dict): path to, or contents of, the run being evaluated
+
+                Returns:
+                        comparison (pandas.DataFrame): best times of both runs, speedup (baseline / current,
+                                                       above 1 is faster) and peak memory change in MB
+        """
+        runs = [BenchmarkSuite.load(run) if isinstance(run, str) else run for run in (baseline, current)]
+        keys = ['category', 'analysis', 'cycles']
+        columns = keys + ['best_time', 'peak_memory_mb']
+
+        before, after = (pd.DataFrame(run['results']).reindex(columns=columns) for run in runs)
+        comparison = before.merge(after, on=keys, suffixes=('_baseline', '_current'))
+
+        comparison['speedup'] = comparison['best_time_baseline'] / comparison['best_time_current']
+        comparison['memory_change_mb'] = comparison['peak_memory_mb_current'] - comparison['peak_memory_mb_baseline']
+        return comparison
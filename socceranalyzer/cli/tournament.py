@@ -0,0 +1,282 @@
+import math
+import os
+from glob import glob
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.common.chore.batch_runner import BatchRunner
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.run_configuration import RunConfiguration
+
+SIDES = ('l', 'r')
+# columns of a match row that are not per-team metrics, even when they end with a side suffix
+MATCH_COLUMNS = ('log', 'status', 'error', 'wall_time', 'size', 'mtime', 'analyzed_at',
+                 'team_l', 'team_r', 'score_l', 'score_r')
+# every stored metric is a count, a sum or a share, so none is negative; these also have an upper bound
+METRIC_BOUNDS = {'ball_possession': (0.0, 1.0), 'passing_accuracy': (0.0, 1.0), 'points': (0.0, 3.0)}
+
+
+def _t_critical(confidence: float, df: int) -> float:
+    """
+    Returns t such that P(|T| < t) = confidence for a Student-t with df degrees of freedom.
+    P(|T| < t) has a closed form for integer df in theta = atan(t / sqrt(df)), Abramowitz and Stegun 26.7.3-4,
+    which grows with theta, so it is inverted by bisection on theta.
+    """
+    def probability(theta):
+        sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+        if df % 2:
+            term, total = 1.0, 1.0 if df > 1 else 0.0
+            for k in range(1, (df - 1) // 2):
+                term *= cos2 * 2 * k / (2 * k + 1)
+                total += term
+            return 2 / math.pi * (theta + sin * math.cos(theta) * total)
+
+        term, total = 1.0, 1.0
+        for k in range(1, df // 2):
+            term *= cos2 * (2 * k - 1) / (2 * k)
+            total += term
+        return sin * total
+
+    low, high = 0.0, math.pi / 2
+    for _ in range(60):
+        middle = (low + high) / 2
+        if probability(middle) < confidence:
+            low = middle
+        else:
+            high = middle
+
+    return math.sqrt(df) * math.tan((low + high) / 2)
+
+
+class Tournament:
+    """
+        Aggregates the analysis results of every match of a tournament, kept in a Parquet store.
+
+        Tournament(config: RunConfiguration, store_dir: str = 'tournament', workers: int = None, pattern: str = '*.rcg.csv')
+
+        Logs in config.logs_dir are analyzed in parallel by BatchRunner, one row per match. Each update writes
+        the rows of the logs analyzed in it to a new Parquet part inside store_dir, so only logs added or
+        changed since the last update, by size or modification time, are analyzed again.
+        Team statistics are computed over the stored rows with Student-t confidence intervals.
+
+        Attributes
+        ----------
+            public through @properties:
+                config: RunConfiguration
+                    enabled analysis and logs folder
+                store_dir: str
+                    folder of the Parquet parts
+                workers: int
+                    number of worker processes, None for the BatchRunner default
+                logs: list[str]
+                    sorted paths of the logs found in the logs folder
+                matches: pandas.DataFrame
+                    latest row of every stored match
+                failures: pandas.DataFrame
+                    stored matches that could not be analyzed
+
+        Methods
+        -------
+            public:
+                pending() -> list[str]
+                    logs never analyzed, not analyzed ok or changed since their stored row
+                update() -> pandas.DataFrame
+                    analyzes the pending logs and stores their rows
+                compact() -> None
+                    rewrites the store as a single part holding the latest rows
+                team_results() -> pandas.DataFrame
+                    one row per team and match, from the point of view of the team
+                team_stats(confidence: float = 0.95) -> pandas.DataFrame
+                    per team record and mean of every metric with its confidence interval
+    """
+    PART_PREFIX = 'matches-'
+
+    def __init__(self, config: RunConfiguration, store_dir: str = 'tournament', workers: int = None, pattern: str = '*.rcg.csv'):
+        self.__config = config
+        self.__store_dir = store_dir
+        self.__workers = workers
+        self.__pattern = pattern
+        self.__matches: pd.DataFrame = None
+
+        os.makedirs(store_dir, exist_ok=True)
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def store_dir(self):
+        return self.__store_dir
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @property
+    def logs(self):
+        return sorted(glob(os.path.join(self.__config.logs_dir, self.__pattern)))
+
+    @property
+    def matches(self):
+        if self.__matches is None:
+            self.__matches = self.__load()
+        return self.__matches
+
+    @property
+    def failures(self):
+        matches = self.matches
+        if matches.empty:
+            return matches
+        return matches[matches.status == 'failed']
+
+    def pending(self) -> list[str]:
+        """
+        Returns the logs that were never analyzed, whose latest row is not ok, or that changed on disk since
+        their row was stored.
+        """
+        stored = self.matches
+        if stored.empty:
+            return self.logs
+
+        stored = stored.set_index('log')[['status', 'size', 'mtime']]
+        pending = []
+        for path in self.logs:
+            log = os.path.basename(path)
+            stat = os.stat(path)
+            if (log not in stored.index or stored.at[log, 'status'] != 'ok'
+                    or (stored.at[log, 'size'], stored.at[log, 'mtime']) != (stat.st_size, stat.st_mtime)):
+                pending.append(path)
+
+        return pending
+
+    def update(self) -> pd.DataFrame:
+        """
+        Analyzes the pending logs and stores their rows in a new Parquet part.
+
+                Returns:
+                        rows (pandas.DataFrame): rows of the logs analyzed in this update
+        """
+        pending = self.pending()
+        if not pending:
+            Logger.info(f"Tournament is up to date with {len(self.matches)} matches.")
+            return pd.DataFrame()
+
+        Logger.info(f"{len(pending)} new logs, {len(self.matches)} matches already stored.")
+        rows = BatchRunner(self.__config, self.__workers, logs=pending).run()
+
+        paths = {os.path.basename(path): path for path in pending}
+        stats = [os.stat(paths[log]) for log in rows['log']]
+        rows['size'] = [stat.st_size for stat in stats]
+        rows['mtime'] = [stat.st_mtime for stat in stats]
+        rows['analyzed_at'] = time()
+
+        parts = len(self.__parts())
+        rows.to_parquet(os.path.join(self.__store_dir, f'{self.PART_PREFIX}{parts:05d}.parquet'), index=False)
+        self.__matches = None
+
+        return rows
+
+    def compact(self):
+        """
+        Rewrites the store as a single part with the latest row of every match, dropping superseded rows.
+        """
+        matches = self.matches
+        parts = self.__parts()
+        if len(parts) < 2:
+            return
+
+        matches.to_parquet(os.path.join(self.__store_dir, f'{self.PART_PREFIX}{len(parts):05d}.parquet'), index=False)
+        for part in parts:
+            os.remove(part)
+        os.rename(os.path.join(self.__store_dir, f'{self.PART_PREFIX}{len(parts):05d}.parquet'),
+                  os.path.join(self.__store_dir, f'{self.PART_PREFIX}00000.parquet'))
+
+    def team_results(self) -> pd.DataFrame:
+        """
+        Returns one row per team and analyzed match, with the metrics of the team and the goals for and against.
+        Metrics are the summary columns with a side suffix, e.g. xG_l becomes the xG of the left team.
+
+                Returns:
+                        results (pandas.DataFrame): team, opponent, log, goals_for, goals_against, points and metrics
+        """
+        matches = self.matches
+        if matches.empty or 'team_l' not in matches:
+            return pd.DataFrame(columns=['team', 'opponent', 'log', 'goals_for', 'goals_against', 'points'])
+
+        matches = matches[matches.status == 'ok']
+        metrics = [column[:-2] for column in matches.columns
+                   if column.endswith('_l') and column not in MATCH_COLUMNS and f'{column[:-2]}_r' in matches]
+
+        sides = []
+        for side, other in (SIDES, SIDES[::-1]):
+            team = pd.DataFrame({
+                'team': matches[f'team_{side}'].to_numpy(),
+                'opponent': matches[f'team_{other}'].to_numpy(),
+                'log': matches['log'].to_numpy(),
+                'goals_for': matches[f'score_{side}'].to_numpy(),
+                'goals_against': matches[f'score_{other}'].to_numpy(),
+            })
+            for metric in metrics:
+                team[metric] = matches[f'{metric}_{side}'].to_numpy()
+            sides.append(team)
+
+        results = pd.concat(sides, ignore_index=True)
+        results.insert(5, 'points', np.select([results.goals_for > results.goals_against,
+                                               results.goals_for == results.goals_against], [3, 1], 0))
+        return results
+
+    def team_stats(self, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Returns the record of every team and the mean of each metric per match, with its confidence interval.
+        Intervals are mean +- t * std / sqrt(matches), with the Student-t quantile for matches - 1 degrees of
+        freedom, clipped to the values the metric can take, e.g. possession within [0, 1]. They are NaN below
+        two matches.
+
+                Parameters:
+                        confidence (float): confidence level of the intervals
+
+                Returns:
+                        stats (pandas.DataFrame): one row per team, sorted by points per match
+        """
+        results = self.team_results()
+        if results.empty:
+            return pd.DataFrame()
+
+        metrics = results.columns.drop(['team', 'opponent', 'log'])
+        groups = results.groupby('team')
+
+        stats = pd.DataFrame({
+            'matches': groups.size(),
+            'wins': groups['points'].apply(lambda points: (points == 3).sum()),
+            'draws': groups['points'].apply(lambda points: (points == 1).sum()),
+            'losses': groups['points'].apply(lambda points: (points == 0).sum()),
+        })
+
+        mean = groups[metrics].mean()
+        matches = stats['matches'].to_numpy()
+        t = np.array([_t_critical(confidence, n - 1) if n > 1 else np.nan for n in matches])
+        margin = groups[metrics].std().mul(t / np.sqrt(matches), axis=0)
+        for metric in metrics:
+            low, high = METRIC_BOUNDS.get(metric, (0.0, None))
+            stats[metric] = mean[metric]
+            stats[f'{metric}_ci_low'] = (mean[metric] - margin[metric]).clip(low, high)
+            stats[f'{metric}_ci_high'] = (mean[metric] + margin[metric]).clip(low, high)
+
+        return stats.sort_values('points', ascending=False).reset_index()
+
+    def __parts(self) -> list[str]:
+        return sorted(glob(os.path.join(self.__store_dir, f'{self.PART_PREFIX}*.parquet')))
+
+    def __load(self) -> pd.DataFrame:
+        """
+        Reads every part of the store, keeping the latest row of each log.
+        Parts are read one by one, as the enabled analysis, and so the columns, may differ between updates.
+        """
+        parts = [pd.read_parquet(part) for part in self.__parts()]
+        if not parts:
+            return pd.DataFrame(columns=['log', 'status', 'size', 'mtime', 'analyzed_at'])
+
+        matches = pd.concat(parts, ignore_index=True)
+        return matches.sort_values('analyzed_at', kind='stable').drop_duplicates('log', keep='last').sort_values('log').reset_index(drop=True)
@@ -16,4 +16,11 @@ class AbstractAnalysis(metaclass=ABCMeta):
 
     @abstractmethod
     def serialize(self):
-        pass
\ No newline at end of file
+        pass
+
+    @staticmethod
+    def columns(category) -> list[str]:
+        """
+            Returns the dataframe columns this analysis reads, so logs can be loaded with only them.
+        """
+        raise NotImplementedError
\ No newline at end of file
@@ -1,6 +1,10 @@
+import numpy as np
+import pandas as pd
+
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.evaluators.ball_holder import BallHolderEvaluator
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 class BallPossession:
     """
@@ -15,6 +19,8 @@ class BallPossession:
                     amount of cycles the right team was closest to the ball
                 current_game : common.basic.game.Game
                     a Game object of the current game
+                frame : MatchFrame
+                    optional columnar view of the match, used instead of the dataframe columns when given
                 BALL_X_COLUMN : int
                     ball x position in the dataframe
                 BALL_Y_COLUMN : int
@@ -33,13 +39,16 @@ class BallPossession:
                     returns the left_team_possession(a) and right_team_possession(b) in percentual
                 newGame(game : DataFrame)
                     updates the object with new game and calculates the new ball possession
+                update(chunk : DataFrame) -> None
+                    adds the possession of a chunk of new cycles, used by StreamingMatchAnalyzer
     """
 
-    def __init__(self, data_frame, category, debug):
+    def __init__(self, data_frame, category, debug, frame=None):
         self.__left_team_possession = 0
         self.__right_team_possession = 0
         self.__category = category
         self.__current_game_log = data_frame
+        self.__frame = frame
         self.__total = 0
 
         try:
@@ -51,6 +60,13 @@ class BallPossession:
         else: 
             Logger.success("BallPossession has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        """
+            Possession needs the playmode, the ball and every player's position.
+        """
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + Mediator.players_columns(category, ('x', 'y'))
+
     def __str__(self):
         values = self.results()
         return f'Team left: {values[0]}\nTeam right: {values[1]}'
@@ -67,21 +83,36 @@ class BallPossession:
         """
             Uses socceranalyzer.common.evaluators.ball_holder to populate left_team_possession and right_team_possession
         """
-        filtered_game = self.__filter_playmode('play_on')
+        if self.__frame is not None:
+            closest_side, _, _ = BallHolderEvaluator(self.__current_game_log, self.category, self.__frame).all_cycles()
+            closest_side = closest_side[self.__frame.playmode_is('play_on')]
+        else:
+            filtered_game = self.__filter_playmode('play_on')
 
-        ball_holder_analysis = BallHolderEvaluator(filtered_game, self.category)
+            ball_holder_analysis = BallHolderEvaluator(filtered_game, self.category)
+            closest_side, _, _ = ball_holder_analysis.all_cycles()
 
-        for current_cycle, row in filtered_game.iterrows():
-            closest_side = ball_holder_analysis.at(current_cycle)[2]
+        self.__left_team_possession = int(np.count_nonzero(closest_side == 'left'))
+        self.__right_team_possession = len(closest_side) - self.__left_team_possession
 
-            if closest_side == 'left':
-                self.__left_team_possession += 1
-            else:
-                self.__right_team_possession += 1
+        self.__total = self.__right_team_possession + self.__left_team_possession
+
+    def update(self, chunk):
+        """
+            Adds the possession of a chunk of new cycles without going over the previous ones again.
+        """
+        play_on = chunk[chunk[str(self.category.PLAYMODE)] == 'play_on']
+        closest_side, _, _ = BallHolderEvaluator(play_on, self.category).all_cycles()
+
+        left = int(np.count_nonzero(closest_side == 'left'))
+        self.__left_team_possession += left
+        self.__right_team_possession += len(closest_side) - left
 
         self.__total = self.__right_team_possession + self.__left_team_possession
 
     def results(self):
+        if self.__total == 0:
+            return (0.0, 0.0)
         return (self.__left_team_possession / self.__total, self.__right_team_possession / self.__total)
 
     def describe(self):
@@ -90,5 +121,8 @@ class BallPossession:
         print(f'{name_l}: {self.__left_team_possession/self.__total}\n' 
                 f'{name_r}: {self.__right_team_possession/self.__total}')
 
-    def serialize(self):
-        raise NotImplementedError
\ No newline at end of file
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the possession of each team as a table, one row per side.
+        """
+        return {'possession': pd.DataFrame({'side': ['l', 'r'], 'possession': self.results()})}
\ No newline at end of file
@@ -1,8 +1,8 @@
+import re
 from enum import Enum
 
 import numpy as np
 import pandas as pd
-import transforms3d
 
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
 from socceranalyzer.utils.logger import Logger
@@ -18,8 +18,14 @@ class BaseFootprint(AbstractAnalysis):
     The translation component of the frame should be the barycenter of the feet projections on the floor.
     With respect to the odom frame, the roll and pitch angles should be zero and
     the yaw angle should correspond to the base_link yaw angle.
+
+    BaseFootprint(dataframe: pandas.DataFrame, category: Enum, debug: bool, team_number: int = None, player_id: int = None)
+
+    Computes the footprint of the given player, or of every player in the dataframe when no player is given,
+    with the quaternion conversions batched over whole columns. The footprint columns of all players are
+    added to the dataframe as one block, and results() returns the resulting dataframe.
     """
-    def __init__(self, dataframe, category: Enum, debug, team_number: int, player_id: int):
+    def __init__(self, dataframe, category: Enum, debug, team_number: int = None, player_id: int = None):
         self.df = dataframe
         self.__category = category
         self.__team_number = team_number
@@ -32,7 +38,10 @@ class BaseFootprint(AbstractAnalysis):
             if debug:
                 raise
         else:
-            Logger.success(f"BaseFootprint for team {team_number}, player {player_id} has results.")
+            if team_number is None:
+                Logger.success(f"BaseFootprint for every player has results.")
+            else:
+                Logger.success(f"BaseFootprint for team {team_number}, player {player_id} has results.")
             
     @property
     def dataframe(self):
@@ -42,47 +51,67 @@ class BaseFootprint(AbstractAnalysis):
     def category(self):
         return self.__category
 
+    @staticmethod
+    def players(dataframe) -> list[str]:
+        """
+        Returns the prefix, e.g. teams.team1.player1, of every player with a base_link in the dataframe.
+        """
+        pattern = re.compile(r'^(teams\.team\d+\.player\d+)\.base_link\.rotation\.w$')
+        return [match.group(1) for match in map(pattern.match, dataframe.columns) if match]
+
+    @staticmethod
+    def yaw(quaternions: np.ndarray) -> np.ndarray:
+        """
+        Returns the yaw of (..., 4) quaternions in (w, x, y, z) order, as transforms3d.euler.quat2euler
+        with the static xyz axes does for one quaternion. The quaternions do not need to be normalized.
+        Yaw is 0 for degenerate quaternions and at gimbal lock, where quat2euler puts the rotation in roll.
+        """
+        w, x, y, z = np.moveaxis(quaternions, -1, 0)
+        norm = w * w + x * x + y * y + z * z
+        scale = np.divide(2.0, norm, out=np.zeros_like(norm), where=norm >= np.finfo(np.float64).eps)
+
+        # first column of the rotation matrix
+        m00 = 1.0 - scale * (y * y + z * z)
+        m10 = scale * (x * y + w * z)
+
+        cos_pitch = np.hypot(m00, m10)
+        return np.where(cos_pitch > np.finfo(np.float64).eps * 4.0, np.arctan2(m10, m00), 0.0)
+
+    @staticmethod
+    def yaw_quaternion(yaw: np.ndarray) -> np.ndarray:
+        """
+        Returns the (..., 4) quaternions in (w, x, y, z) order of rotations around z only, as
+        transforms3d.euler.euler2quat(0, 0, yaw) does for one angle.
+        """
+        half = np.asarray(yaw) / 2
+        zeros = np.zeros_like(half)
+        return np.stack((np.cos(half), zeros, zeros, np.sin(half)), axis=-1)
+
     def _analyze(self):
-        player_prefix = f'teams.team{self.__team_number}.player{self.__player_id}'
-        base_link_prefix = f'{player_prefix}.base_link'
-        l_sole_prefix = f'{player_prefix}.l_sole'
-        r_sole_prefix = f'{player_prefix}.r_sole'
-        base_footprint_prefix = f'{player_prefix}.base_footprint'
-
-        def get_base_footprint(
-                df: pd.DataFrame,
-                base_link_prefix: str,
-                l_sole_prefix: str,
-                r_sole_prefix: str,
-                base_footprint_prefix: str,
-                ) -> pd.DataFrame:
-            # Position is in the center between the two feet
-            df[f'{base_footprint_prefix}.position.x'] = (df[f'{l_sole_prefix}.position.x'] + df[f'{r_sole_prefix}.position.x']) / 2
-            df[f'{base_footprint_prefix}.position.y'] = (df[f'{l_sole_prefix}.position.y'] + df[f'{r_sole_prefix}.position.y']) / 2
-            df[f'{base_footprint_prefix}.position.z'] = (df[f'{l_sole_prefix}.position.z'] + df[f'{r_sole_prefix}.position.z']) / 2
+        if self.__team_number is None:
+            prefixes = self.players(self.df)
+        else:
+            prefixes = [f'teams.team{self.__team_number}.player{self.__player_id}']
 
-            # Rotation:
-            quat = np.zeros((len(df), 4))
+        columns = {}
+        for player_prefix in prefixes:
+            l_sole = self.df[[f'{player_prefix}.l_sole.position.{axis}' for axis in 'xyz']].to_numpy(dtype=np.float64)
+            r_sole = self.df[[f'{player_prefix}.r_sole.position.{axis}' for axis in 'xyz']].to_numpy(dtype=np.float64)
+            rotation = self.df[[f'{player_prefix}.base_link.rotation.{axis}' for axis in 'wxyz']].to_numpy(dtype=np.float64)
 
-            for i in range(len(df)):
-                # Convert base_link quaternion to Euler angles, we only need the yaw angle
-                _, _, yaw = transforms3d.euler.quat2euler((
-                    df[f'{base_link_prefix}.rotation.w'][i],
-                    df[f'{base_link_prefix}.rotation.x'][i],
-                    df[f'{base_link_prefix}.rotation.y'][i],
-                    df[f'{base_link_prefix}.rotation.z'][i],
-                ))
+            # Position is in the center between the two feet
+            position = (l_sole + r_sole) / 2
 
-                # Convert back to quaternion, roll and pitch are 0
-                quat[i] = transforms3d.euler.euler2quat(0, 0, yaw)
+            # Rotation keeps only the base_link yaw, roll and pitch are 0
+            quat = self.yaw_quaternion(self.yaw(rotation))
 
-            df[f'{base_footprint_prefix}.rotation.w'] = quat[:, 0]
-            df[f'{base_footprint_prefix}.rotation.x'] = quat[:, 1]
-            df[f'{base_footprint_prefix}.rotation.y'] = quat[:, 2]
-            df[f'{base_footprint_prefix}.rotation.z'] = quat[:, 3]
-            return df
+            base_footprint_prefix = f'{player_prefix}.base_footprint'
+            columns.update((f'{base_footprint_prefix}.position.{axis}', position[:, i]) for i, axis in enumerate('xyz'))
+            columns.update((f'{base_footprint_prefix}.rotation.{axis}', quat[:, i]) for i, axis in enumerate('wxyz'))
 
-        self.df = get_base_footprint(self.df, base_link_prefix, l_sole_prefix, r_sole_prefix, base_footprint_prefix)
+        # a single block of new columns, instead of one insert per column
+        block = pd.DataFrame(columns, index=self.df.index)
+        self.df = pd.concat((self.df.drop(columns=block.columns.intersection(self.df.columns)), block), axis=1)
 
     def describe(self):
         Logger.data("No description available")
@@ -90,5 +119,9 @@ class BaseFootprint(AbstractAnalysis):
     def results(self) -> pd.DataFrame:
         return self.df
 
-    def serialize(self):
-        raise NotImplementedError
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+        Returns the footprint columns of the players as a per cycle table, with the log row.
+        """
+        columns = [column for column in self.df.columns if '.base_footprint.' in column]
+        return {'base_footprint': self.df[columns].rename_axis('row').reset_index()}
@@ -1,14 +1,23 @@
+import numpy as np
+import pandas as pd
+
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
-from socceranalyzer.common.dataframe.finders import find_last_unique_event_ocurrences
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.common.dataframe.finders import EVENT_DTYPE, event_records, find_last_unique_event_ocurrences
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 class CornersOcurrencies(AbstractAnalysis):
-    def __init__(self, dataframe, category, debug):
+    def __init__(self, dataframe, category, debug, playmode_index: PlaymodeIndex = None, frame=None):
         self.__category = category
         self.__df = dataframe
+        self.__playmode_index = playmode_index
+        self.__frame = frame
 
-        self.__left_occurrencies = []
-        self.__right_occurrencies = []
+        # a corner is registered at the first row after its corner_kick playmode ends, when it is kicked
+        self.__corners = np.empty(0, dtype=EVENT_DTYPE)
+        self.__last_playmode = None
+        self.__rows = 0
 
         try:
             self._analyze()
@@ -19,6 +28,10 @@ class CornersOcurrencies(AbstractAnalysis):
         else:
             Logger.success("CornersOccurrencies has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)]
+
     @property
     def dataframe(self):
         return self.__df
@@ -28,17 +41,64 @@ class CornersOcurrencies(AbstractAnalysis):
         return self.__category
 
     def _analyze(self):
-        self.__left_occurrencies = find_last_unique_event_ocurrences(self.dataframe, str(self.category.TEAM_LEFT_CORNER))
-        self.__right_occurrencies = find_last_unique_event_ocurrences(self.dataframe, str(self.category.TEAM_RIGHT_CORNER))
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.dataframe[str(self.category.PLAYMODE)])
+
+        if self.__frame is not None:
+            ball, game_time = self.__frame.ball, self.__frame.game_time
+        else:
+            ball = self.dataframe[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy()
+            game_time = self.dataframe[str(self.category.GAME_TIME)].to_numpy()
+
+        left = find_last_unique_event_ocurrences(self.dataframe, str(self.category.TEAM_LEFT_CORNER), self.__playmode_index)
+        right = find_last_unique_event_ocurrences(self.dataframe, str(self.category.TEAM_RIGHT_CORNER), self.__playmode_index)
+        corners = np.concatenate((event_records('l', left, game_time, ball), event_records('r', right, game_time, ball)))
+
+        self.__corners = corners[np.argsort(corners['row'], kind='stable')]
+        self.__rows = len(self.dataframe)
+        if self.__rows:
+            self.__last_playmode = self.dataframe[str(self.category.PLAYMODE)].iloc[-1]
+
+    def update(self, chunk):
+        """
+            Adds the corners of a chunk of new cycles. As in _analyze, a corner is registered at the
+            position of the first cycle after its corner_kick playmode ends.
+        """
+        playmode = chunk[str(self.category.PLAYMODE)].to_numpy()
+        previous = np.concatenate(([self.__last_playmode], playmode[:-1]))
+        ball = chunk[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy()
+        game_time = chunk[str(self.category.GAME_TIME)].to_numpy()
+
+        left = np.flatnonzero((previous == str(self.category.TEAM_LEFT_CORNER)) & (playmode != str(self.category.TEAM_LEFT_CORNER)))
+        right = np.flatnonzero((previous == str(self.category.TEAM_RIGHT_CORNER)) & (playmode != str(self.category.TEAM_RIGHT_CORNER)))
+        corners = np.concatenate((event_records('l', left, game_time, ball, self.__rows),
+                                  event_records('r', right, game_time, ball, self.__rows)))
+
+        self.__corners = np.concatenate((self.__corners, corners[np.argsort(corners['row'], kind='stable')]))
+        self.__rows += len(playmode)
+        if len(playmode):
+            self.__last_playmode = playmode[-1]
+
+    def events(self):
+        """
+            Returns the corners as an EVENT_DTYPE structured array, one record per corner with the side that
+            kicks it, the row and cycle it is kicked at and the ball position there, in the order they happened.
+        """
+        return self.__corners
 
     def results(self):
-        return (self.__left_occurrencies, self.__right_occurrencies)
+        sides = self.__corners['side']
+        return (self.__corners['row'][sides == 'l'].tolist(), self.__corners['row'][sides == 'r'].tolist())
 
     def describe(self):
         name_l = self.dataframe.loc[1, str(self.category.TEAM_LEFT)]
         name_r = self.dataframe.loc[1, str(self.category.TEAM_RIGHT)]
-        print(f'{name_l} had {len(self.__left_occurrencies)} corner to kick at: {self.__left_occurrencies}\n'
-              f'{name_r} had {len(self.__right_occurrencies)} corner to kick at: {self.__right_occurrencies}')
+        left, right = self.results()
+        print(f'{name_l} had {len(left)} corner to kick at: {left}\n'
+              f'{name_r} had {len(right)} corner to kick at: {right}')
 
-    def serialize(self):
-        raise NotImplementedError
\ No newline at end of file
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the corners as an event table, one row per corner with the columns of events().
+        """
+        return {'corners': pd.DataFrame(self.__corners)}
\ No newline at end of file
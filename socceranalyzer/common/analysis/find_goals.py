@@ -1,8 +1,11 @@
+import numpy as np
 import pandas
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.enums.ssl import SSL
 from socceranalyzer.common.enums.vss import VSS
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 class FindGoals:
     """
@@ -32,11 +35,14 @@ class FindGoals:
                     
             public:
                 results() -> [int]
+                serialize() -> dict[str, pandas.DataFrame]
+                    goals as an event table, one row per goal with the side that scored it and its index
     """
 
-    def __init__(self, dataframe: pandas.DataFrame, category: SSL | SIM2D | VSS, debug) -> None:
+    def __init__(self, dataframe: pandas.DataFrame, category: SSL | SIM2D | VSS, debug, playmode_index: PlaymodeIndex = None) -> None:
         self.__dataframe = dataframe
         self.__category = category
+        self.__playmode_index = playmode_index
         self.__goal_moments = []
         self.__left_team_goals = []
         self.__right_team_goals = []
@@ -50,23 +56,28 @@ class FindGoals:
         else:
             Logger.success("FindGoals has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        """
+            Goals are read from the playmode, so the match columns are enough.
+        """
+        return Mediator.match_columns(category)
+
     def _analyze(self) -> None:
         """
             Finds out at which cycles a goal happened and populates goal_moments.
         """
-        filtered_dataframe = self.__dataframe.loc[(self.__dataframe[str(self.__category.PLAYMODE)] == str(self.__category.GOAL_SCORED_L)) |
-                                                (self.__dataframe[str(self.__category.PLAYMODE)] == str(self.__category.GOAL_SCORED_R))]
-        
-        for index, row in filtered_dataframe.iterrows():
-            if (self.__dataframe.iloc[index - 1][str(self.__category.PLAYMODE)] != row[str(self.__category.PLAYMODE)]):
-                # Goal happened
-                self.__goal_moments.append(index)
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.__dataframe[str(self.__category.PLAYMODE)])
 
-                if (row[str(self.__category.PLAYMODE)] == str(self.__category.GOAL_SCORED_L)):
-                    self.__left_team_goals.append(index)
+        # a goal happened where a goal playmode segment starts
+        left, _ = self.__playmode_index.segments(str(self.__category.GOAL_SCORED_L))
+        right, _ = self.__playmode_index.segments(str(self.__category.GOAL_SCORED_R))
 
-                else:
-                    self.__right_team_goals.append(index)
+        index = self.__dataframe.index
+        self.__left_team_goals = index[left].tolist()
+        self.__right_team_goals = index[right].tolist()
+        self.__goal_moments = index[np.sort(np.concatenate((left, right)))].tolist()
 
     def results(self, team: str = None) -> list:
         """
@@ -83,4 +94,12 @@ class FindGoals:
             return self.__left_team_goals
         
         elif (team == "right"):
-            return self.__right_team_goals
\ No newline at end of file
+            return self.__right_team_goals
+
+    def serialize(self) -> dict[str, pandas.DataFrame]:
+        """
+            Returns the goals as an event table, one row per goal with the side that scored it and its dataframe index.
+        """
+        goals = pandas.DataFrame({'side': ['l'] * len(self.__left_team_goals) + ['r'] * len(self.__right_team_goals),
+                                  'row': pandas.Series(self.__left_team_goals + self.__right_team_goals, dtype='int64')})
+        return {'goals': goals.sort_values('row', kind='stable', ignore_index=True)}
@@ -1,6 +1,12 @@
+import numpy as np
+import pandas as pd
+
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.common.dataframe.finders import EVENT_DTYPE, event_records
 from socceranalyzer.common.geometric.point import Point
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 
 class FoulCharge(AbstractAnalysis):
@@ -14,12 +20,13 @@ class FoulCharge(AbstractAnalysis):
                     match's log to be analyzed
                 category : enum
                     match's category (2D, VSS or SSL)
-                team_left_charges : list[Point]
-                    list containing tuples relative to the positions (x and y) where faults committed by the left team
-                    happened
-                team_right_charges : list[Point]
-                    list containing tuples relative to the positions (x and y) where faults committed by the right team
-                    happened
+                frame : MatchFrame
+                    optional columnar view of the match, used instead of the dataframe columns when given
+                playmode_index : PlaymodeIndex
+                    playmode timeline of the match, built from the dataframe when not given
+                charges : np.ndarray
+                    EVENT_DTYPE structured array with the side, row, cycle and ball position of every foul charge,
+                    in the order they happened
 
         Methods
         -------
@@ -29,20 +36,26 @@ class FoulCharge(AbstractAnalysis):
                 proportion() -> (float, float)
                     returns a tuple containing the proportion of faults committed by left and right team, respectively 
                 _analyze() -> None
-                    for every cycle in the log, investigates wether a fault happened and updates one of the lists if 
-                    it is really the case.
+                    finds every cycle where a foul charge starts and updates the list of the team that committed it.
 
             public:
+                events() -> np.ndarray
+                    returns the foul charges as an EVENT_DTYPE structured array
                 results(side: str, tuple: bool) -> (list[Point], list[Point]) or list[Point]
                     returns the positions of fouls charges
                 describe() -> None
                     provides how many faults each team committed and their proportions relative to the total.
+                update(chunk: pandas.DataFrame) -> None
+                    registers the faults of a chunk of new cycles, used by StreamingMatchAnalyzer
     """
-    def __init__(self, dataframe, category, debug):
+    def __init__(self, dataframe, category, debug, frame=None, playmode_index: PlaymodeIndex = None):
         self.__dataframe = dataframe
+        self.__frame = frame
+        self.__playmode_index = playmode_index
         self.__category = category
-        self.__team_left_charges = []
-        self.__team_right_charges = []
+        self.__charges = np.empty(0, dtype=EVENT_DTYPE)
+        self.__last_playmode = None
+        self.__rows = 0
 
         try:
             self._analyze()
@@ -53,9 +66,13 @@ class FoulCharge(AbstractAnalysis):
         else:
             Logger.success("FoulCharge has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)]
+
     @property
     def left_charges(self):
-        return self.__team_left_charges
+        return self.__points('l')
 
     @property
     def category(self):
@@ -67,15 +84,24 @@ class FoulCharge(AbstractAnalysis):
 
     @left_charges.setter
     def left_charges(self, val: Point):
-        self.__team_left_charges.append(val)
+        self.__append_point('l', val)
 
     @property
     def right_charges(self):
-        return self.__team_right_charges
+        return self.__points('r')
 
     @right_charges.setter
     def right_charges(self, val: Point):
-        self.__team_right_charges.append(val)
+        self.__append_point('r', val)
+
+    def __points(self, side):
+        charges = self.__charges[self.__charges['side'] == side]
+        return [Point(int(x), int(y)) for x, y in zip(charges['x'].tolist(), charges['y'].tolist())]
+
+    def __append_point(self, side, point: Point):
+        # charges added by hand are not tied to a row of the log
+        charge = np.array([(side, -1, -1, point.x, point.y)], dtype=EVENT_DTYPE)
+        self.__charges = np.concatenate((self.__charges, charge))
 
     def quantity(self):
         """
@@ -84,7 +110,8 @@ class FoulCharge(AbstractAnalysis):
             tuple
                 a tuple containing how many faults left and right team committed, respectively
         """
-        return (len(self.__team_left_charges), len(self.__team_right_charges))
+        sides = self.__charges['side']
+        return (int(np.count_nonzero(sides == 'l')), int(np.count_nonzero(sides == 'r')))
 
     def proportion(self):
         """
@@ -99,24 +126,63 @@ class FoulCharge(AbstractAnalysis):
         return (quantities[0] / total, quantities[1] / total)
 
     def _analyze(self):
-        for i in range(len(self.__dataframe)):
-            """
-                For every cycle in the log, investigates wether a fault happened and updates one of the lists if 
-                it is really the case.
-            """
-            if (self.__dataframe.loc[i, str(self.category.PLAYMODE)] == str(self.category.FAULT_COMMITED_L)
-                    and self.__dataframe.loc[i - 1, str(self.category.PLAYMODE)] != str(
-                        self.category.FAULT_COMMITED_L)):
+        """
+            Finds every cycle where a foul charge starts and stores the ball position at that cycle.
+        """
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.__dataframe[str(self.category.PLAYMODE)])
+
+        if self.__frame is not None:
+            ball, game_time = self.__frame.ball, self.__frame.game_time
+        else:
+            ball = self.__dataframe[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy()
+            game_time = self.__dataframe[str(self.category.GAME_TIME)].to_numpy()
+
+        left, _ = self.__playmode_index.segments(str(self.category.FAULT_COMMITED_L))
+        right, _ = self.__playmode_index.segments(str(self.category.FAULT_COMMITED_R))
+        charges = np.concatenate((event_records('l', left, game_time, ball), event_records('r', right, game_time, ball)))
+
+        self.__charges = charges[np.argsort(charges['row'], kind='stable')]
+        self.__rows = self.__playmode_index.rows
+        if self.__playmode_index.rows:
+            self.__last_playmode = self.__playmode_index.playmode_at(self.__playmode_index.rows - 1)
+
+    def __add_charges(self, left, right, ball, game_time, left_before, right_before):
+        """
+            Registers a foul only on the cycle its playmode starts. left_before and right_before tell
+            whether the cycle right before the given ones was already a foul of that team.
+        """
+        left = np.flatnonzero(left & ~np.concatenate(([left_before], left[:-1])))
+        right = np.flatnonzero(right & ~np.concatenate(([right_before], right[:-1])))
+        charges = np.concatenate((event_records('l', left, game_time, ball, self.__rows),
+                                  event_records('r', right, game_time, ball, self.__rows)))
+
+        self.__charges = np.concatenate((self.__charges, charges[np.argsort(charges['row'], kind='stable')]))
+
+    def update(self, chunk):
+        """
+            Registers the fouls of a chunk of new cycles, carrying the last playmode across chunks.
+        """
+        left_foul = str(self.category.FAULT_COMMITED_L)
+        right_foul = str(self.category.FAULT_COMMITED_R)
+
+        playmode = chunk[str(self.category.PLAYMODE)].to_numpy()
+        ball = chunk[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy()
+        game_time = chunk[str(self.category.GAME_TIME)].to_numpy()
 
-                self.left_charges = Point(int(self.__dataframe.loc[i, str(self.category.BALL_X)]),
-                                          int(self.__dataframe.loc[i, str(self.category.BALL_Y)]))
+        self.__add_charges(playmode == left_foul, playmode == right_foul, ball, game_time,
+                           self.__last_playmode == left_foul, self.__last_playmode == right_foul)
 
-            elif (self.__dataframe.loc[i, str(self.category.PLAYMODE)] == str(self.category.FAULT_COMMITED_R)
-                  and self.__dataframe.loc[i - 1, str(self.category.PLAYMODE)] != str(self.category.FAULT_COMMITED_R)):
+        self.__rows += len(playmode)
+        if len(playmode):
+            self.__last_playmode = playmode[-1]
 
-                self.right_charges = Point(int(self.__dataframe.loc[i, str(self.category.BALL_X)]),
-                                           int(self.__dataframe.loc[i, str(self.category.BALL_Y)])) 
-        
+    def events(self):
+        """
+            Returns the foul charges as an EVENT_DTYPE structured array, one record per charge with the
+            side that committed it, its row and cycle, and the ball position, in the order they happened.
+        """
+        return self.__charges
 
     def results(self, side=None, tuple=False):
         """
@@ -142,24 +208,11 @@ class FoulCharge(AbstractAnalysis):
             list
                 a list containing charges from the team given in side parameter, or from both if none was given.
         """
-        all_positions = []
         if tuple:
-            return (self.__team_left_charges, self.__team_right_charges)
-        else:
-            if side is not None:
-                if side.lower()[0] == "l":
-                    for p in self.__team_left_charges:
-                        all_positions.append((p.x, p.y))
-                elif side.lower()[0] == "r":
-                    for p in self.__team_right_charges:
-                        all_positions.append((p.x, p.y))
-            else:
-                for p in self.__team_left_charges:
-                    all_positions.append((p.x, p.y))
-                for p in self.__team_right_charges:
-                    all_positions.append((p.x, p.y))
-
-        return all_positions
+            return (self.__points('l'), self.__points('r'))
+
+        sides = ('l', 'r') if side is None else (side.lower()[0],)
+        return [(p.x, p.y) for s in sides if s in ('l', 'r') for p in self.__points(s)]
 
     def describe(self):
         """
@@ -167,15 +220,19 @@ class FoulCharge(AbstractAnalysis):
         """
         name_l = self.dataframe.loc[1, str(self.category.TEAM_LEFT)]
         name_r = self.dataframe.loc[1, str(self.category.TEAM_RIGHT)]
-        print(f'{name_l} commited {len(self.__team_left_charges)} faults against {name_r}.\n'
+        left, right = self.quantity()
+        print(f'{name_l} commited {left} faults against {name_r}.\n'
               f'That is {self.proportion()[0]*100}% of the total.'
               f'To see the x and y positions use results(side)\n'
               f'------------------------------------------------------------------------------------')
-        print(f'{name_r} commited {len(self.__team_right_charges)} faults against {name_l}.\n'
+        print(f'{name_r} commited {right} faults against {name_l}.\n'
               f'That is {self.proportion()[1]*100}% of the total\n'
               f'To see the x and y positions use results(side)\n')
 
-        print(f'The game had a total of {len(self.__team_left_charges) + len(self.__team_right_charges)}')
+        print(f'The game had a total of {left + right}')
 
-    def serialize(self):
-        raise NotImplementedError
\ No newline at end of file
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the foul charges as an event table, one row per charge with the columns of events().
+        """
+        return {'charges': pd.DataFrame(self.__charges)}
\ No newline at end of file
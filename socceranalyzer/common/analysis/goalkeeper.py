@@ -46,6 +46,8 @@ class GoalkeeperAnalysis:
                     (distances, ball_positions, goalie_positions)
                 describe() -> None
                     Prints information obtained from results().
+                serialize() -> dict[str, pandas.DataFrame]
+                    goals conceded and a summary with catches and distances
 
                 
     """
@@ -69,6 +71,14 @@ class GoalkeeperAnalysis:
         else:
             Logger.success("GoalkeeperAnalysis has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        """
+            Adds both goalkeepers' catch counters to the ball and player positions.
+        """
+        return (Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + Mediator.players_columns(category, ('x', 'y'))
+                + [str(category.LEFT_GOALKEEPER_CATCHES), str(category.RIGHT_GOALKEEPER_CATCHES)])
+
     def _analyze(self) -> None:
         """
             For each enemy goal, consults the dataframe and populates goalie_positions, ball_positions and distances.
@@ -145,4 +155,16 @@ class GoalkeeperAnalysis:
         print(f"Maximum distance: {self.__max_distance:.2f}")
         print(f"Catches: {self.__catches}")
 
-        
\ No newline at end of file
+    def serialize(self) -> dict[str, pandas.DataFrame]:
+        """
+            Returns the ball and goalkeeper positions and their distance at every goal conceded, one row per goal,
+            and a one row summary with the catches, average and maximum distances.
+        """
+        goals = pandas.DataFrame({'ball_x': [point.x for point in self.__ball_positions],
+                                  'ball_y': [point.y for point in self.__ball_positions],
+                                  'goalie_x': [point.x for point in self.__goalie_positions],
+                                  'goalie_y': [point.y for point in self.__goalie_positions],
+                                  'distance': self.__distances}, dtype='float64')
+        summary = pandas.DataFrame({'catches': [self.__catches], 'average_distance': [self.__average_distance],
+                                    'max_distance': [self.__max_distance]})
+        return {'goals_conceded': goals, 'summary': summary}
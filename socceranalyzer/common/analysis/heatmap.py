@@ -1,8 +1,12 @@
+from typing import Iterable
+
 import numpy as np
 import pandas
 
+from socceranalyzer.common.basic.field import Field
 from socceranalyzer.common.basic.match import Match
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
+from socceranalyzer.common.chore.builder import Builder
 from socceranalyzer.common.chore.mediator import Mediator
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.enums.ssl import SSL
@@ -12,37 +16,71 @@ from socceranalyzer.utils.logger import Logger
 
 
 class Heatmap(AbstractAnalysis):
-    def __init__(self, dataframe: pandas.DataFrame, category: SSL | SIM2D | VSS, debug) -> None:
+    """
+        Occupancy of the field by every player and the ball, as 2D histograms over a fixed grid.
+
+        Heatmap(dataframe: pandas.DataFrame, category: SIM2D, debug: bool, frame: MatchFrame = None,
+                bin_size: float = 1.0, margin: float = 5.0, field: Field = None)
+
+        The grid covers the field, given or built for the category, plus margin meters around it, in square
+        bins of bin_size meters. Positions of every player are counted in a single bincount, and positions
+        outside the grid or missing are left out. Counts are integer arrays with the same grid for every
+        match with the same field, bin_size and margin, so they can be summed over a tournament with merge().
+        As in the SIM2D server, y is reflected, so the histograms are drawn with y up.
+
+        Attributes
+        ----------
+            public through @properties:
+                dataframe: pandas.DataFrame
+                    match log
+                category: SIM2D
+                    match's category
+                bin_size: float
+                    side of the square bins, in meters
+                x_edges: np.ndarray[float]
+                    bin edges along the field length
+                y_edges: np.ndarray[float]
+                    bin edges along the field width
+                players: np.ndarray[int32]
+                    counts of every player, shape (2, 11, x bins, y bins), left team first
+                ball: np.ndarray[int32]
+                    counts of the ball, shape (x bins, y bins)
+                data: tuple
+                    raw left and right field player positions and ball positions, built on access
+
+        Methods
+        -------
+            public:
+                player(side: str, unum: int) -> np.ndarray[int32]
+                    counts of a single player
+                team(side: str, gkeeper: bool = True) -> np.ndarray[int64]
+                    counts of a whole team
+                results() -> dict[str, np.ndarray]
+                    grid edges and counts, as stored and merged
+                merge(results: Iterable[dict | Heatmap]) -> dict[str, np.ndarray]
+                    sums the counts of many matches over the same grid
+                serialize() -> dict[str, pandas.DataFrame]
+                    non zero counts as tables of bins
+    """
+    SIDES = ('l', 'r')
+    PLAYERS = 11
+
+    def __init__(self, dataframe: pandas.DataFrame, category: SSL | SIM2D | VSS, debug, frame=None,
+                 bin_size: float = 1.0, margin: float = 5.0, field: Field = None) -> None:
         self.__dataframe = dataframe
+        self.__frame = frame
         self.__category = category
+        self.__bin_size = bin_size
 
-        self.__ball_positions: dict[str, list] = {}
-        self.__left_players: dict[str, list[list[float], list[float]]] = {
-            'player_l2': [[],[]],
-            'player_l3': [[],[]],
-            'player_l4': [[],[]],
-            'player_l5': [[],[]],
-            'player_l6': [[],[]],
-            'player_l7': [[],[]],
-            'player_l8': [[],[]],
-            'player_l9': [[],[]],
-            'player_l10': [[],[]],
-            'player_l11': [[],[]],
-        }
-        self.__right_players: dict[str, list[list[float], list[float]]] = {
-            'player_r2': [[],[]],
-            'player_r3': [[],[]],
-            'player_r4': [[],[]],
-            'player_r5': [[],[]],
-            'player_r6': [[],[]],
-            'player_r7': [[],[]],
-            'player_r8': [[],[]],
-            'player_r9': [[],[]],
-            'player_r10': [[],[]],
-            'player_r11': [[],[]],
-        }
+        self.__x_edges: np.ndarray = None
+        self.__y_edges: np.ndarray = None
+        self.__players: np.ndarray = None
+        self.__ball: np.ndarray = None
 
         try:
+            field = field if field is not None else Builder(dataframe, category).fieldBuilder()
+            self.__x_edges = self.__edges(field.center.x, field.length, margin)
+            self.__y_edges = self.__edges(field.center.y, field.width, margin)
             self._analyze()
         except Exception as err:
             Logger.error(f"Heatmap failed: {err.args[0]}")
@@ -50,6 +88,11 @@ class Heatmap(AbstractAnalysis):
                 raise
         else:
             Logger.success("Heatmap has results.")
+
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + Mediator.players_columns(category, ('x', 'y'))
+
     @property
     def dataframe(self):
         return self.__dataframe
@@ -59,38 +102,146 @@ class Heatmap(AbstractAnalysis):
         return self.__category
 
     @property
-    def data(self, left_players_unum: list[int] = [], right_players_unum: list[int] = []):
-        
-        return self.__left_players.values(), self.__right_players.values(), self.__ball_positions
+    def bin_size(self):
+        return self.__bin_size
 
-    def _analyze(self):
-        ball_x = np.array(self.dataframe[str(self.category.BALL_X)])
-        ball_y = np.array(self.dataframe[str(self.category.BALL_Y)])
-        
-        # Reflect y positions due to SIM2D server config
-        ball_y = ball_y * (-1)
+    @property
+    def x_edges(self):
+        return self.__x_edges
+
+    @property
+    def y_edges(self):
+        return self.__y_edges
+
+    @property
+    def players(self):
+        return self.__players
+
+    @property
+    def ball(self):
+        return self.__ball
 
-        self.__ball_positions['x'] = ball_x
-        self.__ball_positions['y'] = ball_y
+    @property
+    def data(self):
+        """
+            Raw positions of the field players of each team and of the ball, with y reflected.
+            They are read from the log on every access, as only the histograms are kept.
+        """
+        positions = self.__positions()
+        ball = self.__ball_positions()
+
+        left_players, right_players = ([[positions[:, team, unum - 1, 0], positions[:, team, unum - 1, 1]]
+                                        for unum in range(2, self.PLAYERS + 1)] for team in range(len(self.SIDES)))
+
+        return left_players, right_players, {'x': ball[:, 0], 'y': ball[:, 1]}
+
+    def __edges(self, center: float, size: float, margin: float) -> np.ndarray:
+        bins = int(np.ceil((size + 2 * margin) / self.__bin_size))
+        return center - size / 2 - margin + np.arange(bins + 1) * self.__bin_size
+
+    def __positions(self) -> np.ndarray:
+        """
+            Players positions with y reflected, shape (N, 2, 11, 2).
+        """
+        if self.__frame is not None:
+            positions = self.__frame.positions
+        else:
+            columns = [f'player_{side}{unum}_{axis}' for side in self.SIDES for unum in range(1, self.PLAYERS + 1) for axis in ('x', 'y')]
+            positions = self.__dataframe[columns].to_numpy(dtype=np.float64).reshape(-1, len(self.SIDES), self.PLAYERS, 2)
+
+        return positions * np.array((1., -1.))
+
+    def __ball_positions(self) -> np.ndarray:
+        if self.__frame is not None:
+            ball = self.__frame.ball
+        else:
+            ball = self.__dataframe[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy(dtype=np.float64)
+
+        return ball * np.array((1., -1.))
 
-        left_players_column = Mediator.players_left_position(self.category, gkeeper=False)
-        right_players_column = Mediator.players_right_position(self.category, gkeeper=False)
+    def __histograms(self, positions: np.ndarray) -> np.ndarray:
+        """
+            Counts the (..., N, 2) positions of every leading index, e.g. every player, with a single bincount.
+        """
+        shape = (len(self.__x_edges) - 1, len(self.__y_edges) - 1)
+        leading = positions.shape[:-2]
 
-        # TODO: Refactor when player class is implemented 
-        for ith in range(0, 10):
-            # +2 because it starts at 0 going up to 9 and needs to reach 2 up to 11
-            self.__left_players[f'player_l{ith+2}'][0] = self.dataframe[left_players_column.items[ith].x]
-            self.__left_players[f'player_l{ith+2}'][1] = self.dataframe[left_players_column.items[ith].y] * (-1)
+        with np.errstate(invalid='ignore'):
+            x = np.floor((positions[..., 0] - self.__x_edges[0]) / self.__bin_size)
+            y = np.floor((positions[..., 1] - self.__y_edges[0]) / self.__bin_size)
+        inside = (x >= 0) & (x < shape[0]) & (y >= 0) & (y < shape[1])
 
-            self.__right_players[f'player_r{ith+2}'][0] = self.dataframe[right_players_column.items[ith].x]
-            self.__right_players[f'player_r{ith+2}'][1] = self.dataframe[right_players_column.items[ith].y] * (-1)
+        owner = np.broadcast_to(np.arange(int(np.prod(leading))).reshape(leading + (1,)), inside.shape)
+        cells = (owner[inside] * shape[0] + x[inside].astype(np.intp)) * shape[1] + y[inside].astype(np.intp)
 
+        counts = np.bincount(cells, minlength=int(np.prod(leading)) * shape[0] * shape[1])
+        return counts.astype(np.int32).reshape(leading + shape)
+
+    def _analyze(self):
+        # (N, team, player, 2) -> (team, player, N, 2), so each player is a leading index
+        self.__players = self.__histograms(self.__positions().transpose(1, 2, 0, 3))
+        self.__ball = self.__histograms(self.__ball_positions())
+
+    def player(self, side: str, unum: int) -> np.ndarray:
+        return self.__players[self.SIDES.index(side.lower()[0]), unum - 1]
+
+    def team(self, side: str, gkeeper: bool = True) -> np.ndarray:
+        return self.__players[self.SIDES.index(side.lower()[0]), 0 if gkeeper else 1:].sum(axis=0)
 
     def describe(self):
         raise NotImplementedError
 
-    def results(self, config: dict[str, list[int]], ball: bool):
-        pass
-
-    def serialize(self):
-        raise NotImplementedError
\ No newline at end of file
+    def results(self) -> dict[str, np.ndarray]:
+        """
+            Returns the grid edges and the counts of every player and of the ball, the input of merge().
+        """
+        return {'x_edges': self.__x_edges, 'y_edges': self.__y_edges, 'players': self.__players, 'ball': self.__ball}
+
+    @staticmethod
+    def merge(results: Iterable) -> dict[str, np.ndarray]:
+        """
+            Sums the counts of many matches, e.g. every match of a team in a tournament.
+
+                Parameters:
+                        results (Iterable[dict | Heatmap]): Heatmaps or their results(), all over the same grid
+
+                Returns:
+                        merged (dict[str, np.ndarray]): edges of the grid and int64 counts of the players and ball
+        """
+        merged = None
+        for result in results:
+            result = result.results() if isinstance(result, Heatmap) else result
+            if merged is None:
+                merged = {'x_edges': result['x_edges'], 'y_edges': result['y_edges'],
+                          'players': result['players'].astype(np.int64), 'ball': result['ball'].astype(np.int64)}
+                continue
+
+            if not (np.array_equal(merged['x_edges'], result['x_edges']) and np.array_equal(merged['y_edges'], result['y_edges'])):
+                raise ValueError('heatmaps with different grids cannot be merged')
+            merged['players'] += result['players']
+            merged['ball'] += result['ball']
+
+        if merged is None:
+            raise ValueError('no heatmaps to merge')
+        return merged
+
+    def __bins(self, counts: np.ndarray, leading: list[str]) -> pandas.DataFrame:
+        """
+            Returns the non zero bins of counts as a table, with one column per leading index, the lower
+            corner of the bin and its count.
+        """
+        index = np.nonzero(counts)
+        table = {name: values for name, values in zip(leading, index[:-2])}
+        table.update(x=self.__x_edges[index[-2]], y=self.__y_edges[index[-1]], count=counts[index])
+        return pandas.DataFrame(table)
+
+    def serialize(self) -> dict[str, pandas.DataFrame]:
+        """
+            Returns the non zero bins of every player and of the ball, with the lower corner of each bin, so
+            the tables are self describing and heatmaps over the same grid are summed by grouping on x and y.
+        """
+        players = self.__bins(self.__players, ['side', 'unum'])
+        players['side'] = np.array(self.SIDES)[players['side'].to_numpy()]
+        players['unum'] += 1
+
+        return {'players': players, 'ball': self.__bins(self.__ball, [])}
@@ -22,6 +22,10 @@ class InterceptCounter(AbstractAnalysis):
         else:
             Logger.success("InterceptCounter has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Passing.columns(category)
+
     def __str__(self):
         values = self.results()
         return f'Team left: {values[0]}\nTeam right: {values[1]}'
@@ -51,5 +55,8 @@ class InterceptCounter(AbstractAnalysis):
         print(f'{name_l}: {self.__interceptions[left_team]}\n' 
                 f'{name_r}: {self.__interceptions[right_team]}')
 
-    def serialize(self):
-        return self.__interceptions
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+        Returns the interceptions of each team as a table, one row per side.
+        """
+        return {'interceptions': pd.DataFrame({'side': ['l', 'r'], 'interceptions': list(self.results())})}
@@ -11,19 +11,42 @@ from socceranalyzer.utils.logger import Logger
 class ObjectHistory(AbstractAnalysis):
     """
         Contains the pose (position and rotation) of the given object
+
+        ObjectHistory(dataframe: pandas.DataFrame, category: Enum, debug: bool, frame: str, mirror: bool = False, filter=None)
+
+        The pose is built lazily: the constructor only checks the columns of the frame exist, and the first
+        call to results() selects them, mirrors the positions and masks the rows rejected by the filter,
+        e.g. FilterSelfLocalizationCovariance. The pose is cached, so histories never plotted cost no memory,
+        and unmirrored, unfiltered columns stay views of the log.
+
+        Attributes
+        ----------
+            public through @properties:
+                dataframe: pandas.DataFrame
+                    log the pose is read from
+                category: Enum
+                    league of the log
+                frame: str
+                    prefix of the pose columns, e.g. ball.frame.pose
+                materialized: bool
+                    whether the pose was built already
+
+        Methods
+        -------
+            public:
+                results() -> Tuple[pandas.DataFrame, pandas.DataFrame]
+                    position and rotation of the object, built on first call
+                serialize() -> dict[str, pandas.DataFrame]
+                    position and rotation per cycle, with the log row
     """
     def __init__(self, dataframe, category: Enum, debug, frame: str, mirror: bool = False, filter=None):
         self.__dataframe = dataframe
         self.__category = category
         self.__frame = frame
         self.__mirror = mirror
-        self.__object_pose: Tuple[pd.DataFrame, pd.DataFrame]
+        self.__object_pose: Tuple[pd.DataFrame, pd.DataFrame] = None
         self.__filter = filter
-
-        # Apply filter
-        if self.__filter is not None:
-            filter_object = self.__filter(dataframe, category, frame)
-            self.__dataframe = filter_object.filter()
+        self.__debug = debug
 
         try:
             self._analyze()
@@ -42,33 +65,66 @@ class ObjectHistory(AbstractAnalysis):
     def category(self):
         return self.__category
 
+    @property
+    def frame(self):
+        return self.__frame
+
+    @property
+    def materialized(self):
+        return self.__object_pose is not None
+
     def _analyze(self):
-        mirror_factor = -1 if self.__mirror else 1
+        missing = [column for column in self.__position_columns() if column not in self.__dataframe.columns]
+        if missing:
+            raise KeyError(f"missing columns {', '.join(missing)}")
 
-        object_positions = pd.DataFrame()
-        object_positions["x"] = self.__dataframe[f"{self.__frame}.position.x"] * mirror_factor
-        object_positions["y"] = self.__dataframe[f"{self.__frame}.position.y"] * mirror_factor
-        object_positions["z"] = self.__dataframe[f"{self.__frame}.position.z"]
+    def __position_columns(self) -> List[str]:
+        return [f"{self.__frame}.position.{axis}" for axis in "xyz"]
+
+    def __materialize(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        # column selections share the buffers of the log, only mirrored or filtered coordinates are new arrays
+        object_positions = self.__dataframe[self.__position_columns()].set_axis(["x", "y", "z"], axis=1)
+        if self.__mirror:
+            object_positions = object_positions.assign(x=-object_positions["x"], y=-object_positions["y"])
+
+        if self.__filter is not None:
+            rejected = self.__filter(self.__dataframe, self.__category, self.__frame).mask()
+            object_positions = object_positions.mask(rejected)
 
         object_rotations = pd.DataFrame()
-        if hasattr(self.__dataframe, f"{self.__frame}.rotation.x"):
-            object_rotations["x"] = self.__dataframe[f"{self.__frame}.rotation.x"]
-            object_rotations["y"] = self.__dataframe[f"{self.__frame}.rotation.y"]
-            object_rotations["z"] = self.__dataframe[f"{self.__frame}.rotation.z"]
-            object_rotations["w"] = self.__dataframe[f"{self.__frame}.rotation.w"]
+        if f"{self.__frame}.rotation.x" in self.__dataframe.columns:
+            object_rotations = self.__dataframe[[f"{self.__frame}.rotation.{axis}" for axis in "xyzw"]].set_axis(["x", "y", "z", "w"], axis=1)
 
-        self.__object_pose = (object_positions, object_rotations)
+        return object_positions, object_rotations
 
     def describe(self):
         Logger.data("No description available")
 
     def results(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Pose of the object (position and rotation)
+        """Pose of the object (position and rotation), built and cached on first call
 
         :return: First element is the position, second is the rotation
         :rtype: Tuple[pd.DataFrame, pd.DataFrame]
         """
+        if self.__object_pose is None:
+            try:
+                self.__object_pose = self.__materialize()
+            except Exception as err:
+                Logger.error(f"ObjectHistory for {self.__frame} failed: {err.args[0]}")
+                if self.__debug:
+                    raise
+                return pd.DataFrame(), pd.DataFrame()
+
         return self.__object_pose
 
-    def serialize(self):
-        raise NotImplementedError
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """Position and rotation of the object per cycle, with the log row as a column
+
+        :return: 'position' and, when the frame has a rotation, 'rotation'
+        :rtype: dict[str, pd.DataFrame]
+        """
+        positions, rotations = self.results()
+        tables = {'position': positions.rename_axis('row').reset_index()}
+        if not rotations.empty:
+            tables['rotation'] = rotations.rename_axis('row').reset_index()
+        return tables
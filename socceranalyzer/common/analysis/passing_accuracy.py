@@ -1,3 +1,5 @@
+import pandas as pd
+
 from socceranalyzer.common.evaluators.passing import Passing
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
 from socceranalyzer.common.basic.team import Team
@@ -26,8 +28,8 @@ class PassingAccuracy(AbstractAnalysis):
                     Returns the teams passing accuracy and total passes 
                 describe() -> none  
                     Shows the teams respective passing accuracy and total passes
-                serialize() -> dict[str, dict[str, Any]]
-                    Returns an object containing computed stats
+                serialize() -> dict[str, pandas.DataFrame]
+                    Returns the computed stats as a table, one row per team
     """
     def __init__(self, data_frame, category, passing_evaluator: Passing, debug):
         self.__passing_accuracy = {}
@@ -44,6 +46,10 @@ class PassingAccuracy(AbstractAnalysis):
         else:
             Logger.success("PassingAccuracy has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Passing.columns(category)
+
     def __str__(self):
         values = self.results()
         return f'Team left: {values[0]}\nTeam right: {values[1]}'
@@ -89,7 +95,7 @@ class PassingAccuracy(AbstractAnalysis):
         print(f'{name_l}: acurácia = {self.__passing_accuracy["left_team"]["accuracy"]:.4f}    passes totais = {self.__passing_accuracy["left_team"]["total_passes"]}\n' 
                 f'{name_r}: acurácia = {self.__passing_accuracy["right_team"]["accuracy"]:.4f}    passes totais = {self.__passing_accuracy["right_team"]["total_passes"]}')
 
-    def serialize(self):
+    def stats(self) -> dict:
         """
         Returns computed passing accuracy stats for both teams.
 
@@ -97,3 +103,14 @@ class PassingAccuracy(AbstractAnalysis):
                         passing_accuracy (dict[str, dict[str, Any]]): Overall teams' passing stats.
         """
         return self.__passing_accuracy
+
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+        Returns computed passing accuracy stats for both teams.
+
+                Returns:
+                        tables (dict[str, pandas.DataFrame]): 'passing_accuracy', with the side, completed passes,
+                                                              total passes and accuracy of each team
+        """
+        rows = [{'side': side[0], **self.__passing_accuracy[side]} for side in ('left_team', 'right_team')]
+        return {'passing_accuracy': pd.DataFrame(rows, columns=['side', 'completed_passes', 'total_passes', 'accuracy'])}
@@ -1,5 +1,11 @@
+import numpy as np
+import pandas as pd
+
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.common.dataframe.finders import EVENT_DTYPE, event_records
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 class Penalty(AbstractAnalysis):
     """
@@ -12,10 +18,13 @@ class Penalty(AbstractAnalysis):
                     match's log to be analyzed
                 category : enum
                     match's category (2D, VSS or SSL)
-                penalty_left : list[int]
-                    list containing every moment when left team had a penalty in their favor
-                penalty_right : list[int]
-                    list containing every moment when right team had a penalty in their favor
+                playmode_index : PlaymodeIndex
+                    playmode timeline of the match, built from the dataframe when not given
+                frame : MatchFrame
+                    optional columnar view of the match, used instead of the dataframe columns when given
+                penalties : np.ndarray
+                    EVENT_DTYPE structured array with the side in favor, row, cycle and ball position of every
+                    penalty, taken on the cycle its playmode starts
 
         Methods
         -------
@@ -24,16 +33,19 @@ class Penalty(AbstractAnalysis):
                     finds every penalty in the match and appends each one to the respective team's list
 
             public:
+                events() -> np.ndarray
+                    returns the penalties as an EVENT_DTYPE structured array
                 results() -> (list[int], list[int])
                     returns the moments when left and right team had penalties in their favor, respectively
                 describe() -> None
                     provides how many penalties happened in the match
     """
-    def __init__(self, dataframe, category, debug):
+    def __init__(self, dataframe, category, debug, playmode_index: PlaymodeIndex = None, frame=None):
         self.__dataframe = dataframe
         self.__category = category
-        self.__penalty_left = []
-        self.__penalty_right = []
+        self.__playmode_index = playmode_index
+        self.__frame = frame
+        self.__penalties = np.empty(0, dtype=EVENT_DTYPE)
 
         try:
             self._analyze()
@@ -44,6 +56,10 @@ class Penalty(AbstractAnalysis):
         else:
             Logger.success("Penalty has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)]
+
     @property
     def category(self):
         return self.__category
@@ -54,27 +70,45 @@ class Penalty(AbstractAnalysis):
 
     def _analyze(self):
         """
-            Finds every penalty in the match and appends each one to the respective team's list.
+            Finds the cycle every penalty of the match starts at, along with the ball position there.
         """
-        # penalty in favor of left side
-        t_dataframe = self.dataframe[self.dataframe[str(self.category.PLAYMODE)] == self.category.PENALTY_TO_LEFT]
-        self.__penalty_left = t_dataframe[str(self.category.GAME_TIME)].tolist()
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.dataframe[str(self.category.PLAYMODE)])
+
+        if self.__frame is not None:
+            ball, game_time = self.__frame.ball, self.__frame.game_time
+        else:
+            ball = self.dataframe[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy()
+            game_time = self.dataframe[str(self.category.GAME_TIME)].to_numpy()
+
+        left, _ = self.__playmode_index.segments(str(self.category.PENALTY_TO_LEFT))
+        right, _ = self.__playmode_index.segments(str(self.category.PENALTY_TO_RIGHT))
+        penalties = np.concatenate((event_records('l', left, game_time, ball), event_records('r', right, game_time, ball)))
 
-        # penalty in favor of right side
-        t_dataframe = self.dataframe[self.dataframe[str(self.category.PLAYMODE)] == str(self.category.PENALTY_TO_RIGHT)]
-        self.__penalty_right = t_dataframe[str(self.category.GAME_TIME)].tolist()
+        self.__penalties = penalties[np.argsort(penalties['row'], kind='stable')]
+
+    def events(self):
+        """
+            Returns the penalties as an EVENT_DTYPE structured array, one record per penalty with the side in
+            favor, the row and cycle it starts at and the ball position there, in the order they happened.
+        """
+        return self.__penalties
 
     def results(self):
         """
             Returns the moments when left and right team had penalties in their favor, respectively.
         """
-        return (self.__penalty_left, self.__penalty_right)
+        sides = self.__penalties['side']
+        return (self.__penalties['cycle'][sides == 'l'].tolist(), self.__penalties['cycle'][sides == 'r'].tolist())
 
     def describe(self):
         """
             Provides how many penalties happened in the match.
         """
-        print(f'This game had {len(self.__penalty_left) + len(self.__penalty_right)} penalties.\n')
+        print(f'This game had {len(self.__penalties)} penalties.\n')
 
-    def serialize(self):
-        raise NotImplementedError
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the penalties as an event table, one row per penalty with the columns of events().
+        """
+        return {'penalties': pd.DataFrame(self.__penalties)}
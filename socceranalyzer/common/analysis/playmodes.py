@@ -1,5 +1,8 @@
+import pandas as pd
+
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 class Playmodes(AbstractAnalysis):
     """
@@ -14,6 +17,8 @@ class Playmodes(AbstractAnalysis):
                     match's category (2D, VSS or SSL)
                 playmode_dictionary : dict
                     a dictionary with playmodes as keys and how many times they appeared as values
+                playmode_counts : dict
+                    the same counts in order of first appearance, updated by every chunk
 
         Methods
         -------
@@ -26,11 +31,14 @@ class Playmodes(AbstractAnalysis):
                     returns which playmodes appeared and their counts, respectively
                 describe() -> None
                     provides which playmodes appeared
+                update(chunk: pandas.DataFrame) -> None
+                    adds the playmodes of a chunk of new cycles, used by StreamingMatchAnalyzer
     """
     def __init__(self, dataframe, category, debug):
         self.__category = category
         self.__df = dataframe
         self.__playmode_dictionary = {}
+        self.__playmode_counts = {}
 
         try:
             self._analyze()
@@ -41,6 +49,10 @@ class Playmodes(AbstractAnalysis):
         else:
             Logger.success("Playmodes has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category)
+
     @property
     def category(self):
         return self.__category
@@ -64,6 +76,18 @@ class Playmodes(AbstractAnalysis):
 
             self.__playmode_dictionary[key] = value
 
+        self.__playmode_counts = self.__df[str(self.category.PLAYMODE)].value_counts(sort=False).to_dict()
+
+    def update(self, chunk):
+        """
+            Adds the playmode counts of a chunk of new cycles.
+        """
+        for key, value in chunk[str(self.category.PLAYMODE)].value_counts().items():
+            self.__playmode_counts[key] = self.__playmode_counts.get(key, 0) + value
+
+        # sorted as value_counts() sorts the whole log, whose playmodes come in order of first appearance
+        self.__playmode_dictionary = pd.Series(self.__playmode_counts).sort_values(ascending=False, kind='stable').to_dict()
+
     def results(self):
         """
             Returns a tuple containing which playmodes appeared and their counts, respectively.
@@ -86,5 +110,9 @@ class Playmodes(AbstractAnalysis):
         print(f'This game had {len(pms)} different playmodes which were:\n'
               f' {pms}')
 
-    def serialize(self):
-        return NotImplementedError
+    def serialize(self) -> dict[str, pd.DataFrame]:
+        """
+            Returns the playmodes that appeared and their counts as a table, one row per playmode.
+        """
+        playmodes, counts = self.results()
+        return {'playmodes': pd.DataFrame({'playmode': pd.Series(playmodes, dtype=str), 'count': pd.Series(counts, dtype='int64')})}
@@ -1,51 +1,55 @@
 from typing import Literal
+import numpy as np
+import pandas as pd
 from pandas import DataFrame
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
-from socceranalyzer.common.geometric.point import Point
-from socceranalyzer.common.geometric.triangle import Triangle
-from socceranalyzer.common.operations.measures import *
-from socceranalyzer.common.dataframe.slicers import PlaymodeSlicer
+from socceranalyzer.common.basic.match_frame import MatchFrame
 from socceranalyzer.common.enums.sim2d import Landmarks
 from socceranalyzer.utils.logger import Logger
-from math import sqrt, acos
-from numpy import exp
+from socceranalyzer.common.chore.mediator import Mediator
 
 XG_MODEL_VARIABLES = ['angle','distance', 'players_in_between']
 XG_MODEL_PARAMS = [2.678591, 1.788279, -0.164496, -0.671407]
 
+SHOT_SPEED = 1.65
+GOAL_LINE_X = 53.0
+ON_TARGET_Y = 7.5
+OFF_TARGET_Y = 17.5
+STATS_COLUMNS = ['show_time', 'player', 'team', 'x', 'y', 'distance', 'angle', 'on_target', 'players_in_between', 'xG', 'goal']
+
 class Shooting(AbstractAnalysis):
     """
         Used to calculate simple and advanced shooting stats for specified game.
 
-        Shooting(dataframe: pandas.DataFrame, category)
+        Shooting(dataframe: pandas.DataFrame, category, debug, frame: MatchFrame = None)
+
+        Shots are detected over whole arrays: the kicker of every cycle comes from a single diff of the
+        kick and tackle counters, shots are filtered by ball speed and trajectory in bulk, and the players
+        inside every shot triangle are counted with one barycentric test over a (shots, 22, 2) array.
         
         Attributes
         ----------
             private:
-                shooting_stats : dict
+                shooting_stats : list[dict]
                     shooting stats in Python dict format for the game
                 shooting_stats_df : pands.DataFrame
                     shooting stats in DataFrame format for the game
-                play_on_cycles : list[int]
-                    list with game's play on cycles
-                last_shooter : str
-                    name of last player to register a shot
+                play_on_cycles : np.ndarray[int]
+                    play on cycles from the last cycle seen on, the only ones later chunks can still match
+                last_row : pandas.DataFrame
+                    last cycle seen, compared against the first cycle of the next chunk
                     
         Methods
         -------
             private:
-                get_kicker(cycle : int) -> str
-                    returns the first player to register a counting_kick or counting_tackle change at cycle
-                get_players_inside_area(cycle: int, a: list[float], b: list[float], c: list[float]) -> int
-                    returns players inside triangular area defined by vertices
-                calculate_xG(sh: dict[str, float]) -> float
-                    calculates goal probability based on MODEL_VARIABLES
-                update_shot_data(cycle: int, player: str, x: float, y: float, players_inside: int, on_target: int) -> None
-                    populates the shooting_stats dict
-                check_shot(cycle: int) -> None
-                    checks for a shot at cycle
-                check_goal(cycle: int) -> None
-                    checks for a goal at cycle
+                get_kickers(frame: MatchFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]
+                    returns the first player to register a counting_kick or counting_tackle change at every cycle
+                calculate_xG(features: np.ndarray) -> np.ndarray
+                    calculates goal probability of every shot based on MODEL_VARIABLES
+                check_shots(frame: MatchFrame, start: int) -> np.ndarray
+                    looks for shots from row start on and populates the shooting_stats list
+                check_goals(frame: MatchFrame, start: int, rows: np.ndarray) -> None
+                    marks the last shot before every goal
             public:
                 _analyze() -> None
                     performs match analysis
@@ -61,13 +65,19 @@ class Shooting(AbstractAnalysis):
                     returns match detailed shooting stats as a Python dict
                 results_as_dataframe() -> pandas.DataFrame:
                     returns a copy of the match detailed shooting stats DataFrame
+                update(chunk: pandas.DataFrame) -> None
+                    checks a chunk of new cycles for shots and goals, used by StreamingMatchAnalyzer
+                serialize() -> dict[str, pandas.DataFrame]
+                    returns the shots as an event table, one row per shot
     """
-    def __init__(self, dataframe: DataFrame, category, debug):
+    def __init__(self, dataframe: DataFrame, category, debug, frame: MatchFrame = None):
         self.__category = category
         self.__df = dataframe
+        self.__frame = frame
         self.__shooting_stats = []
-        self.__play_on_cycles = []
-        self.__last_shooter = 'not'
+        self.__shooting_stats_df = DataFrame(columns=STATS_COLUMNS)
+        self.__play_on_cycles = np.empty(0, dtype=np.int64)
+        self.__last_row = DataFrame()
 
         try:
             self._analyze()
@@ -78,6 +88,11 @@ class Shooting(AbstractAnalysis):
         else:
             Logger.success("Shooting has results.")
     
+    @staticmethod
+    def columns(category) -> list[str]:
+        return (Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + ['ball_vx', 'ball_vy']
+                + Mediator.players_columns(category, ('x', 'y', 'counting_kick', 'counting_tackle')))
+
     @property
     def category(self):
         return self.__category
@@ -86,192 +101,190 @@ class Shooting(AbstractAnalysis):
     def dataframe(self):
         return self.__df
 
-    def __get_kicker(self, cycle: int) -> str:
+    @staticmethod
+    def __get_kickers(frame: MatchFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Returns the first player to register a counting_kick or counting_tackle change at cycle.
+        Returns the first player to register a counting_kick or counting_tackle change at every cycle,
+        players being checked in l1, r1, l2, r2, ... order.
 
             Parameters:
-                    cycle (int): Current index being evaluated
-            
-            Returns:
-                    player (str): Player name or ''.
-        """
-        for i in range(1, 12):
-            for side in ['l', 'r']:
-                player = 'player_{}{}'.format(side, i)
-                player_counting_kicks = self.__df.loc[cycle, f'{player}_counting_kick']
-                player_counting_tackles = self.__df.loc[cycle, f'{player}_counting_tackle']
-                
-                previous_cycle = cycle - 1
-                if(previous_cycle > 0):
-                    player_counting_kicks_before = self.__df.loc[previous_cycle, f'{player}_counting_kick']
-                    player_counting_tackles_before = self.__df.loc[previous_cycle, f'{player}_counting_tackle']
-
-                    if player_counting_kicks > player_counting_kicks_before or player_counting_tackles > player_counting_tackles_before:
-                        return player
-        return ''
-
-    def __get_players_inside_area(self, cycle: int, a: Point, b: Point, c: Point) -> int:
-        """
-        Returns the amount of players inside triangular area.
+                    frame (MatchFrame): Rows being evaluated
 
-            Parameters:
-                    cycle (int): Current index being evaluated
-                    a, b, c (Point): The vertices of the triangle
-            
             Returns:
-                    players_inside (int): Players inside the triangle at specified cycle.
+                    has_kicker (np.ndarray[bool]): Whether some player kicked or tackled at each row
+                    sides (np.ndarray[int]): 0 (left) or 1 (right), meaningful only where has_kicker
+                    unums (np.ndarray[int]): Player number, meaningful only where has_kicker
         """
-        players_inside = 0
+        touched = (np.diff(frame.counting_kick, axis=0) > 0) | (np.diff(frame.counting_tackle, axis=0) > 0)
+        # (N - 1, 2, 11) -> (N - 1, 22) in l1, r1, l2, r2, ... order, the shape is explicit as a single row
+        # frame leaves no rows to infer it from
+        touched = touched.transpose(0, 2, 1).reshape(len(touched), len(MatchFrame.SIDES) * MatchFrame.PLAYERS)
+
+        # the first row has no previous one to compare with
+        has_kicker = np.concatenate(([False], touched.any(axis=1)))
+        first = np.concatenate(([0], touched.argmax(axis=1)))
 
-        for i in range(1, 12):
-            for side in ['l', 'r']:
-                player = 'player_{}{}'.format(side, i)                
-                agent_pos = Point(self.__df.loc[cycle, f'{player}_x'], self.__df.loc[cycle, f'{player}_y'])
-                if Triangle(a, b, c).is_inside(agent_pos):
-                    players_inside += 1
-        return players_inside
+        return has_kicker, first % 2, first // 2 + 1
 
-    def __calculate_xG(self, sh: dict[str, float]) -> float:
+    @staticmethod
+    def __calculate_xG(features: np.ndarray) -> np.ndarray:
         """
-        Returns the calculated xG for a shot.
+        Returns the calculated xG for every shot.
 
             Parameters:
-                    sh (dict[str, float]): A dictionary with MODEL_VARIABLES as keys
+                    features (np.ndarray): One row per shot, one column per MODEL_VARIABLES entry
 
             Returns:
-                    xG (float): Calculated goal probability for the shot
+                    xG (np.ndarray): Calculated goal probability for each shot
         """
-        bsum=XG_MODEL_PARAMS[0]
-        for i,v in enumerate(XG_MODEL_VARIABLES):
-            bsum=bsum+XG_MODEL_PARAMS[i+1]*sh[v]
-        xG = 1 - 1/(1+exp(bsum))
-        return xG
+        # summed column by column, as a matrix product rounds differently with the number of shots
+        bsum = XG_MODEL_PARAMS[0] + sum(features[:, i] * param for i, param in enumerate(XG_MODEL_PARAMS[1:]))
+        return 1 - 1/(1+np.exp(bsum))
 
-    def __update_shot_data(self, cycle: int, player: str, x: float, y: float, players_inside: int, on_target: int):
+    def __check_shots(self, frame: MatchFrame, start: int) -> np.ndarray:
         """
-        Calculates angle, distance, show_time from a registered shot and updates the shooting stats list.
+        Looks for shots from row start on and appends them to the shooting stats list.
 
             Parameters:
-                    cycle (int): Indicates the index being evaluated                    
-                    player (str): Player name
-                    x (float): Normalized x position
-                    y (float): Normalized y position
-                    players_inside (int): Indicates the amount of players between the shooter and the goal
-                    on_target (int): Indicates if the registered shot was on target
-        """
-        dist = distance(Point(x,y), Landmarks.R_GOAL_POS)
-        p1 = distance_sqrd(Point(x,y), Landmarks.R_GOAL_TOP_BAR)
-        p2 = distance_sqrd(Point(x,y), Landmarks.R_GOAL_BOTTOM_BAR)
-        p3 = distance_sqrd(Landmarks.R_GOAL_TOP_BAR, Landmarks.R_GOAL_BOTTOM_BAR)
-        p12 = sqrt(p1)
-        p13 = sqrt(p2)
-        angle = acos((p1+p2-p3)/(2*p12*p13))
-        show_time = int(self.__df.loc[cycle, str(self.__category.GAME_TIME)])
-        data = {
-            'show_time': show_time,
-            'player': player,
-            'team': player.split('_')[-1][0],
-            'x': x,
-            'y': y,
-            'distance': dist,
-            'angle': angle,
-            'on_target': on_target,
-            'players_in_between': players_inside,
-            'xG': self.__calculate_xG({'distance': dist, 'angle': angle, 'players_in_between': players_inside}),
-            'goal': 0
-        }
-        self.__shooting_stats.append(data)
-
-    def __check_shot(self, cycle: int):
-        """
-        Checks if a shot ocurred at the specified index.
+                    frame (MatchFrame): Rows being evaluated
+                    start (int): First row that may hold a shot, earlier rows are only history
 
-            Parameters:
-                    cycle (int): Indicates the index to look for on match DataFrame
+            Returns:
+                    rows (np.ndarray): Rows of frame where shots were found
         """
-        if not self.__df.loc[cycle, str(self.__category.GAME_TIME)] in self.__play_on_cycles:
-            return
-
-        if((self.__df.loc[cycle, 'ball_vx']**2 + self.__df.loc[cycle, 'ball_vy']**2)** 0.5  > 1.65):
-            kicker = self.__get_kicker(cycle)
-            
-            # Right team registered shot
-            if(kicker != '' and 'r' in kicker.split('_')[-1] and self.__df.loc[cycle, f'{kicker}_x'] < 0 and self.__df.loc[cycle, 'ball_vx'] != 0):
-                # print(cycle)
-                ball_pos_before = (self.__df.loc[cycle-1, 'ball_x'], self.__df.loc[cycle-1, 'ball_y'])
-                ball_pos = (self.__df.loc[cycle, 'ball_x'], self.__df.loc[cycle, 'ball_y'])
-                # print(ball_pos_before, ball_pos)
-                
-                (x_right, y_right) = line_intersection((ball_pos_before,ball_pos), ((-53.0,1),(-53.0,0)))
-                    
-                if 7.5 < abs(y_right) < 17.5:
-                    self.__last_shooter = kicker
-                    pos_x = self.__df.loc[cycle, f'{kicker}_x']
-                    pos_y = self.__df.loc[cycle, f'{kicker}_y']
-                    x = abs(pos_x)
-                    y = (-1)*pos_y
-                    players_inside = self.__get_players_inside_area(cycle,Point(pos_x,pos_y),Landmarks.L_GOAL_TOP_BAR,Landmarks.L_GOAL_BOTTOM_BAR)
-                    self.__update_shot_data(cycle,self.__last_shooter,x,y,players_inside,0)  
-                elif abs(y_right) <= 7.5:
-                    self.__last_shooter = kicker
-                    pos_x = self.__df.loc[cycle, f'{kicker}_x']
-                    pos_y = self.__df.loc[cycle, f'{kicker}_y']
-                    x = abs(pos_x)
-                    y = (-1)*pos_y
-                    players_inside = self.__get_players_inside_area(cycle,Point(pos_x,pos_y),Landmarks.L_GOAL_TOP_BAR,Landmarks.L_GOAL_BOTTOM_BAR)
-                    self.__update_shot_data(cycle,self.__last_shooter,x,y,players_inside,1)
-            # Left team registered shot
-            elif(kicker != '' and 'l' in kicker.split('_')[-1] and self.__df.loc[cycle, f'{kicker}_x'] > 0 and self.__df.loc[cycle, 'ball_vx'] != 0):
-                # print(cycle)
-                ball_pos_before = (self.__df.loc[cycle-1, 'ball_x'], self.__df.loc[cycle-1, 'ball_y'])
-                ball_pos = (self.__df.loc[cycle, 'ball_x'], self.__df.loc[cycle, 'ball_y'])
-                # print(ball_pos_before, ball_pos)
-
-                (x_left, y_left) = line_intersection((ball_pos_before,ball_pos), ((53.0,1),(53.0,0)))
-
-                if 7.5 < abs(y_left) < 17.5:
-                    self.__last_shooter = kicker
-                    x = self.__df.loc[cycle, f'{kicker}_x']
-                    y = self.__df.loc[cycle, f'{kicker}_y']
-                    players_inside = self.__get_players_inside_area(cycle,Point(x,y),Landmarks.R_GOAL_TOP_BAR,Landmarks.R_GOAL_BOTTOM_BAR)
-                    self.__update_shot_data(cycle,self.__last_shooter,x,y,players_inside,0)
-                elif abs(y_left) <= 7.5:
-                    self.__last_shooter = kicker
-                    x = self.__df.loc[cycle, f'{kicker}_x']
-                    y = self.__df.loc[cycle, f'{kicker}_y']
-                    players_inside = self.__get_players_inside_area(cycle,Point(x,y),Landmarks.R_GOAL_TOP_BAR,Landmarks.R_GOAL_BOTTOM_BAR)
-                    self.__update_shot_data(cycle,self.__last_shooter,x,y,players_inside,1)
-
-    def __check_goal(self, cycle: int):
+        # show_time never decreases, so play on cycles of earlier chunks only matter from the last one seen on
+        play_on = np.concatenate((self.__play_on_cycles, frame.game_time[frame.playmode_is('play_on')]))
+        self.__play_on_cycles = np.unique(play_on[play_on >= frame.game_time[-1]]) if len(frame) else play_on
+
+        has_kicker, sides, unums = self.__get_kickers(frame)
+        ball = frame.ball.astype(np.float64)
+        ball_velocity = frame.ball_velocity.astype(np.float64)
+
+        rows = np.arange(len(frame))
+        kicker_x = frame.positions[rows, sides, unums - 1, 0]
+        # each team attacks the goal of the other one
+        attacking = np.where(sides == 0, kicker_x > 0, kicker_x < 0)
+
+        candidates = (
+            (rows >= max(start, 1))
+            & np.isin(frame.game_time, play_on)
+            & (np.hypot(ball_velocity[:, 0], ball_velocity[:, 1]) > SHOT_SPEED)
+            & has_kicker
+            & attacking
+            & (ball_velocity[:, 0] != 0)
+        )
+        rows = rows[candidates]
+        sides = sides[candidates]
+        unums = unums[candidates]
+
+        # extend the last ball displacement until the goal line being attacked
+        before, after = ball[rows - 1], ball[rows]
+        displacement = after - before
+        goal_x = np.where(sides == 0, GOAL_LINE_X, -GOAL_LINE_X)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            goal_y = np.abs(before[:, 1] + (goal_x - before[:, 0]) * displacement[:, 1] / displacement[:, 0])
+
+        on_target = goal_y <= ON_TARGET_Y
+        shot = (displacement[:, 0] != 0) & (goal_y < OFF_TARGET_Y)
+        rows, sides, unums, on_target = rows[shot], sides[shot], unums[shot], on_target[shot]
+
+        if len(rows) == 0:
+            return rows
+
+        position = frame.positions[rows, sides, unums - 1].astype(np.float64)
+        left_shot = (sides == 0)[:, None]
+        top_bar = np.where(left_shot, [Landmarks.R_GOAL_TOP_BAR.x, Landmarks.R_GOAL_TOP_BAR.y],
+                           [Landmarks.L_GOAL_TOP_BAR.x, Landmarks.L_GOAL_TOP_BAR.y])
+        bottom_bar = np.where(left_shot, [Landmarks.R_GOAL_BOTTOM_BAR.x, Landmarks.R_GOAL_BOTTOM_BAR.y],
+                              [Landmarks.L_GOAL_BOTTOM_BAR.x, Landmarks.L_GOAL_BOTTOM_BAR.y])
+        # players inside the triangle between the shooter and the goal posts
+        players_inside = frame.spatial_index.inside_triangle(position, top_bar, bottom_bar, rows).sum(axis=(1, 2))
+
+        # right team shots are mirrored so every shot is measured against the right goal
+        x = np.where(sides == 0, position[:, 0], np.abs(position[:, 0]))
+        y = np.where(sides == 0, position[:, 1], -position[:, 1])
+
+        dx = x - Landmarks.R_GOAL_POS.x
+        dist = np.hypot(dx, y - Landmarks.R_GOAL_POS.y)
+        p1 = dx**2 + (y - Landmarks.R_GOAL_TOP_BAR.y)**2
+        p2 = dx**2 + (y - Landmarks.R_GOAL_BOTTOM_BAR.y)**2
+        p3 = (Landmarks.R_GOAL_TOP_BAR.y - Landmarks.R_GOAL_BOTTOM_BAR.y)**2
+        angle = np.arccos((p1+p2-p3)/(2*np.sqrt(p1)*np.sqrt(p2)))
+
+        xG = self.__calculate_xG(np.stack((angle, dist, players_inside), axis=1))
+
+        teams = np.asarray(MatchFrame.SIDES)[sides]
+        columns = zip(rows.tolist(), teams.tolist(), unums.tolist(), x.tolist(), y.tolist(), dist.tolist(),
+                      angle.tolist(), on_target.tolist(), players_inside.tolist(), xG.tolist())
+
+        for row, team, unum, x, y, dist, angle, on_target, players_inside, xG in columns:
+            self.__shooting_stats.append({
+                'show_time': int(frame.game_time[row]),
+                'player': f'player_{team}{unum}',
+                'team': team,
+                'x': x,
+                'y': y,
+                'distance': dist,
+                'angle': angle,
+                'on_target': int(on_target),
+                'players_in_between': players_inside,
+                'xG': xG,
+                'goal': 0
+            })
+
+        return rows
+
+    def __check_goals(self, frame: MatchFrame, start: int, rows: np.ndarray):
         """
-        Checks if playmode at index indicates a goal.
+        Marks the last shot before every goal row as a goal, when it was taken by the scoring team.
 
             Parameters:
-                    cycle (int): Indicates the index to look for on match DataFrame
+                    frame (MatchFrame): Rows being evaluated
+                    start (int): First row that may hold a goal, earlier rows are only history
+                    rows (np.ndarray): Rows of the shots found in frame, the latest entries of the shooting stats
         """
-        split_play_mode = self.__df.loc[cycle, str(self.category.PLAYMODE)].rsplit('_')
-        mode = split_play_mode[0]
-        side = split_play_mode[1]
-        if side == 'kick': return
-        if(mode == 'goal'):
-            side = split_play_mode[1]
-            if(side == 'r'):
-                if(self.__last_shooter != 'not' and 'r' in self.__last_shooter.split('_')[-1]):
-                    self.__shooting_stats[-1]['goal'] = 1
-            elif(side == 'l'):
-                if(self.__last_shooter != 'not' and 'l' in self.__last_shooter.split('_')[-1]):
-                    self.__shooting_stats[-1]['goal'] = 1
+        scored = {}
+        for code, playmode in enumerate(frame.playmodes):
+            mode = playmode.split('_')
+            if mode[0] == 'goal' and len(mode) > 1 and mode[1] in MatchFrame.SIDES:
+                scored[code] = mode[1]
+
+        goals = np.flatnonzero(np.isin(frame.playmode, list(scored)))
+        goals = goals[goals >= start]
+
+        # shots found before this frame are at the start of the stats list
+        previous = len(self.__shooting_stats) - len(rows)
+        for goal, last_shot in zip(goals.tolist(), (previous + np.searchsorted(rows, goals, side='right') - 1).tolist()):
+            if last_shot >= 0 and self.__shooting_stats[last_shot]['team'] == scored[frame.playmode[goal]]:
+                self.__shooting_stats[last_shot]['goal'] = 1
+
+    def __evaluate(self, frame: MatchFrame, start: int):
+        rows = self.__check_shots(frame, start)
+        self.__check_goals(frame, start, rows)
+        self.__shooting_stats_df = DataFrame(self.__shooting_stats, columns=STATS_COLUMNS)
 
     def _analyze(self):
         """
         Performs match shooting analysis.
         """
-        self.__play_on_cycles = list(PlaymodeSlicer.slice(self.dataframe, 'play_on')[str(self.category.GAME_TIME)])
-        for i, _ in self.__df.iterrows():
-            self.__check_shot(i)
-            self.__check_goal(i)
-        self.__shooting_stats_df = DataFrame(self.__shooting_stats)
+        frame = self.__frame if self.__frame is not None else MatchFrame(self.__df, self.category)
+        self.__evaluate(frame, 0)
+        self.__last_row = self.__df.tail(1)
+
+    def update(self, chunk: DataFrame):
+        """
+        Checks a chunk of new cycles for shots and goals. Only the chunk and the last row seen before it
+        are evaluated, the chunk index must continue the index of the previous rows.
+
+            Parameters:
+                    chunk (DataFrame): New cycles of the match
+        """
+        if chunk.empty:
+            return
+
+        window = pd.concat((self.__last_row, chunk))
+        self.__evaluate(MatchFrame(window, self.category), len(self.__last_row))
+        self.__last_row = chunk.tail(1)
 
     def get_total_team_shots(self, team: Literal['l', 'r']) -> int:
         """
@@ -374,8 +387,8 @@ class Shooting(AbstractAnalysis):
         """
         return self.__shooting_stats_df.copy()
 
-    def serialize(self) -> list[dict]:
+    def serialize(self) -> dict[str, DataFrame]:
         """
-        Returns the shooting stats as json serializable object.
+        Returns the shooting stats as an event table, one row per shot with the columns of results_as_dataframe().
         """
-        return self.__shooting_stats
+        return {'shots': self.results_as_dataframe()}
@@ -1,4 +1,5 @@
-from typing import List
+import warnings
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import numpy as np
@@ -6,16 +7,218 @@ import numpy as np
 from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.enums.hl_kid import HLKid
-from socceranalyzer.common.dataframe.filter_player import FilterPlayerNotPenalized
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
+
+
+class TeamSpeed(AbstractAnalysis):
+    """
+        Speed of every player of a match, computed for all of them at once.
+
+        TeamSpeed(dataframe: pandas.DataFrame, category: SIM2D | HLKid, debug: bool, window_size: int = 16,
+                  filter_outliers: bool = True, players: list[tuple[str, int]] = None)
+
+        SIM2D speeds are the norm of the vx, vy columns of every row, in a single np.hypot over the stacked
+        velocities of every player. HLKid speeds are derived from the base_footprint positions of the cycles
+        each robot is not penalized: the position difference to its previous unpenalized cycle over the time
+        difference, dropped when that is larger than 0.064 s, without outliers beyond 3 standard deviations
+        when filter_outliers is set, and averaged over sliding windows of window_size speeds. Windows are
+        means of cumulative sum differences, so their cost does not depend on window_size.
+
+        Attributes
+        ----------
+            public through @properties:
+                dataframe: pandas.DataFrame
+                    match log, with the base_footprint columns for HLKid
+                category: SIM2D | HLKid
+                    match's category
+                players: list[tuple[str, int]]
+                    side ('l' or 'r') and number of every player computed, every player of the category when None
+                window_size: int
+                    number of HLKid speeds averaged by each window
+
+        Methods
+        -------
+            public:
+                results() -> dict[str, np.ndarray]
+                    speeds of every player, keyed by side and number, e.g. l1
+                player(side: str, number: int) -> np.ndarray
+                    speeds of a single player
+                describe() -> None
+                    logs the mean and max speed of every player
+                serialize() -> dict[str, pandas.DataFrame]
+                    speeds of every player as a long table
+    """
+    MAX_TIME_DIFF = 0.064
+    OUTLIER_DEVIATIONS = 3
+
+    def __init__(self, dataframe: pd.DataFrame, category, debug, window_size: int = 16, filter_outliers: bool = True,
+                 players: List[Tuple[str, int]] = None) -> None:
+        self.__dataframe = dataframe
+        self.__category = category
+        self.__window_size = window_size
+        self.__players = players if players is not None else self.all_players(category)
+        self.__speeds: Dict[str, np.ndarray] = {}
+
+        try:
+            self._analyze(filter_outliers)
+        except Exception as err:
+            Logger.error(f"TeamSpeed failed: {err.args[0]}")
+            if debug:
+                raise
+        else:
+            Logger.success("TeamSpeed has results.")
+
+    @staticmethod
+    def all_players(category) -> List[Tuple[str, int]]:
+        """
+            Returns the side and number of every player of the category.
+        """
+        if category is SIM2D:
+            return [(side, number) for side in 'lr' for number in range(1, 12)]
+        if category is HLKid:
+            return [(side, number) for side in 'lr' for number in range(1, 5)]
+        raise NotImplementedError
+
+    @staticmethod
+    def columns(category) -> list[str]:
+        if category is SIM2D:
+            return Mediator.match_columns(category) + Mediator.players_columns(category, ('vx', 'vy'))
+        return []
+
+    @property
+    def dataframe(self):
+        return self.__dataframe
+
+    @property
+    def category(self):
+        return self.__category
+
+    @property
+    def players(self):
+        return self.__players
+
+    @property
+    def window_size(self):
+        return self.__window_size
+
+    def results(self) -> Dict[str, np.ndarray]:
+        return self.__speeds
+
+    def player(self, side: str, number: int) -> np.ndarray:
+        return self.__speeds[f'{side[0]}{number}']
+
+    def describe(self):
+        """
+            Logs the mean and max speed of every player, over its finite speeds.
+        """
+        for player, speed in self.__speeds.items():
+            speed = np.asarray(speed, dtype=np.float64)
+            speed = speed[np.isfinite(speed)]
+            if len(speed) == 0:
+                Logger.data(f'{player}: no speeds')
+            else:
+                Logger.data(f'{player}: mean {speed.mean():.3f}, max {speed.max():.3f}')
+
+    def serialize(self) -> Dict[str, pd.DataFrame]:
+        """
+            Returns the speeds of every player as a long table, with the player, e.g. l1, the position of the
+            speed in its series and the speed, as HLKid players have series of different lengths.
+        """
+        lengths = np.array([len(speed) for speed in self.__speeds.values()], dtype=np.int64)
+        speeds = [np.empty(0)] + [np.asarray(speed, dtype=np.float64) for speed in self.__speeds.values()]
+
+        # position within its player of every speed, from the offset of each player in the long table
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return {'speed': pd.DataFrame({'player': np.repeat(np.array(list(self.__speeds), dtype=str), lengths),
+                                       'sample': np.arange(lengths.sum()) - offsets,
+                                       'speed': np.concatenate(speeds)})}
+
+    def _analyze(self, filter_outliers: bool = True):
+        if self.__category is SIM2D:
+            speeds = self.__sim2d_speeds()
+        elif self.__category is HLKid:
+            speeds = self.__hlkid_speeds(filter_outliers)
+        else:
+            raise NotImplementedError
+
+        self.__speeds = {f'{side}{number}': speed for (side, number), speed in zip(self.__players, speeds)}
+
+    def __sim2d_speeds(self) -> List[np.ndarray]:
+        vx = self.__dataframe[[f'player_{side}{number}_vx' for side, number in self.__players]].to_numpy(dtype=np.float64)
+        vy = self.__dataframe[[f'player_{side}{number}_vy' for side, number in self.__players]].to_numpy(dtype=np.float64)
+
+        return list(np.hypot(vx, vy).T)
+
+    def __hlkid_speeds(self, filter_outliers: bool) -> List[np.ndarray]:
+        prefixes = [f'teams.team{1 if side == "l" else 2}.player{number}' for side, number in self.__players]
+        time = self.__dataframe['time'].to_numpy(dtype=np.float64)
+        x = self.__dataframe[[f'{prefix}.base_footprint.position.x' for prefix in prefixes]].to_numpy(dtype=np.float64)
+        y = self.__dataframe[[f'{prefix}.base_footprint.position.y' for prefix in prefixes]].to_numpy(dtype=np.float64)
+        not_penalized = self.__dataframe[[f'{prefix}.robot_info.secs_till_unpenalized' for prefix in prefixes]].to_numpy(dtype=np.float64) <= 0
+
+        # previous cycle every robot was not penalized in, -1 before its first one
+        rows = np.arange(len(time))[:, None]
+        last = np.maximum.accumulate(np.where(not_penalized, rows, -1), axis=0)
+        previous = np.vstack((np.full((1, len(prefixes)), -1), last[:-1]))
+        before = np.maximum(previous, 0)
+        players = np.arange(len(prefixes))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_diff = time[:, None] - time[before]
+            speed = np.hypot((x - x[before, players]) / time_diff, (y - y[before, players]) / time_diff)
+        speed[(previous < 0) | (time_diff > self.MAX_TIME_DIFF)] = np.nan
+
+        kept = not_penalized & ~np.isnan(speed)
+        if filter_outliers:
+            # speeds more than 3 standard deviations away from the mean of the robot are removed
+            with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+                warnings.simplefilter('ignore', RuntimeWarning)
+                kept_speed = np.where(kept, speed, np.nan)
+                mean = np.nanmean(kept_speed, axis=0)
+                std = np.nanstd(kept_speed, axis=0)
+                kept &= np.abs(speed - mean) <= self.OUTLIER_DEVIATIONS * std
+
+        return self.__sliding_windows(speed.T[kept.T], kept.sum(axis=0))
+
+    def __sliding_windows(self, speeds: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+        """
+            Averages every window of window_size consecutive speeds of each robot, given the speeds of all robots
+            one after the other and how many belong to each. Windows are differences of a single cumulative sum.
+        """
+        window = self.__window_size
+        ends = np.cumsum(counts)
+        starts = np.arange(len(speeds))[np.arange(len(speeds)) + window <= np.repeat(ends, counts)]
+
+        # infinite speeds are counted apart, so they do not turn the sums after them into nan
+        finite = np.isfinite(speeds)
+        sums = np.concatenate(([0.], np.cumsum(np.where(finite, speeds, 0.))))
+        infinite = np.concatenate(([0], np.cumsum(~finite)))
+
+        means = (sums[starts + window] - sums[starts]) / window
+        means[infinite[starts + window] > infinite[starts]] = np.inf
+
+        return np.split(means, np.cumsum(np.maximum(counts - window + 1, 0))[:-1])
 
 
 class Speed(AbstractAnalysis):
-    def __init__(self, dataframe: pd.DataFrame, category, player_number: int, side: str, debug, window_size: int = 16, filter_outliers: bool = True) -> None:
+    """
+        Speed of a single player, read from a TeamSpeed.
+
+        Speed(dataframe: pandas.DataFrame, category: SIM2D | HLKid, player_number: int, side: str, debug: bool,
+              window_size: int = 16, filter_outliers: bool = True, team_speed: TeamSpeed = None)
+
+        With team_speed, e.g. shared by the players of a MatchAnalyzer, the speeds are taken from it and
+        window_size and filter_outliers are the ones it was computed with. Otherwise a TeamSpeed of the
+        given player alone is computed.
+    """
+    def __init__(self, dataframe: pd.DataFrame, category, player_number: int, side: str, debug, window_size: int = 16, filter_outliers: bool = True,
+                 team_speed: TeamSpeed = None) -> None:
         self.__dataframe = dataframe
         self.__category = category
         self.__player_speed: List | np.ndarray = []
         self.__debug = debug
+        self.__team_speed = team_speed
 
         try:
             self._analyze(player_number, side, window_size, filter_outliers)
@@ -26,6 +229,10 @@ class Speed(AbstractAnalysis):
         else:
             Logger.success("Speed has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return TeamSpeed.columns(category)
+
     @property
     def category(self):
         return self.__category
@@ -40,98 +247,20 @@ class Speed(AbstractAnalysis):
     def describe(self):
         raise NotImplementedError
 
-    def serialize(self):
-        return NotImplementedError
+    def serialize(self) -> Dict[str, pd.DataFrame]:
+        """
+            Returns the speeds of the player as a table, one row per speed.
+        """
+        return {'speed': pd.DataFrame({'speed': np.asarray(self.__player_speed, dtype=np.float64)})}
 
     def _analyze(self, player_number: int, side: str, window_size: int = 1, filter_outliers: bool = True):
-
         player_number, side = self.__handle_values(player_number, side)
 
-        if self.__category is SIM2D:
-            vx = np.array(self.__dataframe[f'player_{side}{player_number}_vx'].tolist())
-            vy = np.array(self.__dataframe[f'player_{side}{player_number}_vy'].tolist())
-
-            velocity_vector = [[x,y] for x, y in zip(vx,vy)]
-
-            self.__player_speed = self._calculate_speed(velocity_vector)
-        elif self.__category is HLKid:
-            # Filter the DataFrame to only include the player when not penalized
-            df = FilterPlayerNotPenalized(self.__dataframe, self.__category, side, player_number, include_time=True).filter()
-            self.__player_speed = self._analyze_sliding_window_speed(df, player_number, side, filter_outliers, window_size)
-        else:
-            raise NotImplementedError
-
-    def _get_direct_speed(self, df: pd.DataFrame, player_number: int, side: str, filter_outliers: bool = True):
-        """This calculates speed from differences between each step (no sliding window)"""
-        team = 'team1' if side == 'l' else 'team2'
-        position_prefix = f'teams.{team}.player{player_number}.base_footprint.position.'
-
-        # Calculate position differences for each axis over time
-        # Shift the DataFrame by one row to get the previous positions
-        prev_df = df[[position_prefix + 'x', position_prefix + 'y', position_prefix + 'z', 'time']].shift(1)
-
-        # Calculate the time differences
-        time_diff = df['time'] - prev_df['time']
-
-        # Calculate the differences in x, y, and z positions
-        delta_x = df[position_prefix + 'x'] - prev_df[position_prefix + 'x']
-        delta_y = df[position_prefix + 'y'] - prev_df[position_prefix + 'y']
-        # delta_z = df[position_prefix + 'z'] - prev_df[position_prefix + 'z']
-
-        # Calculate velocities
-        velocity_x = delta_x / time_diff
-        velocity_y = delta_y / time_diff
-        # velocity_z = delta_z / time_diff
-
-        # Set velocities to NaN where the time difference is larger than 0.064
-        velocity_x[time_diff > 0.064] = None
-        velocity_y[time_diff > 0.064] = None
-        # velocity_z[time_diff > 0.064] = None
-
-        # Calculate the speed from the velocities and remove the NaN values
-        speeds_including_NaN = np.array(self._calculate_speed([[x, y] for x, y in zip(velocity_x, velocity_y)]))
-        non_nan_indices = np.where(~np.isnan(speeds_including_NaN))
-        speeds = speeds_including_NaN[non_nan_indices]
-
-        # Filter outliers
-        if filter_outliers:
-            # Calculate the mean and standard deviation of the speeds
-            mean = np.mean(speeds)
-            std = np.std(speeds)
-
-            # Remove all speeds that are more than 3 standard deviations from the mean
-            speeds = speeds[np.abs(speeds - mean) <= 3 * std]
-        return speeds
-
-    def _analyze_sliding_window_speed(self, df: pd.DataFrame, player_number: int, side: str, filter_outliers: bool = True, window_size: int = 1):
-        """This calculates speed from sliding windows of size window_size over the direct speed data"""
-        def shift_ndarray(xs: np.ndarray, n: int):
-            """Shifts the given ndarray by n places to the right (positive n) or left (negative n)
-            Inspired by: https://stackoverflow.com/questions/30399534/shift-elements-in-a-numpy-array
-            """
-            if n == 0:
-                return xs
-            elif n >= 0:
-                return np.concatenate((np.full(n, np.nan), xs[:-n]))
-            else:
-                return np.concatenate((xs[-n:], np.full(-n, np.nan)))
-
-        direct_speed = self._get_direct_speed(df, player_number, side, filter_outliers)
-
-        # Add shifted direct speeds together and divide by the window size to average them
-        accumulated_speeds = direct_speed.copy()
-        for i in range(1, window_size):
-            accumulated_speeds += shift_ndarray(direct_speed.copy(), -i)
-        speed = accumulated_speeds / window_size
-
-        # Remove the NaN values
-        speed = speed[~np.isnan(speed)]
-        return speed
+        team_speed = self.__team_speed
+        if team_speed is None:
+            team_speed = TeamSpeed(self.__dataframe, self.__category, True, window_size, filter_outliers, [(side, player_number)])
 
-    def _calculate_speed(self, velocity_over_time):
-        velocity_over_time = np.array(velocity_over_time)
-        velocity_scalar = [np.linalg.norm(coordinate) for coordinate in velocity_over_time]
-        return velocity_scalar
+        self.__player_speed = team_speed.player(side, player_number)
 
     def __handle_values(self, player_number, side):
         min_player_number = 0
@@ -30,6 +30,8 @@ class Stamina(AbstractAnalysis):
 
             public:
                 results() -> (list[float], list[float])
+                serialize() -> dict[str, pandas.DataFrame]
+                    stamina of every player per cycle, one column per player
                     
             
     """
@@ -50,6 +52,10 @@ class Stamina(AbstractAnalysis):
         else:
             Logger.success("Stamina has results.")
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + Mediator.players_columns(category, ('attribute_stamina',))
+
     @property
     def category(self):
         return self.__category
@@ -83,5 +89,12 @@ class Stamina(AbstractAnalysis):
     def describe(self):
         raise NotImplementedError
 
-    def serialize(self):
-        raise NotImplementedError
\ No newline at end of file
+    def serialize(self) -> dict[str, pandas.DataFrame]:
+        """
+            Returns the stamina of every player per cycle, with the log row and one column per player, e.g. l1.
+        """
+        columns = {'row': self.dataframe.index.to_numpy()}
+        for side, staminas in (('l', self.stamina_left), ('r', self.stamina_right)):
+            columns.update((f'{side}{unum}', stamina) for unum, stamina in enumerate(staminas, start=1))
+
+        return {'stamina': pandas.DataFrame(columns)}
\ No newline at end of file
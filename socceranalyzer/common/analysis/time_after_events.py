@@ -2,6 +2,7 @@ from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
 from socceranalyzer.common.collections.collections import ThresholdCollection
 from socceranalyzer.common.evaluators.ball_holder import BallHolderEvaluator
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
 
 
 class TimeAfterEvents(AbstractAnalysis):
@@ -33,6 +34,10 @@ class TimeAfterEvents(AbstractAnalysis):
             if debug:
                 raise
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + Mediator.players_columns(category, ('x', 'y'))
+
     @property
     def category(self):
         return self.__category
@@ -85,11 +90,14 @@ class TimeAfterEvents(AbstractAnalysis):
     def corner(self):
         event_duration = 200
 
+        closest_side = BallHolderEvaluator(self.dataframe, self.category).all_cycles()[0]
+        rows = self.dataframe.index
+
         # corner to left team
         for c in self.__corners_cycles[0]:
             for i in range(c, c + event_duration):
                 if self._is_play_on(i):
-                    if BallHolderEvaluator(self.dataframe, self.category).at(i)[2] == "left":
+                    if closest_side[rows.get_loc(i)] == "left":
                         self.__time_after_corner += 1
                     else:
                         self.corner_thr -= 1
@@ -102,7 +110,7 @@ class TimeAfterEvents(AbstractAnalysis):
         for c in self.__corners_cycles[1]:
             for i in range(c, c + event_duration):
                 if self._is_play_on(i):
-                    if BallHolderEvaluator(self.dataframe, self.category).at(i)[2] == "right":
+                    if closest_side[rows.get_loc(i)] == "right":
                         self.__time_after_corner += 1
                     else:
                         self.corner_thr -= 1
@@ -122,4 +130,5 @@ class TimeAfterEvents(AbstractAnalysis):
         pass
 
     def serialize(self):
-        pass
\ No newline at end of file
+        # there are no results to serialize yet, see _analyze
+        return {}
\ No newline at end of file
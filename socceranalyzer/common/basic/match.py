@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional, Dict
 
 import pandas as pd
@@ -9,6 +10,8 @@ from socceranalyzer.common.enums.ssl import SSL
 from socceranalyzer.common.enums.hl_kid import HLKid
 from socceranalyzer.common.basic.field import Field
 from socceranalyzer.common.basic.ball import Ball
+from socceranalyzer.common.basic.match_frame import MatchFrame
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
 from socceranalyzer.common.basic.team import Team
 from socceranalyzer.common.chore.builder import Builder
 from socceranalyzer.agent2D.agent import Agent2D
@@ -49,6 +52,17 @@ class Match:
                     a list with integers referencing the cycle of goals occurrences
                 corners: [int]
                     a list with integers referencing the cycle of corners occurrences
+                frame: MatchFrame
+                    columnar numpy view of the dataframe, built on first access unless one is set,
+                    e.g. attached from shared memory by SharedMatch
+                playmode_index: PlaymodeIndex
+                    run-length encoded playmode timeline shared by the analyses, built on first access
+
+        Methods
+        -------
+            public:
+                fingerprint(columns: list[str] = None) -> str
+                    content hash of the log, or of some of its columns
     """
 
     def __init__(self, dataframe: pd.DataFrame, category: SIM2D | SSL | VSS | HLKid, meta_data: Optional[Dict] = None):
@@ -66,6 +80,10 @@ class Match:
         self.__goals = []
         self.__corners = []
 
+        self.__frame: Optional[MatchFrame] = None
+        self.__playmode_index: Optional[PlaymodeIndex] = None
+        self.__column_hashes: Dict[str, str] = {}
+
         try:
             if self.category in [VSS, SSL]:
                 raise ValueError(f'This version of SoccerAnalyzer does not support {self.category} matches.\n'
@@ -93,7 +111,53 @@ class Match:
     @property
     def category(self):
         return self.__category
+
+    @property
+    def meta_data(self):
+        return self.__meta_data
+
+    @property
+    def frame(self):
+        if self.__frame is None:
+            self.__frame = MatchFrame(self.__df, self.__category)
+        return self.__frame
+
+    @frame.setter
+    def frame(self, frame: MatchFrame):
+        self.__frame = frame
+
+    @property
+    def playmode_index(self):
+        if self.__playmode_index is None:
+            self.__playmode_index = PlaymodeIndex(self.__df[str(self.__category.PLAYMODE)])
+        return self.__playmode_index
     
+    def fingerprint(self, columns: list[str] = None) -> str:
+        """
+        Returns a content hash of the log, or only of the given columns, so results computed from
+        the same data can be recognized across runs. Each column is hashed once per Match.
+        Columns missing from the log are part of the hash as missing.
+
+                Parameters:
+                        columns (list[str]): columns to hash, every column when None
+
+                Returns:
+                        fingerprint (str): hexadecimal SHA-1 digest
+        """
+        columns = self.__df.columns if columns is None else columns
+        sha1 = hashlib.sha1()
+
+        for column in sorted(dict.fromkeys(map(str, columns))):
+            if column not in self.__column_hashes:
+                if column in self.__df:
+                    values = pd.util.hash_pandas_object(self.__df[column], index=False).to_numpy()
+                    self.__column_hashes[column] = hashlib.sha1(values.tobytes()).hexdigest()
+                else:
+                    self.__column_hashes[column] = 'missing'
+            sha1.update(f'{column}:{self.__column_hashes[column]};'.encode())
+
+        return sha1.hexdigest()
+
     @property
     def field(self):
         return self.__field
@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.common.basic.spatial_index import SpatialIndex
+from socceranalyzer.common.enums.sim2d import SIM2D
+
+
+class MatchFrame:
+    """
+        Compact columnar view of a SIM2D match log.
+        Every column is resolved once and stored as a typed numpy array so analyses can index
+        plain arrays instead of looking up column names cell by cell.
+
+        MatchFrame(dataframe: pandas.DataFrame, category: SIM2D)
+
+        Teams are indexed as 0 (left) and 1 (right) and players as unum - 1.
+        Columns missing from the log are exposed as None.
+
+        Attributes
+        ----------
+            public through @properties:
+                category: SIM2D
+                    match's category
+                index: np.ndarray[int]
+                    dataframe index of every row
+                game_time: np.ndarray[int] | None
+                    show_time of every row
+                team_names: tuple[str, str]
+                    left and right team names
+                positions: np.ndarray[float32]
+                    players positions, shape (N, 2, 11, 2)
+                velocities: np.ndarray[float32] | None
+                    players velocities, shape (N, 2, 11, 2)
+                ball: np.ndarray[float32]
+                    ball position, shape (N, 2)
+                ball_velocity: np.ndarray[float32] | None
+                    ball velocity, shape (N, 2)
+                playmode: np.ndarray[int16]
+                    playmode code of every row
+                playmodes: np.ndarray[str]
+                    lookup table from playmode code to playmode name
+                counting_kick: np.ndarray[int32] | None
+                    kick counter of every player, shape (N, 2, 11)
+                counting_tackle: np.ndarray[int32] | None
+                    tackle counter of every player, shape (N, 2, 11)
+                nbytes: int
+                    memory used by the arrays
+                spatial_index: SpatialIndex
+                    batched neighborhood queries over the positions, built on first access
+
+        Methods
+        -------
+            public:
+                playmode_code(playmode: str) -> int
+                    returns the code of a playmode, -1 if it never happens in the match
+                playmode_is(*playmodes: str) -> np.ndarray[bool]
+                    returns a mask of the rows in any of the given playmodes
+                player(side: str, unum: int) -> np.ndarray[float32]
+                    returns the (N, 2) positions of a single player
+                arrays() -> dict[str, np.ndarray]
+                    every array of the frame by name, leaving out missing columns
+                from_arrays(category, arrays, team_names, playmodes) -> MatchFrame
+                    builds a frame over existing arrays, e.g. attached from shared memory, without copying them
+    """
+    SIDES = ('l', 'r')
+    PLAYERS = 11
+    ARRAYS = ('index', 'game_time', 'positions', 'velocities', 'ball', 'ball_velocity', 'playmode',
+              'counting_kick', 'counting_tackle')
+
+    def __init__(self, dataframe: pd.DataFrame, category: SIM2D):
+        if category is not SIM2D:
+            raise NotImplementedError(f'MatchFrame does not support {category} matches.')
+
+        self.__category = category
+        self.__index = dataframe.index.to_numpy()
+        self.__game_time = self.__column(dataframe, str(category.GAME_TIME), np.int32)
+
+        self.__team_names = (self.__first(dataframe, str(category.TEAM_LEFT)),
+                             self.__first(dataframe, str(category.TEAM_RIGHT)))
+
+        self.__positions = self.__players(dataframe, ('x', 'y'), np.float32)
+        self.__velocities = self.__players(dataframe, ('vx', 'vy'), np.float32)
+        self.__ball = self.__columns(dataframe, [str(category.BALL_X), str(category.BALL_Y)], np.float32)
+        self.__ball_velocity = self.__columns(dataframe, ['ball_vx', 'ball_vy'], np.float32)
+
+        codes, playmodes = pd.factorize(dataframe[str(category.PLAYMODE)], use_na_sentinel=True)
+        self.__playmode = codes.astype(np.int16)
+        self.__playmodes = np.asarray(playmodes, dtype=str)
+        self.__playmode_codes = {playmode: code for code, playmode in enumerate(self.__playmodes)}
+
+        self.__counting_kick = self.__players(dataframe, ('counting_kick',), np.int32)
+        self.__counting_tackle = self.__players(dataframe, ('counting_tackle',), np.int32)
+        self.__spatial_index: SpatialIndex = None
+
+    @staticmethod
+    def __first(dataframe, column):
+        if column not in dataframe or len(dataframe) == 0:
+            return None
+        return dataframe[column].iloc[0]
+
+    @staticmethod
+    def __column(dataframe, column, dtype):
+        if column not in dataframe:
+            return None
+        return dataframe[column].to_numpy(dtype=dtype)
+
+    @staticmethod
+    def __columns(dataframe, columns, dtype):
+        if any(column not in dataframe for column in columns):
+            return None
+        return dataframe[columns].to_numpy(dtype=dtype)
+
+    def __players(self, dataframe, suffixes, dtype):
+        """
+            Reads player_{side}{unum}_{suffix} for every player into a (N, 2, 11, len(suffixes)) array,
+            squeezing the last axis when a single suffix is given.
+        """
+        columns = [f'player_{side}{unum}_{suffix}'
+                   for side in self.SIDES for unum in range(1, self.PLAYERS + 1) for suffix in suffixes]
+
+        values = self.__columns(dataframe, columns, dtype)
+        if values is None:
+            return None
+
+        values = values.reshape(len(dataframe), len(self.SIDES), self.PLAYERS, len(suffixes))
+        return values[..., 0] if len(suffixes) == 1 else values
+
+    @property
+    def category(self):
+        return self.__category
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def game_time(self):
+        return self.__game_time
+
+    @property
+    def team_names(self):
+        return self.__team_names
+
+    @property
+    def positions(self):
+        return self.__positions
+
+    @property
+    def velocities(self):
+        return self.__velocities
+
+    @property
+    def ball(self):
+        return self.__ball
+
+    @property
+    def ball_velocity(self):
+        return self.__ball_velocity
+
+    @property
+    def playmode(self):
+        return self.__playmode
+
+    @property
+    def playmodes(self):
+        return self.__playmodes
+
+    @property
+    def counting_kick(self):
+        return self.__counting_kick
+
+    @property
+    def counting_tackle(self):
+        return self.__counting_tackle
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays().values())
+
+    @property
+    def spatial_index(self):
+        if self.__spatial_index is None:
+            self.__spatial_index = SpatialIndex(self)
+        return self.__spatial_index
+
+    def __len__(self):
+        return len(self.__index)
+
+    def playmode_code(self, playmode: str) -> int:
+        """
+            Returns the code of the given playmode, -1 if it never happens in the match.
+        """
+        return self.__playmode_codes.get(str(playmode), -1)
+
+    def playmode_is(self, *playmodes: str) -> np.ndarray:
+        """
+            Returns a boolean mask of the rows whose playmode is any of the given ones.
+        """
+        codes = [self.playmode_code(playmode) for playmode in playmodes]
+        return np.isin(self.__playmode, [code for code in codes if code >= 0])
+
+    def player(self, side: str, unum: int) -> np.ndarray:
+        """
+            Returns the (N, 2) positions of the player with the given side ('l' or 'r') and unum.
+        """
+        return self.__positions[:, self.SIDES.index(side.lower()[0]), unum - 1]
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """
+            Returns every array of the frame by its name in ARRAYS, leaving out the ones of missing columns.
+        """
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        return {name: array for name, array in arrays.items() if array is not None}
+
+    @classmethod
+    def from_arrays(cls, category: SIM2D, arrays: dict, team_names: tuple, playmodes) -> 'MatchFrame':
+        """
+            Builds a frame over the given arrays instead of reading a dataframe. The arrays are used as they
+            are, so frames attached to shared memory by SharedMatch take no memory of their own.
+
+                Parameters:
+                        category (SIM2D): match's category
+                        arrays (dict[str, np.ndarray]): arrays by their name in ARRAYS, as returned by arrays(), missing
+                                                       ones being None
+                        team_names (tuple[str, str]): left and right team names
+                        playmodes (np.ndarray[str]): lookup table from playmode code to playmode name
+
+                Returns:
+                        frame (MatchFrame): frame over the given arrays
+        """
+        if category is not SIM2D:
+            raise NotImplementedError(f'MatchFrame does not support {category} matches.')
+
+        frame = cls.__new__(cls)
+        frame.__category = category
+        frame.__team_names = tuple(team_names)
+        frame.__index = arrays['index']
+        frame.__game_time = arrays.get('game_time')
+        frame.__positions = arrays['positions']
+        frame.__velocities = arrays.get('velocities')
+        frame.__ball = arrays.get('ball')
+        frame.__ball_velocity = arrays.get('ball_velocity')
+        frame.__playmode = arrays['playmode']
+        frame.__playmodes = np.asarray(playmodes, dtype=str)
+        frame.__playmode_codes = {playmode: code for code, playmode in enumerate(frame.__playmodes)}
+        frame.__counting_kick = arrays.get('counting_kick')
+        frame.__counting_tackle = arrays.get('counting_tackle')
+        frame.__spatial_index = None
+        return frame
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+
+class PlaymodeIndex:
+    """
+        Run-length encoded timeline of the playmodes of a match.
+        The playmode column is scanned once and stored as segments of consecutive rows sharing a playmode,
+        so analyses look events up in the segments instead of rescanning every row of the log.
+
+        PlaymodeIndex(playmode: pandas.Series | np.ndarray)
+
+        Segments are half-open [start, end) ranges of row positions, not dataframe index labels.
+
+        Attributes
+        ----------
+            public through @properties:
+                starts: np.ndarray[int]
+                    first row of every segment
+                ends: np.ndarray[int]
+                    row right after the last one of every segment
+                codes: np.ndarray[int]
+                    playmode code of every segment, -1 for rows missing the playmode
+                playmodes: np.ndarray[str]
+                    lookup table from playmode code to playmode name
+                rows: int
+                    number of rows indexed
+
+        Methods
+        -------
+            public:
+                code(playmode: str) -> int
+                    returns the code of a playmode, -1 if it never happens in the match
+                playmode_at(row: int) -> str | None
+                    returns the playmode of a row, in O(log n)
+                segment_at(row: int) -> int
+                    returns the segment a row belongs to, in O(log n)
+                segments(playmode: str) -> tuple[np.ndarray, np.ndarray]
+                    returns the starts and ends of every segment of a playmode, in O(1)
+                mask(*playmodes: str) -> np.ndarray[bool]
+                    returns a mask of the rows in any of the given playmodes
+    """
+    def __init__(self, playmode):
+        codes, playmodes = pd.factorize(np.asarray(playmode, dtype=object))
+        self.__rows = len(codes)
+        self.__playmodes = np.asarray(playmodes, dtype=str)
+        self.__playmode_codes = {name: code for code, name in enumerate(self.__playmodes)}
+
+        changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        self.__starts = np.concatenate(([0], changes)) if self.__rows else np.empty(0, dtype=np.int64)
+        self.__ends = np.concatenate((changes, [self.__rows])) if self.__rows else np.empty(0, dtype=np.int64)
+        self.__codes = codes[self.__starts]
+
+        # segments grouped by playmode, kept in timeline order inside each group
+        order = np.argsort(self.__codes, kind='stable')
+        groups = np.split(order, np.flatnonzero(np.diff(self.__codes[order])) + 1) if len(order) else []
+        self.__segments = {int(self.__codes[group[0]]): (self.__starts[group], self.__ends[group]) for group in groups}
+
+    @property
+    def starts(self):
+        return self.__starts
+
+    @property
+    def ends(self):
+        return self.__ends
+
+    @property
+    def codes(self):
+        return self.__codes
+
+    @property
+    def playmodes(self):
+        return self.__playmodes
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    def __len__(self):
+        return len(self.__starts)
+
+    def code(self, playmode: str) -> int:
+        """
+            Returns the code of the given playmode, -1 if it never happens in the match.
+        """
+        return self.__playmode_codes.get(str(playmode), -1)
+
+    def segment_at(self, row: int) -> int:
+        """
+            Returns the position of the segment the given row belongs to.
+        """
+        if not 0 <= row < self.__rows:
+            raise IndexError(f'row {row} is out of a match with {self.__rows} rows')
+        return int(np.searchsorted(self.__starts, row, side='right')) - 1
+
+    def playmode_at(self, row: int) -> str:
+        """
+            Returns the playmode of the given row, None when it is missing from the log.
+        """
+        code = self.__codes[self.segment_at(row)]
+        return str(self.__playmodes[code]) if code >= 0 else None
+
+    def segments(self, playmode: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+            Returns the starts and ends of every segment of the given playmode, in timeline order.
+            Both arrays are empty when the playmode never happens.
+        """
+        code = self.code(playmode)
+        if code < 0 or code not in self.__segments:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return self.__segments[code]
+
+    def mask(self, *playmodes: str) -> np.ndarray:
+        """
+            Returns a boolean mask of the rows whose playmode is any of the given ones.
+        """
+        codes = [self.code(playmode) for playmode in playmodes]
+        selected = np.isin(self.__codes, [code for code in codes if code >= 0])
+        return np.repeat(selected, self.__ends - self.__starts)
@@ -0,0 +1,224 @@
+import gc
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.common.basic.match import Match
+from socceranalyzer.common.basic.match_frame import MatchFrame
+from socceranalyzer.common.enums.hl_kid import HLKid
+from socceranalyzer.common.enums.sim2d import SIM2D
+
+ALIGNMENT = 64
+CATEGORIES = {category.__name__: category for category in (SIM2D, HLKid)}
+
+# blocks mapped by this process, until detach() unmaps them
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+class SharedMatch:
+    """
+        Publishes a match in a single shared memory block, so worker processes attach it without copying
+        nor unpickling the dataframe.
+
+        SharedMatch(match: Match, columns: list[str] = None, frame: bool = True)
+
+        The columns of the dataframe, or only the given ones, and the arrays of the MatchFrame of SIM2D matches
+        are copied once into the block. The descriptor, a small picklable dict with the name of the block
+        and the offset, shape and dtype of every array, is all that is sent to the workers. attach() maps the
+        block and builds a Match whose dataframe columns and MatchFrame are read-only views of it, so every
+        worker reads the same physical memory.
+
+        Numeric and boolean columns are shared as they are. Other columns, e.g. playmode and team names, are
+        shared as category codes and attached as categorical columns.
+
+        The publisher owns the block: close() unmaps and removes it, once the workers are done. Workers unmap
+        it with detach() when they are done with the attached match, and must be started by the publishing
+        process, e.g. as its process pool, so they share its resource tracker.
+
+        Attributes
+        ----------
+            public through @properties:
+                match: Match
+                    published match
+                name: str
+                    name of the shared memory block
+                nbytes: int
+                    size of the block
+                descriptor: dict
+                    everything attach() needs to rebuild the match, sent to the workers
+
+        Methods
+        -------
+            public:
+                attach(descriptor: dict) -> Match
+                    builds the match over the shared block, in any process started by the publisher
+                detach(descriptor: dict) -> None
+                    unmaps the block attached by this process
+                close() -> None
+                    unmaps and removes the block
+    """
+    def __init__(self, match: Match, columns: list[str] = None, frame: bool = True):
+        self.__match = match
+        dataframe = match.dataframe
+        columns = list(dataframe.columns) if columns is None else [column for column in dict.fromkeys(columns) if column in dataframe]
+
+        arrays = []
+        column_specs = []
+        for column in columns:
+            values, categories = self.__encode(dataframe[column])
+            column_specs.append([column, len(arrays), categories])
+            arrays.append(values)
+
+        index = None
+        if not isinstance(dataframe.index, pd.RangeIndex) or dataframe.index.start != 0 or dataframe.index.step != 1:
+            index = len(arrays)
+            arrays.append(dataframe.index.to_numpy())
+
+        frame_specs = None
+        if frame and match.category is SIM2D:
+            try:
+                frame = match.frame.arrays()
+            except Exception:
+                # published without it, workers build their own and report the failure as the parent would
+                frame = {}
+            frame_specs = {} if frame else None
+            for name, array in frame.items():
+                frame_specs[name] = len(arrays)
+                arrays.append(array)
+
+        offsets = []
+        size = 0
+        for array in arrays:
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            offsets.append(size)
+            size += array.nbytes
+
+        self.__block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        specs = []
+        for array, offset in zip(arrays, offsets):
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self.__block.buf, offset=offset)
+            view[...] = array
+            specs.append((offset, array.shape, array.dtype.str))
+            del view
+
+        self.__descriptor = {
+            'name': self.__block.name,
+            'category': match.category.__name__,
+            'meta_data': match.meta_data,
+            'rows': len(dataframe),
+            'index': None if index is None else specs[index],
+            'columns': [(column, specs[position], categories) for column, position, categories in column_specs],
+            'frame': None if frame_specs is None else {name: specs[position] for name, position in frame_specs.items()},
+            'team_names': None if frame_specs is None else match.frame.team_names,
+            'playmodes': None if frame_specs is None else match.frame.playmodes.tolist(),
+        }
+
+    @staticmethod
+    def __encode(series: pd.Series):
+        """
+            Returns the array to share for a column and its categories, None for columns shared as they are.
+        """
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+            return series.to_numpy(), None
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories.tolist()
+
+        # categories in order of appearance, so ties of value_counts() and the like keep the order of the original column
+        codes, categories = pd.factorize(series)
+        return codes, categories.tolist()
+
+    @property
+    def match(self):
+        return self.__match
+
+    @property
+    def name(self):
+        return self.__block.name
+
+    @property
+    def nbytes(self):
+        return self.__block.size
+
+    @property
+    def descriptor(self):
+        return self.__descriptor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+            Unmaps and removes the block. Matches attached in this process must not be used afterwards.
+        """
+        self.__block.close()
+        self.__block.unlink()
+
+    @staticmethod
+    def __open(name: str) -> shared_memory.SharedMemory:
+        if name not in _attached:
+            if sys.version_info >= (3, 13):
+                # the publisher removes the block, workers must not when they exit
+                _attached[name] = shared_memory.SharedMemory(name, track=False)
+            else:
+                _attached[name] = shared_memory.SharedMemory(name)
+        return _attached[name]
+
+    @staticmethod
+    def attach(descriptor: dict) -> Match:
+        """
+            Builds the published match over the shared block, without copying any of its arrays.
+
+                Parameters:
+                        descriptor (dict): SharedMatch.descriptor of the publisher
+
+                Returns:
+                        match (Match): match whose dataframe columns and MatchFrame are read-only shared views
+        """
+        block = SharedMatch.__open(descriptor['name'])
+
+        def view(spec):
+            offset, shape, dtype = spec
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+            array.flags.writeable = False
+            return array
+
+        data = {}
+        for column, spec, categories in descriptor['columns']:
+            values = view(spec)
+            data[column] = values if categories is None else pd.Categorical.from_codes(values, categories)
+
+        index = pd.RangeIndex(descriptor['rows']) if descriptor['index'] is None else view(descriptor['index'])
+        category = CATEGORIES[descriptor['category']]
+        match = Match(pd.DataFrame(data, index=index, copy=False), category, descriptor['meta_data'])
+
+        if descriptor['frame'] is not None:
+            arrays = {name: view(spec) for name, spec in descriptor['frame'].items()}
+            match.frame = MatchFrame.from_arrays(category, arrays, descriptor['team_names'], descriptor['playmodes'])
+
+        return match
+
+    @staticmethod
+    def detach(descriptor: dict) -> None:
+        """
+            Unmaps the block attached by this process. Nothing may reference the attached match or its arrays
+            anymore, results must have been copied or pickled out of it.
+
+                Parameters:
+                        descriptor (dict): SharedMatch.descriptor the match was attached from
+        """
+        block = _attached.pop(descriptor['name'], None)
+        if block is None:
+            return
+
+        try:
+            block.close()
+        except BufferError:
+            # arrays still held by reference cycles, e.g. of dataframes, are freed before unmapping
+            gc.collect()
+            block.close()
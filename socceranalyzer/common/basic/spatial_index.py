@@ -0,0 +1,210 @@
+from threading import Lock
+
+import numpy as np
+
+
+class SpatialIndex:
+    """
+        Batched neighborhood queries over the player positions of a MatchFrame, e.g. the players within
+        a radius of the ball over a range of cycles, or the players inside a polygon at given cycles.
+
+        SpatialIndex(frame: MatchFrame, block: int = 4096)
+
+        Positions are converted to float64 one block of rows at a time, when a query first touches the
+        block, and kept for later queries. With only 22 players per cycle, a distance computed for every
+        player of a block of cycles at once is cheaper than building and walking a grid or tree per cycle,
+        so queries are exact and vectorized over the rows they are given.
+
+        Rows are given as None (every row), a slice or an array of row positions. Results keep the
+        (rows, team, player) layout of MatchFrame.positions, teams as 0 (left) and 1 (right) and players as
+        unum - 1. Missing players are never within a radius nor inside a polygon.
+
+        Attributes
+        ----------
+            public through @properties:
+                frame: MatchFrame
+                    match the positions are read from
+                block: int
+                    number of rows converted at once
+                built: int
+                    number of rows converted so far
+
+        Methods
+        -------
+            public:
+                positions(rows) -> np.ndarray[float64]
+                    players positions of the given rows, shape (rows, 2, 11, 2)
+                distances(points, rows) -> np.ndarray[float64]
+                    distance from every player to the point of each row, inf for missing players
+                within(points, radius, rows) -> np.ndarray[bool]
+                    players within radius of the point of each row
+                nearest(points, rows, gkeeper) -> np.ndarray, np.ndarray, np.ndarray
+                    team, unum and distance of the player closest to the point of each row
+                inside_triangle(a, b, c, rows) -> np.ndarray[bool]
+                    players strictly inside the triangle of each row
+                inside_polygon(vertices, rows) -> np.ndarray[bool]
+                    players inside a polygon, shared by every row or one per row
+    """
+    def __init__(self, frame, block: int = 4096):
+        self.__frame = frame
+        self.__block = block
+        self.__positions: np.ndarray = None
+        self.__built = np.zeros(-(-len(frame) // block), dtype=bool)
+        self.__lock = Lock()
+
+    @property
+    def frame(self):
+        return self.__frame
+
+    @property
+    def block(self):
+        return self.__block
+
+    @property
+    def built(self):
+        return min(int(self.__built.sum()) * self.__block, len(self.__frame))
+
+    def __rows(self, rows) -> np.ndarray:
+        if rows is None:
+            return np.arange(len(self.__frame))
+        if isinstance(rows, slice):
+            return np.arange(len(self.__frame))[rows]
+        return np.asarray(rows, dtype=np.intp)
+
+    def __build(self, rows: np.ndarray):
+        """
+            Converts the blocks holding the given rows that were not queried before.
+        """
+        blocks = np.unique(rows // self.__block)
+        blocks = blocks[~self.__built[blocks]]
+        if len(blocks) == 0:
+            return
+
+        with self.__lock:
+            if self.__positions is None:
+                # pages of blocks never queried are not touched, so they take no memory
+                self.__positions = np.empty(self.__frame.positions.shape, dtype=np.float64)
+
+            for block in blocks[~self.__built[blocks]]:
+                rows_of_block = slice(block * self.__block, (block + 1) * self.__block)
+                self.__positions[rows_of_block] = self.__frame.positions[rows_of_block]
+                self.__built[block] = True
+
+    @staticmethod
+    def __per_row(values, rows: np.ndarray, ndim: int) -> np.ndarray:
+        """
+            Broadcasts a value shared by every row, e.g. a single point, against the per row ones.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        return values if values.ndim == ndim else np.broadcast_to(values, (len(rows),) + values.shape)
+
+    def positions(self, rows=None) -> np.ndarray:
+        """
+            Returns the float64 players positions of the given rows, shape (rows, 2, 11, 2).
+        """
+        rows = self.__rows(rows)
+        self.__build(rows)
+        return self.__positions[rows]
+
+    def distances(self, points, rows=None) -> np.ndarray:
+        """
+            Returns the distance from every player to a point, shape (rows, 2, 11).
+
+                Parameters:
+                        points (np.ndarray): one point for every row, shape (rows, 2), or a single point, shape (2,)
+                        rows: rows to query, every row when None
+
+                Returns:
+                        distances (np.ndarray[float64]): inf for missing players
+        """
+        rows = self.__rows(rows)
+        points = self.__per_row(points, rows, 2)
+        positions = self.positions(rows)
+
+        distances = np.hypot(positions[..., 0] - points[:, None, None, 0], positions[..., 1] - points[:, None, None, 1])
+        distances[np.isnan(distances)] = np.inf
+        return distances
+
+    def within(self, points, radius: float, rows=None) -> np.ndarray:
+        """
+            Returns a mask of the players within radius of the point of each row, shape (rows, 2, 11).
+        """
+        return self.distances(points, rows) <= radius
+
+    def nearest(self, points, rows=None, gkeeper: bool = True):
+        """
+            Finds the player closest to the point of each row. Ties are broken left before right,
+            lower unum first, as the players are compared in l1, r1, l2, r2, ... order.
+
+                Parameters:
+                        points (np.ndarray): one point for every row, shape (rows, 2), or a single point, shape (2,)
+                        rows: rows to query, every row when None
+                        gkeeper (bool): whether goalkeepers are taken into account
+
+                Returns:
+                        team (np.ndarray[int]): 0 for left and 1 for right
+                        unum (np.ndarray[int]): unum of the closest player
+                        distance (np.ndarray[float64]): distance to the point, inf when every player is missing
+        """
+        distances = self.distances(points, rows)[:, :, 0 if gkeeper else 1:]
+
+        # (rows, team, player) -> (rows, player, team) flattens to l1, r1, l2, r2, ...
+        interleaved = distances.transpose(0, 2, 1).reshape(len(distances), -1)
+        closest = np.argmin(interleaved, axis=1)
+
+        return closest % 2, closest // 2 + (1 if gkeeper else 2), interleaved[np.arange(len(interleaved)), closest]
+
+    def inside_triangle(self, a, b, c, rows=None) -> np.ndarray:
+        """
+            Returns a mask of the players strictly inside the triangle abc of each row, shape (rows, 2, 11),
+            using barycentric coordinates. Degenerate triangles contain no player.
+
+                Parameters:
+                        a, b, c (np.ndarray): vertices for every row, shape (rows, 2), or shared ones, shape (2,)
+                        rows: rows to query, every row when None
+        """
+        rows = self.__rows(rows)
+        a, b, c = (self.__per_row(vertex, rows, 2) for vertex in (a, b, c))
+        positions = self.positions(rows)
+
+        v0 = (c - a)[:, None, None, :]
+        v1 = (b - a)[:, None, None, :]
+        v2 = positions - a[:, None, None, :]
+
+        dot00 = (v0 * v0).sum(axis=-1)
+        dot01 = (v0 * v1).sum(axis=-1)
+        dot02 = (v0 * v2).sum(axis=-1)
+        dot11 = (v1 * v1).sum(axis=-1)
+        dot12 = (v1 * v2).sum(axis=-1)
+
+        # degenerate triangles and missing players yield nan, which is never inside
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_denom = 1.0 / (dot00 * dot11 - dot01 * dot01)
+            u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+            v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+
+            return (u >= 0.) & (v >= 0.) & (u + v < 1.)
+
+    def inside_polygon(self, vertices, rows=None) -> np.ndarray:
+        """
+            Returns a mask of the players inside a simple polygon, shape (rows, 2, 11), by counting the
+            crossings of a ray cast from every player with the edges of the polygon.
+
+                Parameters:
+                        vertices (np.ndarray): polygon shared by every row, shape (k, 2), or one per row, shape (rows, k, 2)
+                        rows: rows to query, every row when None
+        """
+        rows = self.__rows(rows)
+        vertices = self.__per_row(vertices, rows, 3)
+        positions = self.positions(rows)
+        x, y = positions[..., 0, None], positions[..., 1, None]
+
+        # edges from every vertex to the next one, shape (rows, 1, 1, k) against (rows, 2, 11, 1)
+        start = vertices[:, None, None, :, :]
+        end = np.roll(vertices, -1, axis=1)[:, None, None, :, :]
+        x0, y0, x1, y1 = start[..., 0], start[..., 1], end[..., 0], end[..., 1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crosses = ((y0 > y) != (y1 > y)) & (x < (x1 - x0) * (y - y0) / (y1 - y0) + x0)
+
+        return crosses.sum(axis=-1) % 2 == 1
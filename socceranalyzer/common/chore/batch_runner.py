@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+from time import perf_counter
+
+import pandas as pd
+
+from socceranalyzer.common.basic.match import Match
+from socceranalyzer.common.chore.match_analyzer import MatchAnalyzer
+from socceranalyzer.common.io.cache import read_log
+from socceranalyzer.common.io.results_writer import ResultsWriter
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.run_configuration import RunConfiguration
+
+
+def summarize(match_analyzer: MatchAnalyzer) -> dict:
+    """
+    Collects the scalar results of every enabled analysis into a flat dict.
+
+            Parameters:
+                    match_analyzer (MatchAnalyzer): analyzer that already ran
+
+            Returns:
+                    summary (dict): one entry per team and result, e.g. ball_possession_l
+    """
+    config = match_analyzer.config
+    summary = {}
+
+    if config.ball_possession:
+        summary['ball_possession_l'], summary['ball_possession_r'] = match_analyzer.ball_possession.results()
+
+    if config.foul_charge:
+        summary['fouls_l'], summary['fouls_r'] = match_analyzer.foul_charge.quantity()
+
+    if config.corners_occurrencies:
+        left, right = match_analyzer.corners.results()
+        summary['corners_l'], summary['corners_r'] = len(left), len(right)
+
+    if config.passing_accuracy:
+        left = match_analyzer.passing_accuracy.stats()['left_team']
+        right = match_analyzer.passing_accuracy.stats()['right_team']
+        summary['passing_accuracy_l'], summary['passing_accuracy_r'] = left['accuracy'], right['accuracy']
+        summary['total_passes_l'], summary['total_passes_r'] = left['total_passes'], right['total_passes']
+
+    if config.intercept_counter:
+        summary['interceptions_l'], summary['interceptions_r'] = match_analyzer.intercept_counter.results()
+
+    if config.shooting:
+        for side in ('l', 'r'):
+            summary[f'shots_{side}'] = match_analyzer.shooting.get_total_team_shots(side)
+            summary[f'on_target_shots_{side}'] = match_analyzer.shooting.get_team_on_target_shots(side)
+            summary[f'xG_{side}'] = match_analyzer.shooting.get_total_team_xG(side)
+
+    return summary
+
+
+def analyze_log(path: str, config: RunConfiguration) -> dict:
+    """
+    Runs Match and MatchAnalyzer over a single log. Runs inside the worker processes of BatchRunner,
+    so it never raises: failures are reported in the returned row.
+
+    When config.results_dir is set, the serialized results of every analysis are appended to the
+    ResultsWriter dataset there, under the log name, by the worker itself, so only the summary row
+    goes back to the parent process.
+
+            Parameters:
+                    path (str): path to the log
+                    config (RunConfiguration): enabled analysis and results folder
+
+            Returns:
+                    row (dict): log, status, error, wall_time and the match summary
+    """
+    begin = perf_counter()
+    row = {'log': os.path.basename(path), 'status': 'ok', 'error': None}
+
+    try:
+        dataframe = read_log(path, config.cache_dir, MatchAnalyzer.required_columns(config))
+        category = config.category
+
+        row['team_l'] = dataframe[str(category.TEAM_LEFT)].iloc[0]
+        row['team_r'] = dataframe[str(category.TEAM_RIGHT)].iloc[0]
+        row['score_l'] = int(dataframe[str(category.TEAM_LEFT_SCORE)].iloc[-1])
+        row['score_r'] = int(dataframe[str(category.TEAM_RIGHT_SCORE)].iloc[-1])
+
+        match_analyzer = MatchAnalyzer(Match(dataframe, category), run_config=config)
+        row.update(summarize(match_analyzer))
+
+        if getattr(config, 'results_dir', None):
+            ResultsWriter(config.results_dir).append(match_analyzer.collect_results(), os.path.basename(path))
+    except Exception as err:
+        row['status'] = 'failed'
+        row['error'] = f'{type(err).__name__}: {err}'
+
+    row['wall_time'] = perf_counter() - begin
+    return row
+
+
+class BatchRunner:
+    """
+        Analyzes every log found in RunConfiguration.logs_dir across a process pool.
+
+        BatchRunner(config: RunConfiguration, workers: int = None, pattern: str = '*.rcg.csv', logs: list[str] = None)
+
+        When logs is given, only those paths are analyzed and the logs folder is not searched.
+
+        Attributes
+        ----------
+            public through @properties:
+                config: RunConfiguration
+                    enabled analysis and logs folder
+                workers: int
+                    number of worker processes, defaults to config.workers or os.cpu_count()
+                logs: list[str]
+                    sorted paths of the logs found in the logs folder, or of the given logs
+                results: pandas.DataFrame
+                    one row per analyzed log, ordered as the logs finished
+                failures: pandas.DataFrame
+                    rows of the logs that could not be analyzed
+
+        Methods
+        -------
+            public:
+                run() -> pandas.DataFrame
+                    analyzes all logs and returns the aggregated table
+    """
+    def __init__(self, config: RunConfiguration, workers: int = None, pattern: str = '*.rcg.csv', logs: list[str] = None):
+        self.__config = config
+        self.__workers = workers or config.workers or os.cpu_count()
+        self.__logs = sorted(logs if logs is not None else glob(os.path.join(config.logs_dir, pattern)))
+        self.__rows = []
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @property
+    def logs(self):
+        return self.__logs
+
+    @property
+    def results(self):
+        return pd.DataFrame(self.__rows)
+
+    @property
+    def failures(self):
+        results = self.results
+        if results.empty:
+            return results
+        return results[results.status == 'failed']
+
+    def run(self) -> pd.DataFrame:
+        """
+        Analyzes all logs, streaming each row into the results as soon as its log is done.
+        A failing log is reported and skipped without aborting the batch.
+
+                Returns:
+                        results (pandas.DataFrame): one row per log
+        """
+        self.__rows = []
+        if not self.__logs:
+            Logger.warn(f"No logs found in {self.__config.logs_dir}")
+            return self.results
+
+        Logger.info(f"Analyzing {len(self.__logs)} logs with {self.__workers} workers.")
+        begin = perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            futures = {executor.submit(analyze_log, log, self.__config): log for log in self.__logs}
+
+            for future in as_completed(futures):
+                try:
+                    row = future.result()
+                except Exception as err:
+                    # the worker itself died, e.g. out of memory
+                    row = {'log': os.path.basename(futures[future]), 'status': 'failed',
+                           'error': f'{type(err).__name__}: {err}', 'wall_time': None}
+
+                self.__rows.append(row)
+                if row['status'] == 'ok':
+                    Logger.success(f"{row['log']} analyzed in {row['wall_time']:.2f} seconds.")
+                else:
+                    Logger.error(f"{row['log']} failed: {row['error']}")
+
+        Logger.info(f"Analyzed {len(self.__logs)} logs in {perf_counter() - begin:.2f} seconds, "
+                    f"{len(self.failures)} failed.")
+
+        return self.results
@@ -2,10 +2,15 @@ from time import time
 
 import pandas as pd
 
-from socceranalyzer.common.analysis.speed import Speed
+from socceranalyzer.common.analysis.abstract_analysis import AbstractAnalysis
+from socceranalyzer.common.analysis.speed import Speed, TeamSpeed
 from socceranalyzer.common.chore.abstract_factory import AbstractFactory
+from socceranalyzer.common.chore.mediator import Mediator
+from socceranalyzer.common.chore.scheduler import AnalysisRegistry, AnalysisScheduler
+from socceranalyzer.common.chore.process_scheduler import ProcessAnalysisScheduler
 from socceranalyzer.common.basic.match import Match
 from socceranalyzer.common.collections.collections import EvaluatorCollection
+from socceranalyzer.common.io.result_store import ResultStore
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.enums.ssl import SSL
 from socceranalyzer.common.enums.vss import VSS
@@ -30,6 +35,66 @@ from socceranalyzer.common.analysis.goalkeeper import GoalkeeperAnalysis
 from socceranalyzer.common.analysis.base_footprint import BaseFootprint
 from socceranalyzer.utils.run_configuration import RunConfiguration
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.profiler import Profiler
+
+SPEED_PARAMETERS = {'player_number': 9, 'side': 'left'}
+
+
+def sim2d_registry() -> AnalysisRegistry:
+    """
+    Registers every SIM2D analysis under its config.json key, along with the evaluators they share.
+    Bump the version of an analysis whenever its results change, so results stored by ResultStore are not reused.
+    """
+    registry = AnalysisRegistry()
+
+    # shared evaluators, built once per match
+    registry.register('frame', lambda match, inputs, debug: match.frame, evaluator=True)
+    registry.register('playmode_index', lambda match, inputs, debug: match.playmode_index, evaluator=True)
+    registry.register('passing', lambda match, inputs, debug: _passing(match, inputs['frame'], debug),
+                      requires=('frame',), columns=Passing.columns, evaluator=True, version=2)
+
+    registry.register('ball_possession', lambda match, inputs, debug: BallPossession(match.dataframe, match.category, debug, frame=inputs['frame']),
+                      requires=('frame',), columns=BallPossession.columns)
+    registry.register('tester_free_kick', lambda match, inputs, debug: TesterFK(match.dataframe, match.category, debug, playmode_index=inputs['playmode_index']),
+                      requires=('playmode_index',), columns=TesterFK.columns)
+    registry.register('foul_charge', lambda match, inputs, debug: FoulCharge(match.dataframe, match.category, debug, frame=inputs['frame'], playmode_index=inputs['playmode_index']),
+                      requires=('frame', 'playmode_index'), columns=FoulCharge.columns, version=2)
+    registry.register('penalty', lambda match, inputs, debug: Penalty(match.dataframe, match.category, debug, playmode_index=inputs['playmode_index'], frame=inputs['frame']),
+                      requires=('frame', 'playmode_index'), columns=Penalty.columns, version=2)
+    registry.register('playmodes', lambda match, inputs, debug: Playmodes(match.dataframe, match.category, debug),
+                      columns=Playmodes.columns)
+    registry.register('corners_occurrencies', lambda match, inputs, debug: CornersOcurrencies(match.dataframe, match.category, debug, playmode_index=inputs['playmode_index'], frame=inputs['frame']),
+                      requires=('frame', 'playmode_index'), columns=CornersOcurrencies.columns, version=2)
+    registry.register('intercept_counter', lambda match, inputs, debug: InterceptCounter(match, inputs['passing'], debug),
+                      requires=('passing',), columns=InterceptCounter.columns)
+    registry.register('passing_accuracy', lambda match, inputs, debug: PassingAccuracy(match.dataframe, match.category, inputs['passing'], debug),
+                      requires=('passing',), columns=PassingAccuracy.columns)
+    registry.register('time_after_events', lambda match, inputs, debug: TimeAfterEvents(match.dataframe, match.category,
+                                                                                        inputs['corners_occurrencies'].results(), debug,
+                                                                                        fouls=inputs['foul_charge'].results(tuple=True)),
+                      requires=('corners_occurrencies', 'foul_charge'), columns=TimeAfterEvents.columns)
+    registry.register('stamina', lambda match, inputs, debug: Stamina(match.dataframe, match.category, debug),
+                      columns=Stamina.columns)
+    registry.register('shooting', lambda match, inputs, debug: Shooting(match.dataframe, match.category, debug, frame=inputs['frame']),
+                      requires=('frame',), columns=Shooting.columns)
+    registry.register('heatmap', lambda match, inputs, debug: Heatmap(match.dataframe, match.category, debug, frame=inputs['frame']),
+                      requires=('frame',), columns=Heatmap.columns, version=2)
+    registry.register('speed', lambda match, inputs, debug: Speed(match.dataframe, match.category, debug=debug, **SPEED_PARAMETERS),
+                      columns=Speed.columns, version=2, parameters=SPEED_PARAMETERS)
+    registry.register('find_goals', lambda match, inputs, debug: FindGoals(match.dataframe, match.category, debug, playmode_index=inputs['playmode_index']),
+                      requires=('playmode_index',), columns=FindGoals.columns)
+    registry.register('goalkeeper', lambda match, inputs, debug: GoalkeeperAnalysis(match.dataframe, match.category, debug),
+                      columns=GoalkeeperAnalysis.columns)
+
+    return registry
+
+
+def _passing(match, frame, debug):
+    # evaluated here, so InterceptCounter and PassingAccuracy never race to evaluate it
+    passing = Passing(match.dataframe, match.category, debug, frame=frame)
+    passing.run_passing_evaluation()
+    return passing
+
 
 class MatchAnalyzer(AbstractFactory):
     """
@@ -38,8 +103,14 @@ class MatchAnalyzer(AbstractFactory):
         - Acts as a endpoint to connect all created analysis in the framework.
         - Creates analysis objects, run them and then provide secure access to it's computed values.
         - At instantiation, it has no analysis. At runtime, generates analysis set in self._run_analysis().
+        - SIM2D analysis are registered in sim2d_registry() with the analysis and evaluators they require,
+          and an AnalysisScheduler runs the enabled ones in dependency order, concurrently when possible.
         
-        MatchAnalyzer(math: Match)
+        MatchAnalyzer(math: Match, debug: bool = False, run_config: RunConfiguration = None, profiler: Profiler = None,
+                      store: ResultStore = None)
+
+        When a ResultStore is given, or run_config.results_store names its file, SIM2D analysis computed on
+        the same data by a previous run are loaded from it instead of run again.
 
         Attributes
         ----------
@@ -66,6 +137,16 @@ class MatchAnalyzer(AbstractFactory):
                     Returns the Enum of the match category
                 analysis_dict: dict
                     Returns a dictionary object with all current analysis and it's values.
+                timings: dict[str, float]
+                    Seconds taken by every analysis and evaluator of the last run
+                profiler: Profiler
+                    Records of every analysis and evaluator run, wall time and CPU time only when none is given
+                profile: pandas.DataFrame
+                    One row per analysis and evaluator run, with its wall time, CPU time and rows processed
+                store: ResultStore
+                    Results of previous runs, None when not configured
+                cached: list[str]
+                    Analysis loaded from the result store in the last run
             
         Methods
         -------
@@ -78,24 +159,38 @@ class MatchAnalyzer(AbstractFactory):
                     Prints the result of the game
                 available: None
                     Prints the current analysis being done (hardcoded)
-                collect_results:
-                    Returns a dictionary with built-in type values for usage
+                collect_results() -> dict[str, pandas.DataFrame]
+                    Returns the serialized results of every analysis that ran, as a bundle of tables
+                required_columns(config: RunConfiguration) -> list[str]:
+                    Returns the union of the columns read by the analysis enabled in config
                 
             private:
                 _run_analysis: None
-                    Creates analysis classes instances and run them.
+                    Creates analysis classes instances and run them through the AnalysisScheduler,
+                    or the ProcessAnalysisScheduler when config.analysis_processes is above 1.
                 _generate_evaluators: None
                     Generates implemented evaluators
 
 
 
     """
-    def __init__(self, match: Match = None, debug: bool = False, run_config: RunConfiguration = None):
+    # config.json analysis key -> analysis and the evaluators it requires
+    SIM2D_REGISTRY = sim2d_registry()
+
+    def __init__(self, match: Match = None, debug: bool = False, run_config: RunConfiguration = None, profiler: Profiler = None,
+                 store: ResultStore = None):
         self._DEBUG = debug
         self.__match = match
         self.__cat = match.category
         self.__run_configuration: RunConfiguration = run_config
         self.__evaluators: EvaluatorCollection = None
+        self.__analysis: dict = {}
+        self.__timings: dict[str, float] = {}
+        self.__profiler: Profiler = profiler if profiler is not None else Profiler()
+        self.__store: ResultStore = store
+        self.__cached: list[str] = []
+        if store is None and getattr(run_config, 'results_store', None):
+            self.__store = ResultStore(run_config.results_store)
 
         try:
             if self.__cat is None:
@@ -151,59 +246,87 @@ class MatchAnalyzer(AbstractFactory):
 
     @property
     def ball_possession(self):
-        return self.__ball_possession
+        return self.__analysis.get('ball_possession')
     
     @property
     def intercept_counter(self):
-        return self.__intercept_counter
+        return self.__analysis.get('intercept_counter')
 
     @property
     def tester_free_kick(self):
-        return self.__tester_free_kick
+        return self.__analysis.get('tester_free_kick')
 
     @property
     def foul_charge(self):
-        return self.__foul_charge
+        return self.__analysis.get('foul_charge')
 
     @property
     def penalty(self):
-        return self.__penalty
+        return self.__analysis.get('penalty')
 
     @property
     def stamina(self):
-        return self.__stamina
+        return self.__analysis.get('stamina')
 
     @property
     def corners(self):
-        return self.__corners_occurrencies
+        return self.__analysis.get('corners_occurrencies')
 
     @property
     def passing_accuracy(self):
-        return self.__passing_accuracy
+        return self.__analysis.get('passing_accuracy')
 
     @property
     def playmodes(self):
-        return self._playmodes
+        return self.__analysis.get('playmodes')
 
     @property
     def shooting(self):
-        return self.__shooting
+        return self.__analysis.get('shooting')
 
     @property
     def heatmap(self):
-        return self.__heatmap
+        return self.__analysis.get('heatmap')
 
     @property
     def find_goals(self):
-        return self.__find_goals
+        return self.__analysis.get('find_goals')
 
     @property
     def goalkeeper(self):
-        return self.__goalkeeper
+        return self.__analysis.get('goalkeeper')
 
     @property
     def ball_history(self):
-        return self._ball_history
+        return self.__analysis.get('ball_history')
+
+    @property
+    def time_after_events(self):
+        return self.__analysis.get('time_after_events')
+
+    @property
+    def speed(self):
+        return self.__analysis.get('speed')
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @property
+    def profile(self):
+        return self.__profiler.to_dataframe()
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def cached(self):
+        return self.__cached
 
     @property
     def analysis_dict(self):
@@ -215,6 +338,26 @@ class MatchAnalyzer(AbstractFactory):
         raise NotImplementedError
         # return BallHolder(self.match.dataframe, self.match.category)
 
+    @staticmethod
+    def required_columns(config: RunConfiguration) -> list[str]:
+        """
+        Returns the union of the columns read by the analysis enabled in config, in a stable order.
+        Only SIM2D logs are projected, None means every column is needed.
+
+                Parameters:
+                        config (RunConfiguration): run configuration with the enabled analysis
+
+                Returns:
+                        columns (list[str] | None): columns to load
+        """
+        if getattr(config, 'category', None) is not SIM2D:
+            return None
+
+        columns = dict.fromkeys(Mediator.match_columns(SIM2D))
+        columns.update(dict.fromkeys(MatchAnalyzer.SIM2D_REGISTRY.columns(config.enabled_analysis(), SIM2D)))
+
+        return list(columns)
+
     def winner(self) -> str:
         """
         Returns the name of the winning team.
@@ -240,76 +383,20 @@ class MatchAnalyzer(AbstractFactory):
         Logger.data(f'{self.__match.team_left_name} {self.__match.score_left} x {self.__match.score_right} {self.__match.team_right_name}')
 
     def _run_analysis(self):
-        if self.__cat is SIM2D:
-            if self.config.ball_possession:
-                setattr(self, "__ball_possession", None)
-                self.__ball_possession = BallPossession(self.__match.dataframe, self.category, self._DEBUG)
-            
-            if self.config.tester_free_kick:
-                setattr(self, "__tester_free_kick", None)
-                self.__tester_free_kick = TesterFK(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.foul_charge:
-                setattr(self, "__foul_charge", None)
-                self.__foul_charge = FoulCharge(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.penalty:
-                setattr(self, "__penalty", None)
-                self.__penalty = Penalty(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.playmodes:
-                setattr(self, "__playmodes", None)
-                self._playmodes = Playmodes(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.corners_occurrencies:
-                setattr(self, "__corners_occurrencies", None)
-                self.__corners_occurrencies = CornersOcurrencies(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.intercept_counter or self.config.passing_accuracy:
-                passing = Passing(self.__match.dataframe, self.category, self._DEBUG)
-                setattr(self, "__intercept_counter", None)
-                self.__intercept_counter = InterceptCounter(self.__match, passing, self._DEBUG)
-
-                setattr(self, "__passing_accuracy", None)
-                self.__passing_accuracy = PassingAccuracy(self.__match.dataframe, self.category, passing, self._DEBUG)
-
-            if self.config.time_after_events:
-                setattr(self, "__time_after_events", None)
-                self.__time_after_events = TimeAfterEvents(self.__match.dataframe, self.category,
-                                                        self.__corners_occurrencies.results(),
-                                                        self.__foul_charge.results(tuple=True),
-                                                        self._DEBUG)
-
-            if self.config.ball_history:
-                setattr(self, "__ball_history", None)
-                #self._ball_history = ObjectHistory(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.stamina:
-                setattr(self, "__stamina", None)
-                self.__stamina = Stamina(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.shooting:
-                setattr(self, "__shooting", None)
-                self.__shooting = Shooting(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.heatmap:
-                setattr(self, "__heatmap", None)
-                self.__heatmap = Heatmap(self.__match.dataframe, self.category, self._DEBUG)
-            
-            if self.config.speed:
-                setattr(self, "__speed", None)
-                self__speed = Speed(self.__match.dataframe, self.category, 9, "left", self._DEBUG)
-
-            if self.config.find_goals:
-                setattr(self, "__find_goals", None)
-                self.__find_goals = FindGoals(self.__match.dataframe, self.category, self._DEBUG)
-
-            if self.config.goalkeeper:
-                setattr(self, "__goalkeeper", None)
-                self.__goalkeeper = GoalkeeperAnalysis(self.__match.dataframe, self.category, self._DEBUG)
-
-            #setattr(self, "__time_after_corner", None)
-            #self.__time_after_corner = TimeAfterCorner(self.__match.dataframe, self.category)
+        if self.__cat is SIM2D and (getattr(self.config, 'analysis_processes', None) or 0) > 1:
+            # the match is shared with the worker processes, stored analyses are loaded here and not sent to them
+            scheduler = ProcessAnalysisScheduler(sim2d_registry, self.config.analysis_processes, self._DEBUG,
+                                                 profiler=self.__profiler, store=self.__store)
+            self.__analysis = scheduler.run(self.__match, self.config.enabled_analysis())
+            self.__timings = scheduler.timings
+            self.__cached = scheduler.cached
+
+        elif self.__cat is SIM2D:
+            scheduler = AnalysisScheduler(self.SIM2D_REGISTRY, getattr(self.config, 'analysis_workers', None), self._DEBUG,
+                                          self.__profiler, self.__store)
+            self.__analysis = scheduler.run(self.__match, self.config.enabled_analysis())
+            self.__timings = scheduler.timings
+            self.__cached = scheduler.cached
 
         elif self.__cat is SSL:
             pass
@@ -321,58 +408,115 @@ class MatchAnalyzer(AbstractFactory):
             # add VSS analysis
         
         elif self.__cat is HLKid:
-            df = self.__match.dataframe.copy()
+            # analyses writing columns return new frames and copy on write, so the log is shared as it is
+            df = self.__match.dataframe
+            rows = len(df)
             # Single analysis
-            self._playmodes = Playmodes(df, self.category, self._DEBUG)
-            self._ball_history = ObjectHistory(df, self.category, self._DEBUG, "ball.frame.pose")
-
-            # Analysis for each player
-            for team in [('l', 1), ('r', 2)]:
-                for player in range(1, 5):
-                    df = BaseFootprint(df, self.category, self._DEBUG, team[1], player).results()
-
-            self.left_player_1_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.base_footprint")
-            self.left_player_2_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.base_footprint")
-            self.left_player_3_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.base_footprint")
-            self.left_player_4_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.base_footprint")
-            self.right_player_1_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.base_footprint")
-            self.right_player_2_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.base_footprint")
-            self.right_player_3_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.base_footprint")
-            self.right_player_4_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.base_footprint")
+            with self.__profiler.record('playmodes', rows):
+                self.__analysis['playmodes'] = Playmodes(df, self.category, self._DEBUG)
+            with self.__profiler.record('ball_history', rows):
+                self.__analysis['ball_history'] = ObjectHistory(df, self.category, self._DEBUG, "ball.frame.pose")
+
+            # Analysis for each player, the footprints of every player are computed at once
+            with self.__profiler.record('base_footprint', rows):
+                df = BaseFootprint(df, self.category, self._DEBUG).results()
+
+            with self.__profiler.record('player_history', rows):
+                self.left_player_1_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.base_footprint")
+                self.left_player_2_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.base_footprint")
+                self.left_player_3_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.base_footprint")
+                self.left_player_4_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.base_footprint")
+                self.right_player_1_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.base_footprint")
+                self.right_player_2_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.base_footprint")
+                self.right_player_3_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.base_footprint")
+                self.right_player_4_history = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.base_footprint")
 
             speed_df = df
-            self.left_player_1_speed = Speed(speed_df, self.category, 1, "l", self._DEBUG)
-            self.left_player_2_speed = Speed(speed_df, self.category, 2, "l", self._DEBUG)
-            self.left_player_3_speed = Speed(speed_df, self.category, 3, "l", self._DEBUG)
-            self.left_player_4_speed = Speed(speed_df, self.category, 4, "l", self._DEBUG)
-            self.right_player_1_speed = Speed(speed_df, self.category, 1, "r", self._DEBUG)
-            self.right_player_2_speed = Speed(speed_df, self.category, 2, "r", self._DEBUG)
-            self.right_player_3_speed = Speed(speed_df, self.category, 3, "r", self._DEBUG)
-            self.right_player_4_speed = Speed(speed_df, self.category, 4, "r", self._DEBUG)
+            with self.__profiler.record('speed', rows):
+                # the speeds of every player are computed in a single pass and shared
+                self.team_speed = TeamSpeed(speed_df, self.category, self._DEBUG)
+                self.left_player_1_speed = Speed(speed_df, self.category, 1, "l", self._DEBUG, team_speed=self.team_speed)
+                self.left_player_2_speed = Speed(speed_df, self.category, 2, "l", self._DEBUG, team_speed=self.team_speed)
+                self.left_player_3_speed = Speed(speed_df, self.category, 3, "l", self._DEBUG, team_speed=self.team_speed)
+                self.left_player_4_speed = Speed(speed_df, self.category, 4, "l", self._DEBUG, team_speed=self.team_speed)
+                self.right_player_1_speed = Speed(speed_df, self.category, 1, "r", self._DEBUG, team_speed=self.team_speed)
+                self.right_player_2_speed = Speed(speed_df, self.category, 2, "r", self._DEBUG, team_speed=self.team_speed)
+                self.right_player_3_speed = Speed(speed_df, self.category, 3, "r", self._DEBUG, team_speed=self.team_speed)
+                self.right_player_4_speed = Speed(speed_df, self.category, 4, "r", self._DEBUG, team_speed=self.team_speed)
 
             # Self-localization
-            self.left_player_1_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
-            self.left_player_2_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
-            self.left_player_3_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
-            self.left_player_4_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
-            self.right_player_1_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
-            self.right_player_2_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
-            self.right_player_3_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
-            self.right_player_4_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
+            with self.__profiler.record('self_localization', rows):
+                self.left_player_1_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
+                self.left_player_2_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
+                self.left_player_3_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
+                self.left_player_4_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.team_comm.self_localization.pose", filter=FilterSelfLocalizationCovariance)
+                self.right_player_1_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
+                self.right_player_2_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
+                self.right_player_3_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
+                self.right_player_4_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.team_comm.self_localization.pose", mirror=True, filter=FilterSelfLocalizationCovariance)
 
             # Ball localization
-            self.left_player_1_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.team_comm.ball")
-            self.left_player_2_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.team_comm.ball")
-            self.left_player_3_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.team_comm.ball")
-            self.left_player_4_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.team_comm.ball")
-            self.right_player_1_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.team_comm.ball", mirror=True)
-            self.right_player_2_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.team_comm.ball", mirror=True)
-            self.right_player_3_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.team_comm.ball", mirror=True)
-            self.right_player_4_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.team_comm.ball", mirror=True)
+            with self.__profiler.record('ball_localization', rows):
+                self.left_player_1_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player1.team_comm.ball")
+                self.left_player_2_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player2.team_comm.ball")
+                self.left_player_3_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player3.team_comm.ball")
+                self.left_player_4_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team1.player4.team_comm.ball")
+                self.right_player_1_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player1.team_comm.ball", mirror=True)
+                self.right_player_2_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player2.team_comm.ball", mirror=True)
+                self.right_player_3_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player3.team_comm.ball", mirror=True)
+                self.right_player_4_ball_localization = ObjectHistory(df, self.category, self._DEBUG, "teams.team2.player4.team_comm.ball", mirror=True)
 
         else:
             raise ValueError("Invalid category.")
 
 
-    def collect_results(self):
-        raise NotImplementedError
+    def __analyses(self) -> dict:
+        """
+        Returns the analyses that ran, by name, leaving out evaluators and failed analyses.
+        """
+        if self.__cat is SIM2D:
+            return {name: analysis for name, analysis in self.__analysis.items()
+                    if analysis is not None and not self.SIM2D_REGISTRY.node(name).evaluator}
+
+        # HLKid analyses are attributes, the speeds of the players are all in team_speed
+        analyses = dict(self.__analysis)
+        analyses.update((name, value) for name, value in vars(self).items()
+                        if isinstance(value, AbstractAnalysis) and not isinstance(value, Speed))
+        return analyses
+
+    def __match_table(self) -> pd.DataFrame:
+        df = self.__match.dataframe
+        row = {'category': self.__cat.__name__, 'rows': len(df), 'fingerprint': self.__match.fingerprint()}
+
+        columns = {'team_l': 'TEAM_LEFT', 'team_r': 'TEAM_RIGHT', 'score_l': 'TEAM_LEFT_SCORE', 'score_r': 'TEAM_RIGHT_SCORE'}
+        for name, attribute in columns.items():
+            column = str(getattr(self.__cat, attribute, ''))
+            if column in df and len(df):
+                row[name] = df[column].iloc[-1] if name.startswith('score') else df[column].iloc[0]
+
+        return pd.DataFrame([row])
+
+    def collect_results(self) -> dict[str, pd.DataFrame]:
+        """
+        Serializes every analysis that ran into a single bundle of tables, ready to be written by ResultsWriter
+        or sent between processes. Analyses that cannot be serialized are reported and left out.
+
+                Returns:
+                        bundle (dict[str, pandas.DataFrame]): 'match', with the teams, score, rows and fingerprint
+                                                              of the match, and every table of every analysis,
+                                                              named after both, e.g. 'shooting/shots'
+        """
+        bundle = {'match': self.__match_table()}
+
+        for name, analysis in self.__analyses().items():
+            try:
+                tables = analysis.serialize()
+            except Exception as err:
+                Logger.error(f"{name} could not be serialized: {err}")
+                if self._DEBUG:
+                    raise
+                continue
+
+            bundle.update((f'{name}/{table}', dataframe) for table, dataframe in tables.items())
+
+        return bundle
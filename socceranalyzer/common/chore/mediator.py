@@ -19,6 +19,10 @@ class Mediator:
             players_right/left_stamina_attr: StringListPositions
                 A list of strings containing the name of players stamina attributes in 
                 SIM2D.
+            match_columns: list[str]
+                Columns every SIM2D analysis relies on: game time, playmode, team names and scores.
+            players_columns: list[str]
+                Columns of the given per-player attributes for both teams in SIM2D.
     """
     @staticmethod
     def players_left_position(category, gkeeper=True):
@@ -87,4 +91,32 @@ class Mediator:
         elif category is SSL:
             raise NotImplementedError
 
-        return string_list
\ No newline at end of file
+        return string_list
+
+    @staticmethod
+    def match_columns(category):
+        if category is SIM2D:
+            return [str(category.GAME_TIME), str(category.PLAYMODE),
+                    str(category.TEAM_LEFT), str(category.TEAM_RIGHT),
+                    str(category.TEAM_LEFT_SCORE), str(category.TEAM_RIGHT_SCORE)]
+        elif category is VSS:
+            raise NotImplementedError
+
+        elif category is SSL:
+            raise NotImplementedError
+
+    @staticmethod
+    def players_columns(category, attributes, gkeeper=True):
+        string_list = []
+        if category is SIM2D:
+            for side in ('l', 'r'):
+                for i in range(1 if gkeeper else 2, 12):
+                    for attribute in attributes:
+                        string_list.append(f'player_{side}{i}_{attribute}')
+        elif category is VSS:
+            raise NotImplementedError
+
+        elif category is SSL:
+            raise NotImplementedError
+
+        return string_list
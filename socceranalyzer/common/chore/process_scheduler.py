@@ -0,0 +1,268 @@
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import current_process
+from typing import Callable, Iterable
+
+from socceranalyzer.common.basic.shared_match import SharedMatch
+from socceranalyzer.common.chore.mediator import Mediator
+from socceranalyzer.common.chore.scheduler import AnalysisRegistry, AnalysisScheduler
+from socceranalyzer.common.io.result_store import ResultStore
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.profiler import Profiler
+
+# registries built by this process, one per factory
+_registries: dict[Callable, AnalysisRegistry] = {}
+
+
+def _registry(factory: Callable[[], AnalysisRegistry]) -> AnalysisRegistry:
+    if factory not in _registries:
+        _registries[factory] = factory()
+    return _registries[factory]
+
+
+def run_group(descriptor: dict, registry: Callable[[], AnalysisRegistry], names: list[str], debug: bool,
+              profile: dict = None):
+    """
+    Runs a group of analyses on a shared match. Runs inside the worker processes of ProcessAnalysisScheduler.
+
+            Parameters:
+                    descriptor (dict): SharedMatch.descriptor of the match
+                    registry (Callable): importable function returning the AnalysisRegistry of the analyses
+                    names (list[str]): analyses of the group
+                    debug (bool): whether failures are raised instead of reported
+                    profile (dict): arguments of the Profiler recording every node, None to skip profiling
+
+            Returns:
+                    results (dict[str, bytes]): every node run, pickled by ResultStore.dumps
+                    timings (dict[str, float]): wall time in seconds of every node
+                    profile (tuple[list[dict], float]): Profiler.records and Profiler.origin, None without profile
+                    process (str): name of the worker process
+    """
+    profiler = Profiler(**profile) if profile is not None else None
+    try:
+        results, timings = _run_group(descriptor, registry, names, debug, profiler)
+    except BaseException as err:
+        # the frames of the traceback hold the attached match
+        traceback.clear_frames(err.__traceback__)
+        raise
+    finally:
+        SharedMatch.detach(descriptor)
+
+    records = (profiler.records, profiler.origin) if profiler is not None else None
+    return results, timings, records, current_process().name
+
+
+def _run_group(descriptor: dict, registry: Callable[[], AnalysisRegistry], names: list[str], debug: bool,
+               profiler: Profiler = None):
+    """
+    Runs a group of analyses on the attached match and returns them pickled, so no reference to the match
+    is left once it returns.
+    """
+    match = SharedMatch.attach(descriptor)
+    scheduler = AnalysisScheduler(_registry(registry), workers=1, debug=debug, profiler=profiler)
+
+    results = {}
+    for name, result in scheduler.run(match, names).items():
+        try:
+            results[name] = ResultStore.dumps(result, match)
+        except Exception as err:
+            Logger.error(f"{name} could not be sent back: {err}")
+            if debug:
+                raise
+            results[name] = None
+
+    return results, scheduler.timings
+
+
+class ProcessAnalysisScheduler:
+    """
+        Runs a set of analyses from an AnalysisRegistry across a process pool, on a match published once in
+        shared memory.
+
+        ProcessAnalysisScheduler(registry: Callable[[], AnalysisRegistry], workers: int = None, debug: bool = False,
+                                 shared: tuple[str] = ('frame', 'playmode_index'), profiler: Profiler = None,
+                                 store: ResultStore = None)
+
+        The match is published with SharedMatch and every worker attaches it without copying the dataframe.
+        The analyses are split into groups that share no node but the shared ones, which workers read from
+        the attached match, e.g. its MatchFrame. Each group runs in a worker with an AnalysisScheduler, so
+        evaluators such as Passing are still built once for the analyses requiring them.
+
+        Results are sent back pickled by ResultStore.dumps, with the match, dataframe and MatchFrame as
+        references, and bound to the match of the caller. Analyses that cannot be pickled are reported and
+        returned as None.
+
+        With a store, the stored analyses are loaded in the caller as AnalysisScheduler does, only the missing
+        ones are sent to the workers, and the ones they return are stored. With a profiler, every worker
+        records its nodes with a Profiler of the same settings, merged into it once the group is done. Memory
+        and cProfile measurements are per process, so they hold even though groups run at the same time.
+
+        registry is a function building the registry, e.g. sim2d_registry, as registries hold the lambdas
+        building every node and are built again in each worker.
+
+        Attributes
+        ----------
+            public through @properties:
+                registry: AnalysisRegistry
+                    nodes available to run
+                workers: int
+                    size of the process pool, None for the ProcessPoolExecutor default
+                shared: tuple[str]
+                    nodes read from the shared match, which do not tie analyses to the same group
+                profiler: Profiler
+                    records every node run, None to skip profiling
+                store: ResultStore
+                    computed analyses of previous runs, None to always run them
+                cached: list[str]
+                    analyses of the last run that were loaded from the store
+                timings: dict[str, float]
+                    wall time in seconds of every node of the last run
+                processes: dict[str, str]
+                    name of the worker process every node of the last run ran in
+
+        Methods
+        -------
+            public:
+                groups(names: Iterable[str]) -> list[list[str]]
+                    analyses of every task, in registration order
+                run(match: Match, names: Iterable[str]) -> dict
+                    runs the given analyses and their dependencies, returning the result of every node
+    """
+    def __init__(self, registry: Callable[[], AnalysisRegistry], workers: int = None, debug: bool = False,
+                 shared: tuple[str] = ('frame', 'playmode_index'), profiler: Profiler = None, store: ResultStore = None):
+        self.__factory = registry
+        self.__registry = _registry(registry)
+        self.__workers = workers
+        self.__debug = debug
+        self.__shared = tuple(shared)
+        self.__profiler = profiler
+        self.__store = store
+        self.__timings: dict[str, float] = {}
+        self.__processes: dict[str, str] = {}
+        self.__cached: list[str] = []
+
+    @property
+    def registry(self):
+        return self.__registry
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @property
+    def shared(self):
+        return self.__shared
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def cached(self):
+        return self.__cached
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    def groups(self, names: Iterable[str]) -> list[list[str]]:
+        """
+        Splits the given analyses into groups that share no requirement but the shared nodes, directly or not.
+        Unknown names are ignored, as config.json has keys without an analysis behind them.
+
+                Returns:
+                        groups (list[list[str]]): analyses of every group, in registration order
+        """
+        needed = self.__registry.dependencies(names)
+        parent = {name: name for name in needed}
+
+        def root(name):
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for name in needed:
+            for required in self.__registry.node(name).requires:
+                if name not in self.__shared and required not in self.__shared:
+                    parent[root(name)] = root(required)
+
+        groups = {}
+        for name in self.__registry.analysis_names:
+            if name in parent:
+                groups.setdefault(root(name), []).append(name)
+
+        return list(groups.values())
+
+    def run(self, match, names: Iterable[str]) -> dict:
+        """
+        Runs the given analyses and everything they require.
+
+                Parameters:
+                        match (Match): match given to every node
+                        names (Iterable[str]): analyses to run, unknown names are ignored
+
+                Returns:
+                        results (dict): node name to its result, None for failed or skipped nodes
+        """
+        self.__timings = {}
+        self.__processes = {}
+        self.__cached = []
+        results = {}
+
+        loader = None
+        if self.__store is not None:
+            loader = AnalysisScheduler(self.__registry, workers=1, debug=self.__debug, profiler=self.__profiler,
+                                       store=self.__store)
+            left = loader.load(match, self.__registry.dependencies(names), results)
+            self.__cached = loader.cached
+            names = [name for name in left if not self.__registry.node(name).evaluator]
+
+        groups = self.groups(names)
+        if not groups:
+            return results
+
+        profile = None
+        if self.__profiler is not None:
+            profile = {'memory': self.__profiler.memory, 'cprofile_dir': self.__profiler.cprofile_dir}
+
+        # only the columns the analyses read, along with the ones Match itself is built from
+        columns = dict.fromkeys(Mediator.match_columns(match.category))
+        columns.update(dict.fromkeys(self.__registry.columns([name for group in groups for name in group], match.category)))
+
+        with SharedMatch(match, list(columns)) as shared:
+            with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+                futures = [executor.submit(run_group, shared.descriptor, self.__factory, group, self.__debug, profile)
+                           for group in groups]
+
+                for future in as_completed(futures):
+                    # a failing analysis is raised here when debug is set, as in the worker
+                    group_results, timings, records, process = future.result()
+
+                    for name, data in group_results.items():
+                        # analyses loaded from the store are kept, even if a group ran them again as a requirement
+                        if name in results:
+                            continue
+                        results[name] = ResultStore.loads(data, match) if data is not None else None
+                        self.__processes[name] = process
+                        self.__save(match, loader, name, results[name])
+                    self.__timings.update(timings)
+
+                    if records is not None:
+                        self.__profiler.merge(*records, process)
+
+        return results
+
+    def __save(self, match, loader: AnalysisScheduler, name: str, result):
+        node = self.__registry.node(name)
+        if loader is None or result is None or node.evaluator:
+            return
+        self.__store.save(loader.keys[name], result, match, name, node.version, node.parameters, match.fingerprint())
@@ -0,0 +1,429 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from graphlib import CycleError, TopologicalSorter
+from threading import current_thread
+from time import perf_counter
+from typing import Callable, Iterable
+
+from socceranalyzer.common.io.result_store import ResultStore
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.profiler import Profiler
+
+
+class AnalysisNode:
+    """
+        An analysis or shared evaluator registered in an AnalysisRegistry, along with what it needs to run.
+
+        AnalysisNode(name: str, build: Callable, requires: tuple[str] = (), columns: Callable = None, evaluator: bool = False,
+                     version: int = 1, parameters: dict = None)
+
+        build is called as build(match, inputs, debug), where inputs maps the name of every required node to
+        its result, and returns the analysis object.
+
+        Attributes
+        ----------
+            public through @properties:
+                name: str
+                    key of the node in the registry, the config.json analysis key for analyses
+                build: Callable
+                    creates and runs the analysis
+                requires: tuple[str]
+                    names of the analyses and evaluators it reads
+                evaluator: bool
+                    True for shared inputs, e.g. MatchFrame or Passing, that are not enabled on their own
+                version: int
+                    bumped whenever the results of the node change, so stored results are not reused
+                parameters: dict
+                    arguments the node is built with, part of the key of its stored results
+
+        Methods
+        -------
+            public:
+                columns(category) -> list[str]
+                    dataframe columns the node itself reads
+    """
+    def __init__(self, name: str, build: Callable, requires: tuple[str] = (), columns: Callable = None, evaluator: bool = False,
+                 version: int = 1, parameters: dict = None):
+        self.__name = name
+        self.__build = build
+        self.__requires = tuple(requires)
+        self.__columns = columns
+        self.__evaluator = evaluator
+        self.__version = version
+        self.__parameters = parameters or {}
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def build(self):
+        return self.__build
+
+    @property
+    def requires(self):
+        return self.__requires
+
+    @property
+    def evaluator(self):
+        return self.__evaluator
+
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def parameters(self):
+        return self.__parameters
+
+    def columns(self, category) -> list[str]:
+        """
+            Returns the dataframe columns the node itself reads, without the ones of its requirements.
+        """
+        return self.__columns(category) if self.__columns is not None else []
+
+
+class AnalysisRegistry:
+    """
+        Set of analyses and evaluators of a category, each one declaring the nodes it depends on.
+
+        AnalysisRegistry()
+
+        Attributes
+        ----------
+            public through @properties:
+                names: list[str]
+                    every registered node, in registration order
+                analysis_names: list[str]
+                    registered analyses, leaving the evaluators out
+                versions: dict[str, int]
+                    current version of every node
+
+        Methods
+        -------
+            public:
+                register(name, build, requires, columns, evaluator, version, parameters) -> AnalysisNode
+                    adds a node to the registry
+                node(name: str) -> AnalysisNode
+                    returns a registered node
+                dependencies(names: Iterable[str]) -> list[str]
+                    the given nodes and everything they need, in registration order
+                columns(names: Iterable[str], category) -> list[str]
+                    union of the columns read by the given nodes and their dependencies
+    """
+    def __init__(self):
+        self.__nodes: dict[str, AnalysisNode] = {}
+
+    def __contains__(self, name):
+        return name in self.__nodes
+
+    @property
+    def names(self):
+        return list(self.__nodes)
+
+    @property
+    def analysis_names(self):
+        return [name for name, node in self.__nodes.items() if not node.evaluator]
+
+    @property
+    def versions(self):
+        return {name: node.version for name, node in self.__nodes.items()}
+
+    def register(self, name: str, build: Callable, requires: tuple[str] = (), columns: Callable = None, evaluator: bool = False,
+                 version: int = 1, parameters: dict = None) -> AnalysisNode:
+        """
+        Adds a node to the registry. Its requirements must already be registered.
+
+                Parameters:
+                        name (str): key of the node
+                        build (Callable): build(match, inputs, debug) returning the analysis
+                        requires (tuple[str]): names of the nodes whose results are given in inputs
+                        columns (Callable): columns(category) of the analysis class, if it reads the dataframe
+                        evaluator (bool): whether the node is a shared input rather than an analysis
+                        version (int): bumped whenever the results of the node change
+                        parameters (dict): arguments the node is built with, json serializable
+
+                Returns:
+                        node (AnalysisNode): the registered node
+        """
+        if name in self.__nodes:
+            raise ValueError(f'{name} is already registered')
+
+        missing = [required for required in requires if required not in self.__nodes]
+        if missing:
+            raise ValueError(f'{name} requires {", ".join(missing)}, which are not registered')
+
+        self.__nodes[name] = AnalysisNode(name, build, requires, columns, evaluator, version, parameters)
+        return self.__nodes[name]
+
+    def node(self, name: str) -> AnalysisNode:
+        return self.__nodes[name]
+
+    def dependencies(self, names: Iterable[str]) -> list[str]:
+        """
+        Returns the given nodes and every node they need, directly or not, in registration order.
+        Unknown names are ignored, as config.json has keys without an analysis behind them.
+        """
+        needed = set()
+        pending = [name for name in names if name in self.__nodes]
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.__nodes[name].requires)
+
+        return [name for name in self.__nodes if name in needed]
+
+    def columns(self, names: Iterable[str], category) -> list[str]:
+        """
+        Returns the union of the columns read by the given nodes and their dependencies, in a stable order.
+        """
+        columns = {}
+        for name in self.dependencies(names):
+            columns.update(dict.fromkeys(self.__nodes[name].columns(category)))
+
+        return list(columns)
+
+
+class AnalysisScheduler:
+    """
+        Runs a set of analyses from an AnalysisRegistry in dependency order.
+        Every evaluator is built once and shared by the analyses requiring it, and nodes whose
+        requirements are done run concurrently in a thread pool.
+
+        AnalysisScheduler(registry: AnalysisRegistry, workers: int = None, debug: bool = False, profiler: Profiler = None,
+                          store: ResultStore = None)
+
+        The heavy work of the analyses is numpy and pandas code that releases the GIL, so threads overlap
+        it without copying the dataframe into other processes. With workers=1 every node runs in the caller
+        thread, one after the other, which is also the case when the profiler measures memory or cProfile.
+        Every node run is recorded in the profiler, if one is given.
+
+        With a store, analyses whose data, version, parameters and requirements did not change since they
+        were stored are loaded instead of run, and evaluators only required by them are not built at all.
+        Analyses that run are stored afterwards. Evaluators are never stored.
+
+        A failing node is reported and the nodes requiring it are skipped, unless debug is set, in which
+        case the error is raised once the running nodes are done.
+
+        Attributes
+        ----------
+            public through @properties:
+                registry: AnalysisRegistry
+                    nodes available to run
+                workers: int
+                    size of the thread pool, None for the ThreadPoolExecutor default
+                profiler: Profiler
+                    records every node run, None to skip profiling
+                store: ResultStore
+                    computed analyses of previous runs, None to always run them
+                cached: list[str]
+                    analyses of the last run that were loaded from the store
+                keys: dict[str, str]
+                    store key of every node of the last run, empty without a store
+                timings: dict[str, float]
+                    wall time in seconds of every node of the last run, in completion order
+                threads: dict[str, str]
+                    name of the thread every node of the last run ran in
+
+        Methods
+        -------
+            public:
+                run(match: Match, names: Iterable[str]) -> dict
+                    runs the given analyses and their dependencies, returning the result of every node
+                load(match: Match, needed: list[str], results: dict) -> list[str]
+                    loads the stored analyses and returns the nodes left to run
+    """
+    def __init__(self, registry: AnalysisRegistry, workers: int = None, debug: bool = False, profiler: Profiler = None,
+                 store: ResultStore = None):
+        self.__registry = registry
+        self.__workers = 1 if profiler is not None and profiler.serial else workers
+        self.__profiler = profiler
+        self.__store = store
+        self.__debug = debug
+        self.__timings: dict[str, float] = {}
+        self.__threads: dict[str, str] = {}
+        self.__keys: dict[str, str] = {}
+        self.__cached: list[str] = []
+
+    @property
+    def registry(self):
+        return self.__registry
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def threads(self):
+        return self.__threads
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def cached(self):
+        return self.__cached
+
+    @property
+    def keys(self):
+        return self.__keys
+
+    def run(self, match, names: Iterable[str]) -> dict:
+        """
+        Runs the given analyses and everything they require.
+
+                Parameters:
+                        match (Match): match given to every node
+                        names (Iterable[str]): analyses to run, unknown names are ignored
+
+                Returns:
+                        results (dict): node name to its result, None for failed or skipped nodes
+        """
+        needed = self.__registry.dependencies(names)
+        self.__timings = {}
+        self.__threads = {}
+        self.__keys = {}
+        self.__cached = []
+        results = {}
+        failed = set()
+
+        if self.__store is not None:
+            needed = self.load(match, needed, results)
+
+        graph = TopologicalSorter({name: [required for required in self.__registry.node(name).requires if required in needed]
+                                   for name in needed})
+        try:
+            graph.prepare()
+        except CycleError as err:
+            raise ValueError(f'analysis dependencies have a cycle: {" -> ".join(err.args[1])}')
+
+        if self.__workers == 1:
+            while graph.is_active():
+                for name in graph.get_ready():
+                    self.__finish(match, name, self.__start(match, name, results, failed), results, failed)
+                    graph.done(name)
+            return results
+
+        error = None
+        with ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix='analysis') as executor:
+            running = {}
+            while graph.is_active():
+                for name in graph.get_ready():
+                    if error is None:
+                        running[executor.submit(self.__start, match, name, results, failed)] = name
+                    else:
+                        graph.done(name)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.__finish(match, name, future.result(), results, failed)
+                    except Exception as err:
+                        error = error or err
+                    graph.done(name)
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def load(self, match, needed: list[str], results: dict) -> list[str]:
+        """
+        Loads the stored analyses into results and returns the nodes left to run: the analyses missing
+        from the store and the nodes they require. Requires a store.
+
+                Parameters:
+                        match (Match): match the analyses are bound to
+                        needed (list[str]): nodes to run, with every node they require
+                        results (dict): node name to its result, filled with the loaded analyses
+
+                Returns:
+                        left (list[str]): nodes still to run, in registration order
+        """
+        self.__keys = {}
+        self.__cached = []
+        for name in needed:
+            node = self.__registry.node(name)
+            self.__keys[name] = ResultStore.key(match.fingerprint(node.columns(match.category)), name, node.version,
+                                                node.parameters, [self.__keys[required] for required in node.requires])
+
+        for name in needed:
+            if self.__registry.node(name).evaluator:
+                continue
+
+            record = self.__profiler.record(name, len(match.dataframe), 'cached') if self.__profiler is not None else nullcontext()
+            with record:
+                analysis = self.__store.load(self.__keys[name], match)
+            if analysis is not None:
+                results[name] = analysis
+                self.__cached.append(name)
+
+        if self.__cached:
+            Logger.info(f"Loaded {', '.join(self.__cached)} from the result store.")
+
+        # walk the requirements of the missing analyses, stopping at the loaded ones
+        pending = [name for name in needed if name not in results and not self.__registry.node(name).evaluator]
+        left = set()
+        while pending:
+            name = pending.pop()
+            if name not in left and name not in results:
+                left.add(name)
+                pending.extend(self.__registry.node(name).requires)
+
+        return [name for name in needed if name in left]
+
+    def __start(self, match, name: str, results: dict, failed: set):
+        """
+        Builds a node from the results of its requirements, in the thread it was scheduled to.
+        Returns the analysis, or the exception it raised, so the caller decides how to report it.
+        """
+        node = self.__registry.node(name)
+        if failed.intersection(node.requires):
+            return None
+
+        if self.__profiler is not None:
+            record = self.__profiler.record(name, len(match.dataframe), 'evaluator' if node.evaluator else 'analysis')
+        else:
+            record = nullcontext()
+
+        begin = perf_counter()
+        try:
+            with record:
+                result = node.build(match, {required: results[required] for required in node.requires}, self.__debug)
+        except Exception as err:
+            result = err
+
+        self.__timings[name] = perf_counter() - begin
+        self.__threads[name] = current_thread().name
+        return result
+
+    def __finish(self, match, name: str, result, results: dict, failed: set):
+        node = self.__registry.node(name)
+        if result is None and failed.intersection(node.requires):
+            Logger.warn(f"Skipped {name}, as {', '.join(sorted(failed.intersection(node.requires)))} failed.")
+            failed.add(name)
+            results[name] = None
+        elif isinstance(result, Exception):
+            Logger.error(f"{name} failed: {result}")
+            failed.add(name)
+            results[name] = None
+            if self.__debug:
+                raise result
+        else:
+            results[name] = result
+            if self.__store is not None and not node.evaluator:
+                self.__store.save(self.__keys[name], result, match, name, node.version, node.parameters, match.fingerprint())
@@ -0,0 +1,150 @@
+from time import perf_counter
+from typing import Iterable
+
+import pandas as pd
+
+from socceranalyzer.common.analysis.ball_possession import BallPossession
+from socceranalyzer.common.analysis.corners_occurrencies import CornersOcurrencies
+from socceranalyzer.common.analysis.foul_charge import FoulCharge
+from socceranalyzer.common.analysis.playmodes import Playmodes
+from socceranalyzer.common.analysis.shooting import Shooting
+from socceranalyzer.common.enums.sim2d import SIM2D
+from socceranalyzer.utils.logger import Logger
+from socceranalyzer.utils.run_configuration import RunConfiguration
+
+
+class StreamingMatchAnalyzer:
+    """
+        Incremental counterpart of MatchAnalyzer for matches that are still being played.
+        Cycles are pushed in chunks and every enabled analysis updates its state with the new
+        rows only, so the cost of a chunk does not grow with the match history.
+
+        StreamingMatchAnalyzer(category: SIM2D, run_config: RunConfiguration = None, debug: bool = False)
+
+        The first chunk builds the analyses as MatchAnalyzer would, the following ones go through
+        their update() method. Chunks are reindexed to continue the index of the previous ones.
+
+        Attributes
+        ----------
+            public through @properties:
+                category: Enum
+                    match category, only SIM2D is supported
+                config: RunConfiguration
+                    enabled analysis, every streaming analysis when none is given
+                cycles: int
+                    rows received so far
+                ball_possession: BallPossession
+                foul_charge: FoulCharge
+                playmodes: Playmodes
+                corners: CornersOcurrencies
+                shooting: Shooting
+                    current state of each analysis, None while disabled or before the first chunk
+
+        Methods
+        -------
+            public:
+                update(chunk: pandas.DataFrame) -> None
+                    feeds a chunk of new cycles to every enabled analysis
+                consume(feed: Iterable[pandas.DataFrame]) -> None
+                    updates with every chunk of a feed until it ends
+                results() -> dict
+                    snapshot of the current results of every enabled analysis
+    """
+    STREAMING_ANALYSIS = {
+        'ball_possession': BallPossession,
+        'foul_charge': FoulCharge,
+        'playmodes': Playmodes,
+        'corners_occurrencies': CornersOcurrencies,
+        'shooting': Shooting,
+    }
+
+    def __init__(self, category=SIM2D, run_config: RunConfiguration = None, debug: bool = False):
+        if category is not SIM2D:
+            raise NotImplementedError(f'StreamingMatchAnalyzer does not support {category} matches.')
+
+        self.__category = category
+        self.__run_configuration = run_config
+        self.__debug = debug
+        self.__cycles = 0
+
+        enabled = run_config.enabled_analysis() if run_config is not None else self.STREAMING_ANALYSIS
+        self.__analysis = {name: None for name in self.STREAMING_ANALYSIS if name in enabled}
+
+    @property
+    def category(self):
+        return self.__category
+
+    @property
+    def config(self):
+        return self.__run_configuration
+
+    @property
+    def cycles(self):
+        return self.__cycles
+
+    @property
+    def ball_possession(self):
+        return self.__analysis.get('ball_possession')
+
+    @property
+    def foul_charge(self):
+        return self.__analysis.get('foul_charge')
+
+    @property
+    def playmodes(self):
+        return self.__analysis.get('playmodes')
+
+    @property
+    def corners(self):
+        return self.__analysis.get('corners_occurrencies')
+
+    @property
+    def shooting(self):
+        return self.__analysis.get('shooting')
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Feeds a chunk of new cycles to every enabled analysis.
+
+                Parameters:
+                        chunk (pandas.DataFrame): new rows of the match log, in the SIM2D csv schema
+        """
+        if chunk.empty:
+            return
+
+        chunk = chunk.set_axis(pd.RangeIndex(self.__cycles, self.__cycles + len(chunk)))
+
+        for name, analysis in self.__analysis.items():
+            if analysis is None:
+                self.__analysis[name] = self.STREAMING_ANALYSIS[name](chunk, self.__category, self.__debug)
+                continue
+
+            try:
+                analysis.update(chunk)
+            except Exception as err:
+                Logger.error(f"{type(analysis).__name__} update failed: {err}")
+                if self.__debug:
+                    raise
+
+        self.__cycles += len(chunk)
+
+    def consume(self, feed: Iterable[pd.DataFrame]):
+        """
+        Updates with every chunk of a feed, e.g. socceranalyzer.common.io.stream.tail_csv, until it ends.
+
+                Parameters:
+                        feed (Iterable[pandas.DataFrame]): chunks of new cycles
+        """
+        for chunk in feed:
+            begin = perf_counter()
+            self.update(chunk)
+            Logger.info(f"Analyzed cycles up to {self.__cycles} in {perf_counter() - begin:.3f} seconds.")
+
+    def results(self) -> dict:
+        """
+        Returns a snapshot of the current results of every enabled analysis.
+
+                Returns:
+                        results (dict): analysis name to its results()
+        """
+        return {name: analysis.results() for name, analysis in self.__analysis.items() if analysis is not None}
@@ -18,25 +18,25 @@ class FilterSelfLocalizationCovariance():
             raise NotImplementedError
 
 
-    def filter(self):
-        """Filter the dataframe to only contain the player of interest"""
-        # Return dataframe with all columns prefixed with the player
+    def mask(self) -> pd.Series:
+        """Rows where the standard deviation of the x, y or theta is too high, so the localization is discarded"""
         if self.category is HLKid:
-            # Filter out all rows where the standard deviation of the x, y and theta is too high
             x_sdev = self.df[f"{self.localization_prefix}.covariance.0"]
             y_sdev = self.df[f"{self.localization_prefix}.covariance.4"]
             theta_sdev = self.df[f"{self.localization_prefix}.covariance.8"]
 
-            # Set self localization x, y, z to not a number if the standard deviation is too high for any dimension
-            localization_covariance_is_too_bad = (x_sdev > self.x_sdev_threshold) | (y_sdev > self.y_sdev_threshold) | (theta_sdev > self.theta_sdev_threshold)
-            self.df.loc[localization_covariance_is_too_bad, f"{self.localization_prefix}.position.x"] = float('nan')
-            self.df.loc[localization_covariance_is_too_bad, f"{self.localization_prefix}.position.y"] = float('nan')
-            self.df.loc[localization_covariance_is_too_bad, f"{self.localization_prefix}.position.z"] = float('nan')
-
-            return self.df
+            return (x_sdev > self.x_sdev_threshold) | (y_sdev > self.y_sdev_threshold) | (theta_sdev > self.theta_sdev_threshold)
         else:
             raise NotImplementedError
 
+    def filter(self):
+        """Filter the dataframe to only contain the player of interest"""
+        # Set self localization x, y, z to not a number if the standard deviation is too high for any dimension
+        localization_covariance_is_too_bad = self.mask()
+        # a new frame with masked positions, as the log may be backed by read-only memory-mapped buffers
+        positions = [f"{self.localization_prefix}.position.{axis}" for axis in "xyz"]
+        return self.df.assign(**{column: self.df[column].mask(localization_covariance_is_too_bad) for column in positions})
+
 
 class FilterBallCovariance():
     def __init__(self, df: pd.DataFrame, category, localization_prefix: str, x_sdev_threshold=0.5, y_sdev_threshold=0.5):
@@ -50,20 +50,20 @@ class FilterBallCovariance():
             raise NotImplementedError
 
 
-    def filter(self):
-        """Filter the dataframe to only contain the player of interest"""
-        # Return dataframe with all columns prefixed with the player
+    def mask(self) -> pd.Series:
+        """Rows where the standard deviation of the x or y is too high, so the ball detection is discarded"""
         if self.category is HLKid:
-            # Filter out all rows where the standard deviation of the x, y and theta is too high
             x_sdev = self.df[f"{self.localization_prefix}.covariance.0"]
             y_sdev = self.df[f"{self.localization_prefix}.covariance.4"]
 
-            # Set ball detection x, y, z to not a number if the standard deviation is too high for any dimension
-            ball_covariance_is_too_bad = (x_sdev > self.x_sdev_threshold) | (y_sdev > self.y_sdev_threshold)
-            self.df.loc[ball_covariance_is_too_bad, f"{self.localization_prefix}.position.x"] = float('nan')
-            self.df.loc[ball_covariance_is_too_bad, f"{self.localization_prefix}.position.y"] = float('nan')
-            self.df.loc[ball_covariance_is_too_bad, f"{self.localization_prefix}.position.z"] = float('nan')
-
-            return self.df
+            return (x_sdev > self.x_sdev_threshold) | (y_sdev > self.y_sdev_threshold)
         else:
             raise NotImplementedError
+
+    def filter(self):
+        """Filter the dataframe to only contain the player of interest"""
+        # Set ball detection x, y, z to not a number if the standard deviation is too high for any dimension
+        ball_covariance_is_too_bad = self.mask()
+        # a new frame with masked positions, as the log may be backed by read-only memory-mapped buffers
+        positions = [f"{self.localization_prefix}.position.{axis}" for axis in "xyz"]
+        return self.df.assign(**{column: self.df[column].mask(ball_covariance_is_too_bad) for column in positions})
@@ -1,21 +1,72 @@
-def find_first_unique_event_ocurrences(dataframe, event): # probably inefficient ? O(n)
-    event_ocurrences_index = []
-    for i in range(len(dataframe)):
-        if(event in dataframe.iloc[i, 1] and event not in dataframe.iloc[i - 1, 1]):
-            event_ocurrences_index.append(i)
+import numpy as np
 
-    return event_ocurrences_index
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.common.enums.sim2d import SIM2D
 
-def find_last_unique_event_ocurrences(dataframe, event): # probably inefficient ? O(n)
-    event_ocurrences_index = []
-    for i in range(len(dataframe)):
-        if(event in dataframe.iloc[i, 1] and event not in dataframe.iloc[i - 1, 1]):
-            while dataframe.iloc[i, 1] == event:
-                i += 1
-                if dataframe.iloc[i, 1] != event:
-                    event_ocurrences_index.append(i)
+# one record per playmode event: side it favours or is charged to, row position, game time and ball position
+EVENT_DTYPE = np.dtype([('side', 'U1'), ('row', np.int64), ('cycle', np.int64), ('x', np.float64), ('y', np.float64)])
 
-    return event_ocurrences_index
+
+def event_records(side, rows, game_time, ball=None, offset: int = 0) -> np.ndarray:
+    """
+    Returns the EVENT_DTYPE structured array of the events at the given rows.
+
+            Parameters:
+                    side (str | np.ndarray): side of every event, or one side for all of them
+                    rows (np.ndarray): row positions of the events in game_time and ball
+                    game_time (np.ndarray): game time column
+                    ball (np.ndarray): (rows, 2) ball positions, NaN positions when None
+                    offset (int): added to the stored rows, for chunks of a longer log
+
+            Returns:
+                    events (np.ndarray): structured array ordered as rows
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    events = np.empty(len(rows), dtype=EVENT_DTYPE)
+    events['side'] = side
+    events['row'] = rows + offset
+    events['cycle'] = np.asarray(game_time)[rows]
+    events['x'] = ball[rows, 0] if ball is not None else np.nan
+    events['y'] = ball[rows, 1] if ball is not None else np.nan
+    return events
+
+
+def _playmode_index(dataframe, playmode_index):
+    if playmode_index is not None:
+        return playmode_index
+    return PlaymodeIndex(dataframe[str(SIM2D.PLAYMODE)])
+
+def find_first_unique_event_ocurrences(dataframe, event, playmode_index: PlaymodeIndex = None):
+    """
+    Returns the row positions where each occurrence of the event playmode starts.
+
+            Parameters:
+                    dataframe (pandas.DataFrame): match log
+                    event (str): playmode of interest
+                    playmode_index (PlaymodeIndex): index of the log, built from the playmode column when not given
+
+            Returns:
+                    event_ocurrences_index (list[int]): first row of every occurrence
+    """
+    starts, _ = _playmode_index(dataframe, playmode_index).segments(event)
+    return starts.tolist()
+
+def find_last_unique_event_ocurrences(dataframe, event, playmode_index: PlaymodeIndex = None):
+    """
+    Returns the row positions right after each occurrence of the event playmode ends.
+    An occurrence still going on at the end of the log is left out.
+
+            Parameters:
+                    dataframe (pandas.DataFrame): match log
+                    event (str): playmode of interest
+                    playmode_index (PlaymodeIndex): index of the log, built from the playmode column when not given
+
+            Returns:
+                    event_ocurrences_index (list[int]): first row after every occurrence
+    """
+    index = _playmode_index(dataframe, playmode_index)
+    _, ends = index.segments(event)
+    return ends[ends < index.rows].tolist()
 
 def find_unique_event_count(dataframe, event): # not working
     event_ocurrences_index = []
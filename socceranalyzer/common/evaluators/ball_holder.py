@@ -1,3 +1,4 @@
+import numpy as np
 import pandas
 
 from socceranalyzer.common.enums.sim2d import SIM2D
@@ -13,7 +14,7 @@ class BallHolderEvaluator:
     """
         Calculates which players are within a given ball area range.
         
-        BallHolderEvaluator(dataframe: pandas.DataFrame, category: enum)
+        BallHolderEvaluator(dataframe: pandas.DataFrame, category: enum, frame: MatchFrame = None)
 
         Attributes
         ----------
@@ -22,6 +23,8 @@ class BallHolderEvaluator:
                     the pandas object that contains the game data
                 category: enum
                     match's category (2D, SSL or VSS)
+                frame: MatchFrame
+                    optional columnar view of the same dataframe, whose SpatialIndex all_cycles queries when given
                 possible_players_l: [int]
                     a list of players objects from the left team inside the ball area radius
                 possible_player_r: [int]
@@ -34,13 +37,19 @@ class BallHolderEvaluator:
                     returns two lists containing left side players and right side players inside the
                     ball area range, respectively, along with a string "left" or "right", representing which team 
                     has the ball possession
+            public:
+                all_cycles(gkeeper: bool) -> np.ndarray, np.ndarray, np.ndarray
+                    returns, for every cycle of the dataframe, the side, unum and distance of the player
+                    closest to the ball, computed in a single vectorized pass
     """
-    def __init__(self, dataframe: pandas.DataFrame, category: SIM2D | SSL | VSS):
+    def __init__(self, dataframe: pandas.DataFrame, category: SIM2D | SSL | VSS, frame=None):
         self.__df = dataframe
         self.__category = category
+        self.__frame = frame
         self.__possible_players_l = []
         self.__possible_players_r = []
         self.__closer_to_ball_side = ""
+        self.__all_cycles = {}
         
     @property
     def dataframe(self):
@@ -49,6 +58,12 @@ class BallHolderEvaluator:
     @dataframe.setter
     def dataframe(self, new_df):
         self.__df = new_df
+        self.__frame = None
+        self.__all_cycles = {}
+
+    @property
+    def frame(self):
+        return self.__frame
     
     @property
     def category(self):
@@ -124,3 +139,49 @@ class BallHolderEvaluator:
         self.__closer_to_ball_side = possession_side
 
         return self.left_players, self.right_players, self.closer_to_ball
+
+    def all_cycles(self, gkeeper: bool = True):
+        """
+            Stacks every player position into a (cycles, players, 2) array and finds, for all cycles at once,
+            the player closest to the ball. Ties are broken as in at(): left before right, lower unum first.
+            Results are cached per gkeeper value.
+
+                Parameters:
+                        gkeeper (bool): Whether goalkeepers are taken into account
+
+                Returns:
+                        closest_side (np.ndarray[str]): "left" or "right" for each row of the dataframe
+                        closest_unum (np.ndarray[int]): unum of the closest player for each row
+                        closest_distance (np.ndarray[float]): distance from the closest player to the ball
+        """
+        if gkeeper in self.__all_cycles:
+            return self.__all_cycles[gkeeper]
+
+        if self.__frame is not None:
+            team, closest_unum, closest_distance = self.__frame.spatial_index.nearest(self.__frame.ball, gkeeper=gkeeper)
+            self.__all_cycles[gkeeper] = (np.where(team == 0, "left", "right"), closest_unum, closest_distance)
+            return self.__all_cycles[gkeeper]
+
+        players_left = Mediator.players_left_position(self.category, gkeeper).items
+        players_right = Mediator.players_right_position(self.category, gkeeper).items
+
+        # interleaved as l1, r1, l2, r2, ... so argmin keeps the same precedence as at()
+        players = [player for pair in zip(players_left, players_right) for player in pair]
+        x_columns = [player.x for player in players]
+        y_columns = [player.y for player in players]
+
+        positions = np.stack((self.__df[x_columns].to_numpy(dtype=float),
+                              self.__df[y_columns].to_numpy(dtype=float)), axis=-1)
+        ball = self.__df[[str(self.category.BALL_X), str(self.category.BALL_Y)]].to_numpy(dtype=float)
+
+        distances = np.hypot(positions[..., 0] - ball[:, None, 0], positions[..., 1] - ball[:, None, 1])
+        distances[np.isnan(distances)] = np.inf
+
+        closest = np.argmin(distances, axis=1)
+        closest_distance = distances[np.arange(len(distances)), closest]
+        closest_side = np.where(closest % 2 == 0, "left", "right")
+        closest_unum = closest // 2 + (1 if gkeeper else 2)
+
+        self.__all_cycles[gkeeper] = (closest_side, closest_unum, closest_distance)
+
+        return self.__all_cycles[gkeeper]
@@ -1,3 +1,8 @@
+import numpy as np
+
+from socceranalyzer.common.basic.match_frame import MatchFrame
+
+
 def kick(cycle, team, df, player_who_kicked=False):
     for player_num in range(1,12):
         if cycle != 0:
@@ -11,3 +16,35 @@ def kick(cycle, team, df, player_who_kicked=False):
     else:
         return False
 
+
+def kick_events(df, counters=("counting_kick",)):
+    """
+    Diffs every player counter column once and returns all increments sorted by cycle.
+    Players are checked in the order l1, r1, l2, r2, ..., so when several players register
+    an increment in the same row the first one follows that precedence.
+
+            Parameters:
+                    df (pandas.DataFrame | MatchFrame): SIM2D match log or its columnar view
+                    counters (tuple[str]): counter suffixes to watch, e.g. ("counting_kick", "counting_tackle")
+
+            Returns:
+                    rows (np.ndarray[int]): row positions (not index labels) of each increment
+                    sides (np.ndarray[str]): 'l' or 'r' for each increment
+                    unums (np.ndarray[int]): unum of the player that registered each increment
+    """
+    players = [(side, unum) for unum in range(1, 12) for side in ('l', 'r')]
+
+    changed = np.zeros((len(df), len(players)), dtype=bool)
+    for counter in counters:
+        if isinstance(df, MatchFrame):
+            # (N, team, player) -> (N, player, team) flattens to l1, r1, l2, r2, ...
+            counts = getattr(df, counter).transpose(0, 2, 1).reshape(len(df), -1)
+        else:
+            counts = df[[f'player_{side}{unum}_{counter}' for side, unum in players]].to_numpy()
+        changed[1:] |= counts[1:] > counts[:-1]
+
+    rows, columns = np.nonzero(changed)
+    sides = np.array([side for side, _ in players])[columns]
+    unums = np.array([unum for _, unum in players])[columns]
+
+    return rows, sides, unums
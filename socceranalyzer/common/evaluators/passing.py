@@ -1,20 +1,28 @@
 from typing import Any
+import numpy as np
 from pandas import DataFrame
-from socceranalyzer.common.chore.mediator import Mediator
+from socceranalyzer.common.basic.match_frame import MatchFrame
 from socceranalyzer.common.enums.sim2d import SIM2D
 from socceranalyzer.common.enums.ssl import SSL
 from socceranalyzer.common.enums.vss import VSS
-from socceranalyzer.common.evaluators.kick import kick
-from socceranalyzer.common.geometric.circle import Circle
-from socceranalyzer.common.geometric.point import Point
+from socceranalyzer.common.evaluators.kick import kick_events
 from socceranalyzer.utils.logger import Logger
+from socceranalyzer.common.chore.mediator import Mediator
+
+PLAYER_INFLUENCE_RADIUS = 0.7
+PASS_OUTCOMES = ('completed', 'dribble', 'out', 'intercepted', 'discarded', 'dropped', 'unresolved')
 
 
 class Passing:
     """
         Used to calculate the overall passing stats of the given match.
 
-        Passing(data_frame: pandas.DataFrame, category: SIM2D | SSL | VSS)
+        Passing(data_frame: pandas.DataFrame, category: SIM2D | SSL | VSS, debug, frame: MatchFrame = None)
+
+        Passes are followed as the original row loop did, so the stats do not change with the implementation.
+        The ball holder of a cycle is the first field player in l2, r2, l3, r3, ... order within
+        PLAYER_INFLUENCE_RADIUS of the ball, not the closest one BallHolderEvaluator gives, as the counts of
+        completed passes and interceptions depend on which player is taken when several are in range.
 
         Attributes
         ----------
@@ -37,6 +45,8 @@ class Passing:
                     Number of interceptions for the right team
                 ran_all_analysis: bool
                     Indicates if analysis is over
+                frame: MatchFrame
+                    Optional columnar view of the match, built from the dataframe when not given
             public through @properties:
                 category: SIM2D | SSL | VSS
                     Analyzed match category
@@ -46,18 +56,16 @@ class Passing:
                     Contains overall passing stats for left team
                 right_team_passing_stats: dict[str, Any]
                     Contains overall passing stats for right team
+                passes: pandas.DataFrame
+                    One row per detected pass with kicker, receiver, start/end cycle and outcome
 
         Methods
         -------
-            private:                
-                define_player_possession(cycle: int, player_left_position: Point, player_right_position: Point, player_who_possesses: Bool) -> str, int
-                    Defines the team that is in the radius of the ball in a particular cycle, if player_who_possesses = True, also returns the index of 
-                    the player who is in that area
             public:
                 run_passing_evaluation() -> None:
                     Computes all wrong and correct passes occurrences
     """
-    def __init__(self, data_frame: DataFrame, category: SIM2D | SSL | VSS, debug):
+    def __init__(self, data_frame: DataFrame, category: SIM2D | SSL | VSS, debug, frame=None):
         self.__left_team_passing_accuracy = 0
         self.__right_team_passing_accuracy = 0
         self.__left_team_total_passes = 0
@@ -68,15 +76,24 @@ class Passing:
         self.__right_team_interceptions = 0
         self.__category = category
         self.__current_game_log = data_frame
+        self.__frame = frame
         self.__ran_all_analysis = False
         if category is not SIM2D:
             raise NotImplementedError
 
+    @staticmethod
+    def columns(category) -> list[str]:
+        """
+            Returns the dataframe columns the pass evaluation reads, which PassingAccuracy and InterceptCounter
+            report as theirs.
+        """
+        return Mediator.match_columns(category) + [str(category.BALL_X), str(category.BALL_Y)] + Mediator.players_columns(category, ('x', 'y', 'counting_kick'))
+
     @property
     def category(self) -> SIM2D | VSS | SSL: return self.__category
     
     @property
-    def dataframe(self) -> DataFrame: return self.dataframe
+    def dataframe(self) -> DataFrame: return self.__current_game_log
 
     @property
     def left_team_passing_stats(self) -> dict[str, Any]:
@@ -116,36 +133,134 @@ class Passing:
             'interceptions': self.__right_team_interceptions
         }
 
-    def __define_player_possession(self, cycle, player_left_position: Point, player_right_position: Point, player_who_possesses=False):
-        player_influence_radius = 0.7
-
-        players_left = Mediator.players_left_position(self.category, False)
-        players_right = Mediator.players_right_position(self.category, False)
-        
-        ball_position = Point(self.__current_game_log.loc[cycle, str(self.category.BALL_X)], self.__current_game_log.loc[cycle, str(self.category.BALL_Y)])
-
-        ball_zone = Circle(player_influence_radius, ball_position)
-
-        # 10 players only because goalkeeper is not checked in this analysis
-        for i in range(0, 10):
-            player_left_position.x = self.__current_game_log.loc[cycle, players_left.items[i].x]
-            player_left_position.y = self.__current_game_log.loc[cycle, players_left.items[i].y]
-
-            if ball_zone.is_inside(player_left_position):
-                if player_who_possesses:
-                    return 'left', i+2
-                return 'left'
-            
-            player_right_position.x = self.__current_game_log.loc[cycle, players_right.items[i].x]
-            player_right_position.y = self.__current_game_log.loc[cycle, players_right.items[i].y]
-
-            if ball_zone.is_inside(player_right_position):
-                if player_who_possesses:
-                    return 'right', i+2
-                return 'right'
-        if player_who_possesses:
-            return None, -1
-        return None
+    @property
+    def passes(self) -> DataFrame:
+        """
+        Returns one row per detected pass.
+
+            Returns:
+                    DataFrame:
+                        kicker_side ('left' | 'right'): Team of the player who kicked,
+                        kicker (int): Unum of the player who kicked,
+                        receiver_side ('left' | 'right' | None): Team of the player who got the ball,
+                        receiver (int): Unum of the player who got the ball, -1 if nobody did,
+                        start_cycle (int): Dataframe index of the kick,
+                        end_cycle (int): Dataframe index where the pass was resolved, -1 if it never was,
+                        outcome (str): One of PASS_OUTCOMES.
+        """
+        self.run_passing_evaluation()
+        return self.__passes
+
+    @staticmethod
+    def __holders(frame: MatchFrame):
+        """
+        Finds, for every row, the first field player in l2, r2, l3, r3, ... order within the influence radius
+        of the ball, through the SpatialIndex of the frame.
+
+            Returns:
+                    holder_side (np.ndarray[object]): 'left', 'right' or None for each row
+                    holder_unum (np.ndarray[int]): unum of the holder, -1 if there is none
+        """
+        inside = frame.spatial_index.within(frame.ball, PLAYER_INFLUENCE_RADIUS)[:, :, 1:]
+        # (N, team, player) -> (N, player, team) flattens to l2, r2, l3, r3, ...
+        inside = inside.transpose(0, 2, 1).reshape(len(inside), len(MatchFrame.SIDES) * (MatchFrame.PLAYERS - 1))
+
+        has_holder = inside.any(axis=1)
+        first = np.argmax(inside, axis=1)
+
+        holder_side = np.where(has_holder, np.where(first % 2 == 0, 'left', 'right'), None)
+        holder_unum = np.where(has_holder, first // 2 + 2, -1)
+        return holder_side, holder_unum
+
+    @staticmethod
+    def __first_kickers(rows, sides, unums, n_rows):
+        """
+        Returns, for every row and each team, the lowest unum that kicked in that row, -1 if none did.
+        """
+        kickers = {}
+        for side in ('l', 'r'):
+            team = sides == side
+            kicker = np.full(n_rows, 12)
+            np.minimum.at(kicker, rows[team], unums[team])
+            kickers[side] = np.where(kicker < 12, kicker, -1)
+        return kickers
+
+    def __team_passes(self, playmode, holder_side, holder_unum, kickers):
+        """
+        Follows the passes of both teams as the row loop did, jumping from event to event instead of
+        visiting every row.
+
+        A single pass per team is pending at a time. A right pass is resolved at the first later row where
+        the ball goes out through kick_in_l or a field player holds the ball; a left pass is dropped when a
+        right pass is pending, and right kicks are ignored while a left pass is pending. A pass to the same
+        team is a dribble when the holder has the unum the loop compared against: the first left kicker of
+        the previous row for right passes and the first right kicker of the same row for left passes, as
+        both teams shared one kicker variable.
+
+            Returns:
+                    passes (list[tuple]): kicker_side, kicker, receiver_side, receiver, start row, end row or -1
+                                          and outcome of every pass
+        """
+        n_rows = len(playmode)
+        kick_in = {'l': playmode == 'kick_in_l', 'r': playmode == 'kick_in_r'}
+        has_holder = holder_unum >= 0
+        restart = {side: np.isin(playmode, [f'kick_off_{side}', str(getattr(self.category, f'FAULT_COMMITED_{side.upper()}'))])
+                   for side in ('l', 'r')}
+
+        kick_rows = np.flatnonzero((kickers['l'] >= 0) | (kickers['r'] >= 0))
+        left_kick_rows = np.flatnonzero(kickers['l'] >= 0)
+        stops = {'r': np.flatnonzero(kick_in['l'] | has_holder), 'l': np.flatnonzero(kick_in['r'] | has_holder)}
+
+        def next_row(rows, row):
+            position = np.searchsorted(rows, row)
+            return rows[position] if position < len(rows) else None
+
+        def resolve(side, kicker, start):
+            """
+            Resolves the pass kicked at start, returning its row and the row following it, None at the end.
+            """
+            team = 'left' if side == 'l' else 'right'
+            opponent = 'r' if side == 'l' else 'l'
+            end = next_row(stops[side], start + 1)
+            if end is None:
+                passes.append((team, kicker, None, -1, start, -1, 'unresolved'))
+                return None
+
+            if kick_in[opponent][end]:
+                passes.append((team, kicker, None, -1, start, end, 'out'))
+                return end
+
+            if holder_side[end] == team:
+                compared = kickers['r'][end] if side == 'l' else kickers['l'][end - 1]
+                outcome = 'dribble' if holder_unum[end] == compared else 'completed'
+            else:
+                outcome = 'discarded' if restart[opponent][end:end + 5].any() else 'intercepted'
+            passes.append((team, kicker, holder_side[end], holder_unum[end], start, end, outcome))
+            return end
+
+        passes = []
+        row = next_row(kick_rows, 0)
+        while row is not None:
+            if kickers['r'][row] >= 0:
+                end = resolve('r', kickers['r'][row], row)
+                last = n_rows if end is None else end
+
+                # left kicks while the right pass is pending are dropped on the following row
+                for dropped in left_kick_rows[np.searchsorted(left_kick_rows, row):np.searchsorted(left_kick_rows, last)]:
+                    passes.append(('left', kickers['l'][dropped], None, -1, dropped,
+                                   dropped + 1 if dropped + 1 < n_rows else -1, 'dropped'))
+
+                if end is None:
+                    break
+                # the row loop skipped left kicks of the row where a right pass went out
+                if not kick_in['l'][end] and kickers['l'][end] >= 0:
+                    end = resolve('l', kickers['l'][end], end)
+            else:
+                end = resolve('l', kickers['l'][row], row)
+
+            row = None if end is None else next_row(kick_rows, end + 1)
+
+        return passes
 
     def run_passing_evaluation(self):
         """
@@ -154,92 +269,39 @@ class Passing:
         if (self.__ran_all_analysis): return
 
         game_log = self.__current_game_log
+        index = game_log.index.to_numpy()
+        frame = self.__frame if self.__frame is not None else MatchFrame(game_log, self.category)
+        playmode = frame.playmodes[frame.playmode]
 
-        correct_passes_l = 0
-        wrong_passes_l = 0
-        intercepted_passes_l = 0
+        holder_side, holder_unum = self.__holders(frame)
+        kickers = self.__first_kickers(*kick_events(frame), len(game_log))
 
-        correct_passes_r = 0
-        wrong_passes_r = 0
-        intercepted_passes_r = 0
+        passes = DataFrame(self.__team_passes(playmode, holder_side, holder_unum, kickers),
+                           columns=['kicker_side', 'kicker', 'receiver_side', 'receiver', 'start_cycle', 'end_cycle', 'outcome'])
+        passes = passes.astype({'kicker': int, 'receiver': int, 'start_cycle': int, 'end_cycle': int})
+        passes['start_cycle'] = index[passes['start_cycle'].to_numpy()]
+        passes['end_cycle'] = np.append(index, -1)[passes['end_cycle'].to_numpy()]
 
-        pass_r = False
-        pass_l = False
+        self.__passes = passes.sort_values('start_cycle', kind='stable').reset_index(drop=True)
 
-        player_right_position = Point()
-        player_left_position = Point()
+        outcomes = self.__passes.groupby(['kicker_side', 'outcome']).size()
+        count = lambda team, outcome: int(outcomes.get((team, outcome), 0))
+
+        self.__left_team_completed_passes = count('left', 'completed')
+        self.__right_team_completed_passes = count('right', 'completed')
+
+        self.__left_team_interceptions = count('right', 'intercepted')
+        self.__right_team_interceptions = count('left', 'intercepted')
+
+        self.__left_team_total_passes = self.__left_team_completed_passes + count('left', 'out') + self.__right_team_interceptions
+        self.__right_team_total_passes = self.__right_team_completed_passes + count('right', 'out') + self.__left_team_interceptions
+
+        self.__left_team_passing_accuracy = self.__accuracy(self.__left_team_completed_passes, self.__left_team_total_passes)
+        self.__right_team_passing_accuracy = self.__accuracy(self.__right_team_completed_passes, self.__right_team_total_passes)
 
-        for current_cycle, row in game_log.iterrows():
-            #Right Passing
-            if not pass_r:
-                pass_r, player_who_kicked = kick(current_cycle, 'r', game_log, True) # Checks if a pass occurred
-            else:
-                pass_l = False
-                
-                if game_log[str(self.category.PLAYMODE)][current_cycle] == 'kick_in_l': # Ball out by right team
-                    pass_r  = False
-                    wrong_passes_r += 1
-                    continue
-                
-                possession, player_who_possesses = self.__define_player_possession(current_cycle, player_left_position, player_right_position, True) 
-                
-                if possession == 'right': #ball to the same team
-                    pass_r = False
-                    if player_who_kicked != player_who_possesses: # only counts if the pass is to another player
-                        correct_passes_r += 1
-                    
-
-                if possession == 'left': # enemy intercepted
-                    pass_r = False
-                    intercepted_passes_l += 1
-                    try:
-                        for l in range(5):
-                            if game_log[str(self.category.PLAYMODE)][current_cycle+l] in ['kick_off_l', str(self.category.FAULT_COMMITED_L)]:
-                                intercepted_passes_l -= 1
-                                break
-                    except: 
-                        pass                    
-            
-            # Left Passing
-            if not pass_l:
-                pass_l, player_who_kicked = kick(current_cycle, 'l', game_log, True) # Checks if a pass occurred
-            else:
-                pass_r = False
-                
-                if game_log[str(self.category.PLAYMODE)][current_cycle] == 'kick_in_r': # Ball out by left team
-                    pass_l  = False
-                    wrong_passes_l += 1
-                    continue
-
-                possession, player_who_possesses = self.__define_player_possession(current_cycle, player_left_position, player_right_position, True)
-                if possession == 'left': # ball to the same team
-                    pass_l = False
-                    if player_who_kicked != player_who_possesses: # only counts if the pass is to another player
-                        correct_passes_l += 1
-                    
-                
-                if possession == 'right': # enemy intercepted
-                    pass_l = False
-                    intercepted_passes_r += 1
-                    try:
-                        for l in range(5):
-                            if game_log[str(self.category.PLAYMODE)][current_cycle+l] in ['kick_off_r',  str(self.category.FAULT_COMMITED_R)]:
-                                intercepted_passes_r -= 1
-                                break
-                    except: 
-                        pass
-                
-        self.__left_team_total_passes = correct_passes_l + wrong_passes_l + intercepted_passes_r
-        self.__right_team_total_passes = correct_passes_r + wrong_passes_r + intercepted_passes_l
-        
-        self.__left_team_passing_accuracy = correct_passes_l/(self.__left_team_total_passes)
-        self.__right_team_passing_accuracy = correct_passes_r/(self.__right_team_total_passes)
-
-        self.__left_team_completed_passes = correct_passes_l
-        self.__right_team_completed_passes = correct_passes_r
-
-        self.__left_team_interceptions = intercepted_passes_l
-        self.__right_team_interceptions = intercepted_passes_r
         self.__ran_all_analysis = True
         Logger.success("Passing has results.")
-    
\ No newline at end of file
+
+    @staticmethod
+    def __accuracy(completed, total):
+        return completed / total if total else 0.0
@@ -1,2 +1,7 @@
 from socceranalyzer.common.io.reader import Reader
 from socceranalyzer.common.io.writer import Writer
+from socceranalyzer.common.io.cache import LogCache, read_log
+from socceranalyzer.common.io.rcg_parser import RcgParser, read_rcg
+from socceranalyzer.common.io.result_store import ResultStore
+from socceranalyzer.common.io.results_writer import ResultsWriter
+from socceranalyzer.common.io.hlkid_log import HLKidLog
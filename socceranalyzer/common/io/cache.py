@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.ipc
+
+from socceranalyzer.common.io.rcg_parser import read_rcg
+from socceranalyzer.utils.logger import Logger
+
+CATEGORICAL_COLUMNS = ('playmode', 'team_name_l', 'team_name_r')
+COORDINATE_SUFFIXES = ('_x', '_y', '_vx', '_vy')
+FEATHER_EXTENSIONS = ('.feather', '.arrow')
+RCG_EXTENSION = '.rcg'
+
+
+class LogCache:
+    """
+    Persistent on-disk cache of parsed match logs.
+
+    LogCache(cache_dir: str)
+
+    The first read of a CSV or .rcg log converts it to a typed Feather file stored in cache_dir, named after
+    the SHA-1 of the log content. Playmode and team name columns become categorical and coordinate
+    columns become float32. The Feather file is written uncompressed and later reads memory-map it instead
+    of parsing the CSV again.
+    Feather logs, as the HLKid ones, are read directly.
+
+    An index.json inside cache_dir maps each log path to its size, mtime and content hash, so a log
+    is only hashed again when it changes on disk.
+
+    As the cached log has other dtypes than the parsed one, Match.fingerprint differs between them, so
+    cached and uncached runs of the same log do not share ResultStore entries.
+
+    Attributes
+    ----------
+            public through @properties:
+                cache_dir: str
+                    folder where the converted logs are kept
+
+    Methods
+    -------
+            public:
+                read(path: str, columns: list[str] = None) -> pandas.DataFrame
+                    returns the log, converting and caching it on first read
+                path_for(path: str) -> str
+                    returns the cached file path of a log
+                clear() -> None
+                    removes every cached log
+    """
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str):
+        self.__cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.__index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self.__index = self.__load_index()
+
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    def __load_index(self):
+        try:
+            with open(self.__index_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def __save_index(self):
+        temporary = f'{self.__index_path}.{os.getpid()}'
+        with open(temporary, 'w') as file:
+            json.dump(self.__index, file, indent=2)
+        os.replace(temporary, self.__index_path)
+
+    @staticmethod
+    def __hash(path, block_size=1 << 20):
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(block_size), b''):
+                sha1.update(block)
+        return sha1.hexdigest()
+
+    def path_for(self, path: str) -> str:
+        """
+        Returns the cached file path of a log, hashing it only if it changed since the last read.
+
+                Parameters:
+                        path (str): path to the original log
+
+                Returns:
+                        cached_path (str): path to the Feather file inside cache_dir
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.__index.get(key)
+
+        if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+            entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': self.__hash(path)}
+
+            # other processes may have cached logs meanwhile, so merge with the index on disk
+            self.__index = self.__load_index()
+            self.__index[key] = entry
+            self.__save_index()
+
+        return os.path.join(self.__cache_dir, f"{entry['hash']}.feather")
+
+    def read(self, path: str, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Returns the log as a DataFrame, converting and caching it on first read.
+
+                Parameters:
+                        path (str): path to a CSV, .rcg or Feather log
+                        columns (list[str]): optional subset of columns to load
+
+                Returns:
+                        dataframe (pandas.DataFrame): the typed log
+        """
+        if path.endswith(FEATHER_EXTENSIONS):
+            return read_feather(path, columns)
+
+        cached_path = self.path_for(path)
+
+        if not os.path.exists(cached_path):
+            Logger.info(f"Caching {path}")
+            dataframe = compact(read_rcg(path) if path.endswith(RCG_EXTENSION) else pd.read_csv(path))
+
+            temporary = f'{cached_path}.{os.getpid()}'
+            # left uncompressed, so later reads map the file instead of decompressing it into new memory
+            dataframe.reset_index(drop=True).to_feather(temporary, compression='uncompressed')
+            os.replace(temporary, cached_path)
+
+            return dataframe if columns is None else dataframe[project(dataframe.columns, columns)]
+
+        return read_feather(cached_path, columns)
+
+    def clear(self):
+        """
+        Removes every cached log and the index.
+        """
+        for name in os.listdir(self.__cache_dir):
+            if name.endswith('.feather') or name == self.INDEX_FILE:
+                os.remove(os.path.join(self.__cache_dir, name))
+        self.__index = {}
+
+
+def compact(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts playmode and team name columns to categorical, with categories in order of first appearance,
+    and coordinate columns to float32.
+
+            Parameters:
+                    dataframe (pandas.DataFrame): SIM2D log as read from CSV
+
+            Returns:
+                    dataframe (pandas.DataFrame): the same log with compact dtypes
+    """
+    types = {}
+    for column, dtype in dataframe.dtypes.items():
+        if column in CATEGORICAL_COLUMNS:
+            # categories in order of first appearance, not sorted, so ties of value_counts() and the like keep
+            # the order of the uncached log
+            values = dataframe[column]
+            types[column] = pd.CategoricalDtype(values.dropna().unique())
+        elif column.endswith(COORDINATE_SUFFIXES) and np.issubdtype(dtype, np.floating):
+            types[column] = np.float32
+
+    return dataframe.astype(types)
+
+
+def project(available, columns):
+    """
+    Returns the requested columns that exist in the log, in the log's own column order.
+    Missing columns are skipped so optional ones, e.g. velocities, do not break loading.
+    """
+    requested = set(columns)
+    return [column for column in available if column in requested]
+
+
+def map_feather(path: str, columns: list[str] = None) -> pyarrow.Table:
+    """
+    Returns the Arrow table of a Feather file read through a memory map, with only the given columns
+    when they are given. The buffers of uncompressed files stay in the mapped file, so only the pages
+    actually read are loaded, while compressed files are decompressed into memory.
+    """
+    with pyarrow.ipc.open_file(pyarrow.memory_map(path)) as reader:
+        table = reader.read_all()
+
+    return table if columns is None else table.select(project(table.schema.names, columns))
+
+
+def read_feather(path: str, columns: list[str] = None) -> pd.DataFrame:
+    """
+    Reads a Feather file, loading only the given columns when they are given.
+    Every column gets its own block, so numeric columns without missing values are read-only views of
+    the Arrow buffers instead of being copied into consolidated blocks.
+    """
+    return map_feather(path, columns).to_pandas(split_blocks=True)
+
+
+def read_log(path: str, cache_dir: str = None, columns: list[str] = None) -> pd.DataFrame:
+    """
+    Reads a CSV, .rcg or Feather match log, going through a LogCache when cache_dir is given.
+
+            Parameters:
+                    path (str): path to the log
+                    cache_dir (str): optional cache folder
+                    columns (list[str]): optional subset of columns to load
+
+            Returns:
+                    dataframe (pandas.DataFrame): the match log
+    """
+    if cache_dir is not None:
+        return LogCache(cache_dir).read(path, columns)
+
+    if path.endswith(FEATHER_EXTENSIONS):
+        return read_feather(path, columns)
+
+    if path.endswith(RCG_EXTENSION):
+        dataframe = read_rcg(path)
+        return dataframe if columns is None else dataframe[project(dataframe.columns, columns)]
+
+    if columns is None:
+        return pd.read_csv(path)
+
+    requested = set(columns)
+    return pd.read_csv(path, usecols=lambda column: column in requested)
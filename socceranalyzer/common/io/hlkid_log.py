@@ -0,0 +1,132 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.feather
+
+from socceranalyzer.common.io.cache import map_feather
+
+# components that start the pose part of a column, e.g. ball.frame.pose.position.x
+POSE_COMPONENTS = ('position', 'rotation', 'orientation', 'covariance')
+ENTITY_PATTERN = re.compile(r'^(teams\.team\d+\.player\d+|teams\.team\d+|[^.]+)\.(.+)$')
+
+
+class HLKidLog:
+    """
+    Memory-mapped Humanoid League referee log, with its dotted columns grouped per robot.
+
+    HLKidLog(path: str, columns: list[str] = None)
+
+    The Feather log is read through a memory map and converted to a DataFrame with one block per column,
+    so numeric columns without missing values are read-only views of the file, and only the pages of the
+    columns an analysis reads are loaded. Logs written by write() are uncompressed, which keeps every
+    buffer in the file. Compressed logs are decompressed once, without a further copy into pandas.
+
+    Columns are grouped by the entity they belong to, a robot as teams.team1.player1, a team as
+    teams.team1 or the ball, and by the group inside it, e.g. base_link, team_comm.ball or robot_info,
+    so teams.team1.player1.team_comm.ball.covariance.0 is the field covariance.0 of the group
+    team_comm.ball of teams.team1.player1.
+
+    Attributes
+    ----------
+            public through @properties:
+                path: str
+                    path to the Feather log
+                table: pyarrow.Table
+                    log as read from the memory map
+                dataframe: pandas.DataFrame
+                    log backed by the Arrow buffers, given to Match
+                entities: dict[str, dict[str, list[str]]]
+                    entity to group to the columns of the group
+                players: list[str]
+                    every robot entity of the log
+
+    Methods
+    -------
+            public:
+                columns(entity: str, group: str) -> list[str]
+                    columns of a group
+                group(entity: str, group: str) -> numpy.ndarray
+                    one structured array holding the fields of a group
+                write(dataframe: pandas.DataFrame, path: str) -> None
+                    writes a log uncompressed, so it can be mapped without copies
+    """
+    def __init__(self, path: str, columns: list[str] = None):
+        self.__path = path
+        self.__table = map_feather(path, columns)
+        self.__dataframe: pd.DataFrame = None
+        self.__entities = self.__group(self.__table.schema.names)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def table(self):
+        return self.__table
+
+    @property
+    def dataframe(self):
+        if self.__dataframe is None:
+            self.__dataframe = self.__table.to_pandas(split_blocks=True)
+        return self.__dataframe
+
+    @property
+    def entities(self):
+        return self.__entities
+
+    @property
+    def players(self):
+        return [entity for entity in self.__entities if re.fullmatch(r'teams\.team\d+\.player\d+', entity)]
+
+    @staticmethod
+    def __group(names: list[str]) -> dict[str, dict[str, list[str]]]:
+        entities: dict[str, dict[str, list[str]]] = {}
+        for name in names:
+            match = ENTITY_PATTERN.match(name)
+            entity, parts = (match.group(1), match.group(2).split('.')) if match else ('', [name])
+
+            pose = next((i for i, part in enumerate(parts) if part in POSE_COMPONENTS), len(parts) - 1)
+            entities.setdefault(entity, {}).setdefault('.'.join(parts[:pose]), []).append(name)
+
+        return entities
+
+    def columns(self, entity: str, group: str) -> list[str]:
+        """
+        Returns the columns of a group, e.g. columns('teams.team1.player1', 'base_link').
+        """
+        return self.__entities[entity][group]
+
+    def group(self, entity: str, group: str) -> np.ndarray:
+        """
+        Returns the fields of a group as one structured array, e.g. group('ball', 'frame.pose')['position.x'].
+        Arrow keeps every column in its own buffer, so the fields are copied into the array. Only the columns
+        of the group are read from the file.
+
+                Parameters:
+                        entity (str): robot, team or ball, e.g. teams.team1.player1
+                        group (str): group inside the entity, e.g. team_comm.self_localization.pose
+
+                Returns:
+                        values (numpy.ndarray): one record per row, with a field per column named after its suffix
+        """
+        columns = self.columns(entity, group)
+        offset = len(entity) + len(group) + 2 if group else len(entity) + 1
+        fields = [(column[offset:], self.__table.schema.field(column).type.to_pandas_dtype()) for column in columns]
+
+        values = np.empty(self.__table.num_rows, dtype=fields)
+        for (field, dtype), column in zip(fields, columns):
+            chunked = self.__table.column(column)
+            if chunked.null_count and np.issubdtype(np.dtype(dtype), np.floating):
+                chunked = chunked.fill_null(np.nan)
+            values[field] = chunked.to_numpy()
+
+        return values
+
+    @staticmethod
+    def write(dataframe: pd.DataFrame, path: str):
+        """
+        Writes a log as an uncompressed Feather file, so HLKidLog maps it without decompressing it.
+        """
+        pyarrow.feather.write_feather(dataframe.reset_index(drop=True), path, compression='uncompressed')
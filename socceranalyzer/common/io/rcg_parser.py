@@ -0,0 +1,181 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from socceranalyzer.common.enums.sim2d import SIM2D
+
+SIDES = ('l', 'r')
+PLAYERS = 11
+
+PLAYER_FIELDS = ('x', 'y', 'vx', 'vy', 'body', 'neck',
+                 'attribute_stamina', 'attribute_effort', 'attribute_recovery', 'attribute_stamina_capacity',
+                 'counting_kick', 'counting_dash', 'counting_turn', 'counting_catch', 'counting_move',
+                 'counting_turn_neck', 'counting_change_view', 'counting_say', 'counting_tackle',
+                 'counting_point_to', 'counting_attention_to')
+BALL_FIELDS = ('ball_x', 'ball_y', 'ball_vx', 'ball_vy')
+
+SHOW = re.compile(r'\(show (\d+)')
+BALL = re.compile(r'\(\(b\) (\S+) (\S+) (\S+) (\S+)\)')
+PLAYER = re.compile(r'\(\(([lr]) (\d+)\) \S+ \S+ ([^(]*)\(v \S+ \S+\) \(s ([^)]*)\)(?: \(f [lr] \d+\))? \(c ([^)]*)\)\)')
+PLAYMODE = re.compile(r'\(playmode \d+ (\S+)\)')
+TEAM = re.compile(r'\(team \d+ (\S+) (\S+) (\d+) (\d+)')
+
+
+class RcgParser:
+    """
+    Streaming parser for rcssserver text game logs (.rcg, ULG5 and ULG6 headers).
+
+    RcgParser(path: str, capacity: int = 8192)
+
+    The log is read line by line and every show line is written straight into a preallocated
+    numpy array, doubled whenever it fills up, so no intermediate CSV is needed. The resulting
+    DataFrame follows the column schema of the SIM2D csv logs: show_time, playmode, team names
+    and scores, ball_* and player_{side}{unum}_* columns. Players missing from a show line are NaN.
+    JSON game logs are not supported.
+
+    Attributes
+    ----------
+            public through @properties:
+                path: str
+                    path to the .rcg file
+                version: int
+                    log version read from the header
+                columns: list[str]
+                    columns of the resulting DataFrame
+
+    Methods
+    -------
+            public:
+                parse() -> pandas.DataFrame
+                    reads the whole log and returns it in the SIM2D schema
+    """
+    SUPPORTED_VERSIONS = (5, 6)
+
+    def __init__(self, path: str, capacity: int = 8192):
+        self.__path = path
+        self.__capacity = capacity
+        self.__version = None
+
+        self.__numeric_columns = list(BALL_FIELDS) + [f'player_{side}{unum}_{field}'
+                                                      for side in SIDES
+                                                      for unum in range(1, PLAYERS + 1)
+                                                      for field in PLAYER_FIELDS]
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def columns(self):
+        return ([str(SIM2D.GAME_TIME), str(SIM2D.PLAYMODE), str(SIM2D.TEAM_LEFT), str(SIM2D.TEAM_RIGHT),
+                 str(SIM2D.TEAM_LEFT_SCORE), str(SIM2D.TEAM_RIGHT_SCORE)] + self.__numeric_columns)
+
+    def __read_header(self, file):
+        header = file.readline().strip()
+        if not header.startswith('ULG'):
+            raise ValueError(f'{self.__path} is not a text rcg log (header {header[:16]!r}), JSON logs are not supported')
+
+        self.__version = int(header[3:])
+        if self.__version not in self.SUPPORTED_VERSIONS:
+            raise ValueError(f'{self.__path} has unsupported rcg version {self.__version}')
+
+    def parse(self) -> pd.DataFrame:
+        """
+        Reads the whole log and returns one row per show line.
+
+                Returns:
+                        dataframe (pandas.DataFrame): log in the SIM2D csv schema
+        """
+        n_fields = len(PLAYER_FIELDS)
+        player_offset = len(BALL_FIELDS)
+
+        values = np.full((self.__capacity, len(self.__numeric_columns)), np.nan)
+        empty_row = ['nan'] * len(self.__numeric_columns)
+        # show_time, playmode code, team names code, score left, score right
+        state = np.zeros((self.__capacity, 5), dtype=np.int64)
+
+        playmodes = {}
+        teams = {}
+        playmode = playmodes.setdefault('before_kick_off', 0)
+        team = teams.setdefault(('', ''), 0)
+        score_l = score_r = 0
+        rows = 0
+
+        with open(self.__path) as file:
+            self.__read_header(file)
+
+            for line in file:
+                if line.startswith('(show'):
+                    if rows == len(values):
+                        values = np.concatenate((values, np.full_like(values, np.nan)))
+                        state = np.concatenate((state, np.zeros_like(state)))
+
+                    state[rows] = (int(SHOW.match(line).group(1)), playmode, team, score_l, score_r)
+
+                    # tokens are gathered as strings and converted by numpy in a single assignment
+                    row = empty_row.copy()
+
+                    ball = BALL.search(line)
+                    if ball:
+                        row[:player_offset] = ball.groups()
+
+                    for side, unum, kinematics, stamina, counters in PLAYER.findall(line):
+                        start = player_offset + (SIDES.index(side) * PLAYERS + int(unum) - 1) * n_fields
+                        # x y vx vy body neck, followed by the pointing target when the arm is up
+                        row[start:start + 6] = kinematics.split()[:6]
+                        row[start + 6:start + 10] = stamina.split()[:4]
+                        row[start + 10:start + n_fields] = counters.split()[:n_fields - 10]
+
+                    values[rows] = row
+                    rows += 1
+
+                elif line.startswith('(playmode'):
+                    playmode = playmodes.setdefault(PLAYMODE.match(line).group(1), len(playmodes))
+
+                elif line.startswith('(team'):
+                    name_l, name_r, score_l, score_r = TEAM.match(line).groups()
+                    team = teams.setdefault((name_l, name_r), len(teams))
+                    score_l, score_r = int(score_l), int(score_r)
+
+        return self.__build(values[:rows], state[:rows], playmodes, teams)
+
+    def __build(self, values, state, playmodes, teams):
+        playmode_names = np.array(list(playmodes), dtype=object)
+        team_names = np.array(list(teams), dtype=object).reshape(-1, 2)
+
+        dataframe = pd.DataFrame(values, columns=self.__numeric_columns)
+
+        # counters and stamina attributes are integers unless some player was missing
+        for column in dataframe.columns:
+            if '_counting_' in column or column.endswith('_attribute_stamina'):
+                if not dataframe[column].isna().any():
+                    dataframe[column] = dataframe[column].astype(np.int64)
+
+        header = pd.DataFrame({
+            str(SIM2D.GAME_TIME): state[:, 0],
+            str(SIM2D.PLAYMODE): playmode_names[state[:, 1]],
+            str(SIM2D.TEAM_LEFT): team_names[state[:, 2], 0],
+            str(SIM2D.TEAM_RIGHT): team_names[state[:, 2], 1],
+            str(SIM2D.TEAM_LEFT_SCORE): state[:, 3],
+            str(SIM2D.TEAM_RIGHT_SCORE): state[:, 4],
+        })
+
+        return pd.concat((header, dataframe), axis=1)
+
+
+def read_rcg(path: str) -> pd.DataFrame:
+    """
+    Parses an rcssserver text game log into a DataFrame with the SIM2D csv schema.
+
+            Parameters:
+                    path (str): path to the .rcg file
+
+            Returns:
+                    dataframe (pandas.DataFrame): one row per show line
+    """
+    return RcgParser(path).parse()
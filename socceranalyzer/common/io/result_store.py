@@ -0,0 +1,225 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+import sqlite3
+from time import time
+
+import pandas as pd
+
+from socceranalyzer.common.basic.match import Match
+from socceranalyzer.common.basic.match_frame import MatchFrame
+from socceranalyzer.common.basic.playmode_index import PlaymodeIndex
+from socceranalyzer.utils.logger import Logger
+
+
+class _AnalysisPickler(pickle.Pickler):
+    """
+    Pickles an analysis without the match it was computed on. The Match, its dataframe and the MatchFrame
+    and PlaymodeIndex derived from it are written as references, resolved against the match of the run
+    that loads the analysis.
+    """
+    def __init__(self, file, match: Match):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__match = match
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Match):
+            return 'match'
+        if isinstance(obj, pd.DataFrame) and obj is self.__match.dataframe:
+            return 'dataframe'
+        if isinstance(obj, MatchFrame):
+            return 'frame'
+        if isinstance(obj, PlaymodeIndex):
+            return 'playmode_index'
+        return None
+
+
+class _AnalysisUnpickler(pickle.Unpickler):
+    def __init__(self, file, match: Match):
+        super().__init__(file)
+        self.__match = match
+
+    def persistent_load(self, pid):
+        if pid == 'match':
+            return self.__match
+        if pid in ('dataframe', 'frame', 'playmode_index'):
+            return getattr(self.__match, pid)
+        raise pickle.UnpicklingError(f'unknown reference {pid}')
+
+
+class ResultStore:
+    """
+    SQLite store of computed analyses, so runs over unchanged data load them instead of computing them again.
+
+    ResultStore(path: str)
+
+    Entries are keyed by a hash of the content of the columns an analysis reads, its name, version and
+    parameters, and the keys of the analyses and evaluators it requires. Changing the data, bumping the
+    version of an analysis or of anything it depends on yields a new key, so stale entries are never loaded.
+    prune() removes the entries of versions no longer registered.
+
+    Analyses are pickled without the match: references to the Match, its dataframe, MatchFrame and
+    PlaymodeIndex are resolved against the match being analyzed when loaded.
+
+    Attributes
+    ----------
+            public through @properties:
+                path: str
+                    sqlite database file
+
+    Methods
+    -------
+            public:
+                key(fingerprint: str, name: str, version: int, parameters: dict, requirements: list[str]) -> str
+                    returns the key of an analysis computed on the given data
+                dumps(analysis, match: Match) -> bytes
+                    pickles an analysis without its match
+                loads(data: bytes, match: Match) -> object
+                    unpickles an analysis, bound to the given match
+                load(key: str, match: Match) -> object
+                    returns the stored analysis, None when there is no entry for the key
+                save(key, analysis, match, name, version, parameters, fingerprint) -> bool
+                    stores an analysis, returning whether it could be pickled
+                invalidate(name: str = None, fingerprint: str = None) -> int
+                    removes the entries of an analysis and/or data, every entry when both are None
+                prune(versions: dict[str, int]) -> int
+                    removes the entries whose version differs from the given ones
+                entries() -> pandas.DataFrame
+                    every entry, without the pickled analysis
+    """
+    def __init__(self, path: str):
+        self.__path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # BatchRunner workers share the store, so wait for each other's writes
+        self.__connection = sqlite3.connect(path, timeout=60)
+        with self.__connection:
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                                      'key TEXT PRIMARY KEY, name TEXT, version INTEGER, parameters TEXT, '
+                                      'fingerprint TEXT, created_at REAL, analysis BLOB)')
+
+    @property
+    def path(self):
+        return self.__path
+
+    def __len__(self):
+        return self.__connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    @staticmethod
+    def key(fingerprint: str, name: str, version: int, parameters: dict, requirements: list[str]) -> str:
+        """
+        Returns the key of an analysis computed on the data with the given fingerprint.
+
+                Parameters:
+                        fingerprint (str): Match.fingerprint of the columns the analysis reads
+                        name (str): analysis name, e.g. its config.json key
+                        version (int): analysis version, bumped whenever its results change
+                        parameters (dict): arguments the analysis is built with, json serializable
+                        requirements (list[str]): keys of the analyses and evaluators it requires
+
+                Returns:
+                        key (str): hexadecimal SHA-1 digest
+        """
+        content = json.dumps([fingerprint, name, version, parameters or {}, list(requirements)], sort_keys=True, default=str)
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    @staticmethod
+    def dumps(analysis, match: Match) -> bytes:
+        """
+        Pickles an analysis, writing the Match, its dataframe, MatchFrame and PlaymodeIndex as references,
+        so it can be stored or sent to another process holding the same match without copying the log.
+        """
+        buffer = io.BytesIO()
+        _AnalysisPickler(buffer, match).dump(analysis)
+        return buffer.getvalue()
+
+    @staticmethod
+    def loads(data: bytes, match: Match):
+        """
+        Unpickles an analysis written by dumps(), resolving its references against the given match.
+        """
+        return _AnalysisUnpickler(io.BytesIO(data), match).load()
+
+    def load(self, key: str, match: Match):
+        """
+        Returns the analysis stored under key, bound to the given match, or None when there is no entry.
+        Entries that cannot be unpickled anymore, e.g. after a class was renamed, are removed.
+        """
+        row = self.__connection.execute('SELECT analysis FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return self.loads(row[0], match)
+        except Exception as err:
+            Logger.warn(f"Discarded stored result {key}: {err}")
+            with self.__connection:
+                self.__connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            return None
+
+    def save(self, key: str, analysis, match: Match, name: str, version: int, parameters: dict = None, fingerprint: str = None) -> bool:
+        """
+        Stores an analysis under key. Analyses that cannot be pickled are reported and left out.
+
+                Returns:
+                        saved (bool): whether the analysis was stored
+        """
+        try:
+            data = self.dumps(analysis, match)
+        except Exception as err:
+            Logger.warn(f"{name} was not stored: {err}")
+            return False
+
+        with self.__connection:
+            self.__connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                      (key, name, version, json.dumps(parameters or {}, sort_keys=True, default=str),
+                                       fingerprint, time(), data))
+        return True
+
+    def invalidate(self, name: str = None, fingerprint: str = None) -> int:
+        """
+        Removes the entries of an analysis, of some data, or of both. Removes every entry when both are None.
+
+                Returns:
+                        removed (int): number of entries removed
+        """
+        conditions, values = [], []
+        if name is not None:
+            conditions.append('name = ?')
+            values.append(name)
+        if fingerprint is not None:
+            conditions.append('fingerprint = ?')
+            values.append(fingerprint)
+
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        with self.__connection:
+            return self.__connection.execute(f'DELETE FROM results{where}', values).rowcount
+
+    def prune(self, versions: dict[str, int]) -> int:
+        """
+        Removes the entries whose version differs from the current one of their analysis,
+        e.g. AnalysisRegistry.versions, which can never be loaded again.
+
+                Returns:
+                        removed (int): number of entries removed
+        """
+        removed = 0
+        with self.__connection:
+            for name, version in versions.items():
+                removed += self.__connection.execute('DELETE FROM results WHERE name = ? AND version != ?',
+                                                     (name, version)).rowcount
+        return removed
+
+    def entries(self) -> pd.DataFrame:
+        """
+        Returns every entry without the pickled analysis, with its size in bytes.
+        """
+        return pd.read_sql_query('SELECT key, name, version, parameters, fingerprint, created_at, '
+                                 'LENGTH(analysis) AS size FROM results ORDER BY created_at', self.__connection)
+
+    def close(self):
+        self.__connection.close()
@@ -0,0 +1,137 @@
+import os
+import re
+
+import pandas as pd
+import pyarrow
+import pyarrow.parquet
+
+MATCH_COLUMN = 'match'
+PART_EXTENSION = '.parquet'
+
+
+class ResultsWriter:
+    """
+    Parquet dataset of analysis results, one folder per table and one file per match.
+
+    ResultsWriter(path: str)
+
+    A bundle, as returned by MatchAnalyzer.collect_results(), maps table names such as 'shooting/shots'
+    to DataFrames. append() writes every table of a bundle to <path>/<table>/<match>.parquet, with a
+    leading match column, so BatchRunner workers append their own matches without going through the
+    parent process, and results are loaded in notebooks without running the analyses again.
+    Appending a match again replaces its previous tables.
+
+    Attributes
+    ----------
+            public through @properties:
+                path: str
+                    folder of the dataset
+                tables: list[str]
+                    tables present in the dataset
+                matches: list[str]
+                    matches present in the dataset
+
+    Methods
+    -------
+            public:
+                append(bundle: dict[str, pandas.DataFrame], match: str) -> list[str]
+                    writes every table of a bundle, returning the written files
+                read(table: str, matches: list[str] = None) -> pandas.DataFrame
+                    returns a table of every match, or of the given ones
+                bundle(match: str) -> dict[str, pandas.DataFrame]
+                    returns every table of a single match, as collect_results() did
+    """
+    def __init__(self, path: str):
+        self.__path = path
+        os.makedirs(path, exist_ok=True)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def tables(self):
+        tables = []
+        for directory, _, files in os.walk(self.__path):
+            if any(file.endswith(PART_EXTENSION) for file in files):
+                tables.append(os.path.relpath(directory, self.__path).replace(os.sep, '/'))
+        return sorted(tables)
+
+    @property
+    def matches(self):
+        matches = set()
+        for table in self.tables:
+            matches.update(self.__matches(table))
+        return sorted(matches)
+
+    @staticmethod
+    def part_name(match: str) -> str:
+        """
+        Returns the file name of the tables of a match, with characters other than letters, digits, '.', '-'
+        and '_' replaced, so any match identifier, e.g. a log name, is a valid file name.
+        """
+        return re.sub(r'[^\w.-]', '_', str(match)) + PART_EXTENSION
+
+    def __table_path(self, table: str) -> str:
+        return os.path.join(self.__path, *table.split('/'))
+
+    def __matches(self, table: str) -> list[str]:
+        return [file[:-len(PART_EXTENSION)] for file in sorted(os.listdir(self.__table_path(table)))
+                if file.endswith(PART_EXTENSION)]
+
+    def append(self, bundle: dict, match: str) -> list[str]:
+        """
+        Writes every table of a bundle under the given match.
+
+                Parameters:
+                        bundle (dict[str, pandas.DataFrame]): table name to its rows
+                        match (str): identifier of the match, e.g. its log name
+
+                Returns:
+                        files (list[str]): paths of the written files
+        """
+        files = []
+        for table, dataframe in bundle.items():
+            directory = self.__table_path(table)
+            os.makedirs(directory, exist_ok=True)
+
+            arrow_table = pyarrow.Table.from_pandas(dataframe, preserve_index=False)
+            arrow_table = arrow_table.add_column(0, MATCH_COLUMN, pyarrow.array([str(match)] * len(dataframe), pyarrow.string()))
+
+            # written aside and renamed, so readers never see a partial file
+            file = os.path.join(directory, self.part_name(match))
+            temporary = f'{file}.{os.getpid()}'
+            pyarrow.parquet.write_table(arrow_table, temporary)
+            os.replace(temporary, file)
+            files.append(file)
+
+        return files
+
+    def read(self, table: str, matches: list[str] = None) -> pd.DataFrame:
+        """
+        Returns a table of every match in the dataset, or only of the given ones. Columns missing from
+        the files of some matches, e.g. an analysis that gained a column, are filled with nulls.
+
+                Parameters:
+                        table (str): table name, e.g. 'shooting/shots'
+                        matches (list[str]): matches to read, every match when None
+
+                Returns:
+                        dataframe (pandas.DataFrame): rows of every match, with the match column first
+        """
+        directory = self.__table_path(table)
+        names = self.__matches(table) if matches is None else [self.part_name(match)[:-len(PART_EXTENSION)] for match in matches]
+
+        parts = [pyarrow.parquet.read_table(os.path.join(directory, name + PART_EXTENSION)) for name in names]
+        if not parts:
+            return pd.DataFrame()
+
+        return pyarrow.concat_tables(parts, promote_options='permissive').to_pandas()
+
+    def bundle(self, match: str) -> dict:
+        """
+        Returns every table of a single match, without the match column.
+        """
+        name = self.part_name(match)
+        return {table: pyarrow.parquet.read_table(os.path.join(self.__table_path(table), name)).drop_columns([MATCH_COLUMN]).to_pandas()
+                for table in self.tables if os.path.exists(os.path.join(self.__table_path(table), name))}
@@ -0,0 +1,89 @@
+import io
+import socket
+import time
+from typing import Iterator
+
+import pandas as pd
+
+
+def _to_dataframe(header: str, lines: list[str]) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(header + ''.join(lines)))
+
+
+def tail_csv(path: str, chunk_size: int = 100, poll_interval: float = 0.5, timeout: float = None) -> Iterator[pd.DataFrame]:
+    """
+    Follows a CSV log that is still being written and yields its new rows in chunks.
+
+            Parameters:
+                    path (str): CSV log, its first line must be the header
+                    chunk_size (int): rows per chunk, a smaller chunk is yielded when no new rows arrive
+                    poll_interval (float): seconds to wait before looking for new rows again
+                    timeout (float): seconds without new rows before the feed ends, None waits forever
+
+            Returns:
+                    chunks (Iterator[pandas.DataFrame]): new rows of the log
+    """
+    with open(path) as file:
+        header = ''
+        while not header.endswith('\n'):
+            header += file.readline()
+            if not header.endswith('\n'):
+                time.sleep(poll_interval)
+
+        lines = []
+        partial = ''
+        idle_since = time.monotonic()
+
+        while True:
+            line = file.readline()
+
+            if line:
+                partial += line
+                # a line without its newline is still being written
+                if not partial.endswith('\n'):
+                    continue
+
+                lines.append(partial)
+                partial = ''
+                idle_since = time.monotonic()
+
+                if len(lines) == chunk_size:
+                    yield _to_dataframe(header, lines)
+                    lines = []
+                continue
+
+            if lines:
+                yield _to_dataframe(header, lines)
+                lines = []
+
+            if timeout is not None and time.monotonic() - idle_since > timeout:
+                return
+
+            time.sleep(poll_interval)
+
+
+def socket_feed(host: str = 'localhost', port: int = 6000, chunk_size: int = 100) -> Iterator[pd.DataFrame]:
+    """
+    Reads CSV rows from a TCP socket, as a local stand-in for the monitor feed, and yields them in chunks.
+    The first line sent must be the CSV header. The feed ends when the sender closes the connection.
+
+            Parameters:
+                    host (str): address of the sender
+                    port (int): port of the sender
+                    chunk_size (int): rows per chunk, the last chunk may be smaller
+
+            Returns:
+                    chunks (Iterator[pandas.DataFrame]): rows received
+    """
+    with socket.create_connection((host, port)) as connection, connection.makefile('r') as stream:
+        header = stream.readline()
+        lines = []
+
+        for line in stream:
+            lines.append(line if line.endswith('\n') else line + '\n')
+            if len(lines) == chunk_size:
+                yield _to_dataframe(header, lines)
+                lines = []
+
+        if lines:
+            yield _to_dataframe(header, lines)
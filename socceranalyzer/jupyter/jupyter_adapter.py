@@ -2,13 +2,18 @@ from typing import Literal, Optional
 
 import os
 
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 
-from matplotlib.axes import Axes
-from matplotlib.figure import Figure
-from matplotlib.patches import Rectangle, Circle, Arc
+try:
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Rectangle, Circle, Arc
+except ImportError as err:
+    raise ImportError(f"JupyterAdapter plots with matplotlib and seaborn ({err.name} is missing), "
+                      f"install them with `pip install socceranalyzer[plotting]`.") from err
 
 import socceranalyzer
 from socceranalyzer.common.analysis.speed import Speed
@@ -137,17 +142,17 @@ class JupyterAdapter:
         self._helper.team_color_validate()
         sns.reset_defaults()
     
-        left_faults, right_faults = self.__match_analyzer.foul_charge.results(tuple=True)
+        faults = self.__match_analyzer.foul_charge.events()
 
         _, ax = plt.subplots(figsize=(width, height))
 
         # Left team
-        lx_coordinates = [pos.x for pos in left_faults]
-        ly_coordinates = [pos.y for pos in left_faults]
+        lx_coordinates = faults['x'][faults['side'] == 'l']
+        ly_coordinates = faults['y'][faults['side'] == 'l']
 
         # Right team
-        rx_coordinates = [pos.x for pos in right_faults]
-        ry_coordinates = [pos.y for pos in right_faults]
+        rx_coordinates = faults['x'][faults['side'] == 'r']
+        ry_coordinates = faults['y'][faults['side'] == 'r']
 
         scatter_left = ax.scatter(lx_coordinates, ly_coordinates, 
                                 color = self.__config["left_color"],
@@ -232,36 +237,41 @@ class JupyterAdapter:
 
     def heatmap(self, left_players_unum: list[int] = [], 
                         right_players_unum: list[int] = [],  
-                        ball: int = bool,  
+                        ball: bool = False,  
                         width: int = 15, 
                         height: int = 10, 
                         title: str = "Heatmap"):
-        sns.set()
-        left_players, right_players, ball_positions_dict = self.__match_analyzer.heatmap.data
+        """
+        Draws the precomputed occupancy histogram of the ball, or of the given players summed together.
+        When no player is given, every field player of both teams is drawn.
 
-        fig, ax = plt.subplots(figsize=(width, height))
+            Parameters:
+                left_players_unum (list[int]): unums of the left team players to draw
+                right_players_unum (list[int]): unums of the right team players to draw
+                ball (bool): whether to draw the ball instead of the players
+                width, height (int): figure size in inches
+                title (str): title of the figure
+        """
+        heatmap = self.__match_analyzer.heatmap
 
         if ball:
-            sns.kdeplot(ball_positions_dict['x'], ball_positions_dict['y'], shade="True", color="green", n_levels = 10)
-            plt.title(f'{title}')
-            plt.ylim(-35,35)
-            plt.xlim(-55,55)
-            plt.show()
-            
+            counts = heatmap.ball
+        elif left_players_unum or right_players_unum:
+            counts = sum(heatmap.player('l', unum) for unum in left_players_unum) \
+                + sum(heatmap.player('r', unum) for unum in right_players_unum)
         else:
-            for player in left_players:
-                sns.kdeplot(player[0], player[1], shade = "True", color = "green", n_levels = 10)
-                plt.title(f'{title}')
-                plt.ylim(-35,35)
-                plt.xlim(-55,55)
-                plt.show()
-
-            for player in right_players:
-                sns.kdeplot(player[0], player[1], shade = "True", color = "green", n_levels = 10)
-                plt.title(f'{title}')
-                plt.ylim(-35,35)
-                plt.xlim(-55,55)
-                plt.show()
+            counts = heatmap.team('l', gkeeper=False) + heatmap.team('r', gkeeper=False)
+
+        fig, ax = plt.subplots(figsize=(width, height))
+        extent = (heatmap.x_edges[0], heatmap.x_edges[-1], heatmap.y_edges[0], heatmap.y_edges[-1])
+        # counts are indexed (x, y), imshow expects rows along y
+        image = ax.imshow(np.ma.masked_equal(counts, 0).T, origin='lower', extent=extent, cmap='Greens')
+        fig.colorbar(image, ax=ax, label='cycles')
+
+        plt.title(f'{title}')
+        plt.ylim(-35,35)
+        plt.xlim(-55,55)
+        plt.show()
 
     
     def draw_pitch(self, figsize: (tuple[float, float])=(10, 6), color: Literal['green', 'white']='white') -> tuple[Figure, Axes]:
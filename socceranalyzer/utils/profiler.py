@@ -0,0 +1,174 @@
+import cProfile
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+from threading import Lock, current_thread
+from time import perf_counter, thread_time
+
+import pandas as pd
+
+
+class Profiler:
+    """
+        Records how long every analysis and evaluator takes, so the hotspots of a log can be found.
+
+        Profiler(memory: bool = False, cprofile_dir: str = None)
+
+        Every record holds the wall time, the CPU time of the thread it ran in and the rows processed.
+        With memory set, the peak memory allocated during the call is measured with tracemalloc, and with
+        cprofile_dir set, a cProfile dump named after the record is written there. Both measure the whole
+        process rather than a single thread, so `serial` tells the caller to run one analysis at a time.
+
+        Attributes
+        ----------
+            public through @properties:
+                memory: bool
+                    whether peak memory is measured
+                cprofile_dir: str
+                    folder of the cProfile dumps, None to skip them
+                serial: bool
+                    whether the measurements require analyses to run one after the other
+                records: list[dict]
+                    one entry per measured call, in completion order
+                origin: float
+                    perf_counter value the start of every record is relative to
+
+        Methods
+        -------
+            public:
+                record(name: str, rows: int = None, category: str = 'analysis') -> contextmanager
+                    measures the code run inside the with block
+                merge(records: list[dict], origin: float, process: str) -> None
+                    appends the records of a profiler of another process
+                to_dataframe() -> pandas.DataFrame
+                    records as a table, one row per call
+                chrome_trace(path: str) -> None
+                    writes the records in the Chrome trace-event format, for chrome://tracing or Perfetto
+    """
+    def __init__(self, memory: bool = False, cprofile_dir: str = None):
+        self.__memory = memory
+        self.__cprofile_dir = cprofile_dir
+        self.__records: list[dict] = []
+        self.__lock = Lock()
+        self.__origin = perf_counter()
+
+        if cprofile_dir is not None:
+            os.makedirs(cprofile_dir, exist_ok=True)
+
+    @property
+    def memory(self):
+        return self.__memory
+
+    @property
+    def cprofile_dir(self):
+        return self.__cprofile_dir
+
+    @property
+    def serial(self):
+        return self.__memory or self.__cprofile_dir is not None
+
+    @property
+    def records(self):
+        return self.__records
+
+    @property
+    def origin(self):
+        return self.__origin
+
+    @contextmanager
+    def record(self, name: str, rows: int = None, category: str = 'analysis'):
+        """
+        Measures the code run inside the with block and appends a record, even when the block raises.
+
+                Parameters:
+                        name (str): name of the record, e.g. the analysis config key
+                        rows (int): rows of the log the block processes
+                        category (str): kind of record, e.g. analysis or evaluator
+        """
+        tracing = False
+        if self.__memory:
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_begin = tracemalloc.get_traced_memory()[0]
+
+        profile = cProfile.Profile() if self.__cprofile_dir is not None else None
+        if profile is not None:
+            profile.enable()
+
+        cpu_begin = thread_time()
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = perf_counter() - begin
+            cpu_time = thread_time() - cpu_begin
+
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(os.path.join(self.__cprofile_dir, f'{name}.prof'))
+
+            record = {'name': name, 'category': category, 'thread': current_thread().name,
+                      'start': begin - self.__origin, 'wall_time': wall_time, 'cpu_time': cpu_time, 'rows': rows}
+
+            if self.__memory:
+                record['peak_memory_mb'] = (tracemalloc.get_traced_memory()[1] - memory_begin) / 2 ** 20
+                if tracing:
+                    tracemalloc.stop()
+
+            with self.__lock:
+                self.__records.append(record)
+
+    def merge(self, records: list[dict], origin: float, process: str):
+        """
+        Appends the records of a profiler of another process, e.g. a ProcessAnalysisScheduler worker.
+        perf_counter is system-wide, so their starts are moved from its origin to this one.
+
+                Parameters:
+                        records (list[dict]): Profiler.records of the other process
+                        origin (float): Profiler.origin of the other process
+                        process (str): name of the other process, prefixed to the thread of every record
+        """
+        with self.__lock:
+            for record in records:
+                self.__records.append({**record, 'thread': f"{process}/{record['thread']}",
+                                       'start': record['start'] + origin - self.__origin})
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the records as a table, one row per measured call, with the cycles per second of each one.
+        """
+        profile = pd.DataFrame(self.__records, columns=['name', 'category', 'thread', 'start', 'wall_time',
+                                                        'cpu_time', 'rows'] + (['peak_memory_mb'] if self.__memory else []))
+        profile['rows_per_second'] = profile['rows'] / profile['wall_time'].where(profile['wall_time'] > 0)
+        return profile
+
+    def to_dict(self) -> dict:
+        """
+        Returns the records keyed by name, for json output. Repeated names keep their last record.
+        """
+        return {record['name']: {key: value for key, value in record.items() if key != 'name'} for record in self.__records}
+
+    def chrome_trace(self, path: str):
+        """
+        Writes the records as complete events of the Chrome trace-event format, one track per thread.
+
+                Parameters:
+                        path (str): json file to write, opened with chrome://tracing or ui.perfetto.dev
+        """
+        pid = os.getpid()
+        threads = {name: tid for tid, name in enumerate(dict.fromkeys(record['thread'] for record in self.__records))}
+
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for name, tid in threads.items()]
+        for record in self.__records:
+            events.append({
+                'name': record['name'], 'cat': record['category'], 'ph': 'X', 'pid': pid, 'tid': threads[record['thread']],
+                'ts': record['start'] * 1e6, 'dur': record['wall_time'] * 1e6,
+                'args': {key: value for key, value in record.items() if key not in ('name', 'category', 'thread', 'start')},
+            })
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
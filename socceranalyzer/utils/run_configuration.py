@@ -3,6 +3,12 @@ class RunConfiguration:
     def __init__(self) -> False:
         self.logs_dir = None
         self.file_path = None
+        self.workers = None
+        self.analysis_workers = None
+        self.analysis_processes = None
+        self.cache_dir = None
+        self.results_store = None
+        self.results_dir = None
         self.tester_2d = False
         self.ball_possession = False
         self.tester_free_kick = False
@@ -27,6 +33,12 @@ class RunConfiguration:
 
         self.logs_dir = json_info["logs_folder"]
         self.file_path = json_info["file_path"]
+        self.workers = json_info.get("workers")
+        self.analysis_workers = json_info.get("analysis_workers")
+        self.analysis_processes = json_info.get("analysis_processes")
+        self.cache_dir = json_info.get("cache_folder")
+        self.results_store = json_info.get("results_store")
+        self.results_dir = json_info.get("results_folder")
         self.tester_2d = json_info["analysis"]["tester_2d"]
         self.ball_possession = json_info["analysis"]["ball_possession"]
         self.tester_free_kick = json_info["analysis"]["tester_free_kick"]
@@ -45,3 +57,8 @@ class RunConfiguration:
         self.goalkeeper = json_info["analysis"]["goalkeeper"]
         self.find_goals = json_info["analysis"]["find_goals"]
 
+    def enabled_analysis(self) -> list[str]:
+        """
+        Returns the names of the analysis enabled in this configuration, as written in config.json.
+        """
+        return [name for name, value in vars(self).items() if value is True]